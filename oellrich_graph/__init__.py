@@ -1,4 +1,14 @@
 from .core import Graph, Node, Edge, GraphReader, GraphWriter
+from .stats import GraphStats
+from .views import GraphView
+from .spatial import SpatialIndex
+from .registry import GraphRegistry
+from .generators import GridGraph, RandomGeometricGraph, ScaleFreeGraph
+from .shortest_paths import ForwardStar, ShortestPathTree, shortest_path, k_shortest_paths
+from .centrality import betweenness_centrality, closeness_centrality
+from .dag import CycleError, topological_sort, dag_distances, dag_path, critical_path
+from .partitioning import Partition, Shard, partition_graph
+from .validation import Validator, validate_file, validate_graph
 
 __all__ = [
     "Graph",
@@ -6,4 +16,28 @@ __all__ = [
     "Edge",
     "GraphReader",
     "GraphWriter",
+    "GraphStats",
+    "GraphView",
+    "SpatialIndex",
+    "GraphRegistry",
+    "GridGraph",
+    "RandomGeometricGraph",
+    "ScaleFreeGraph",
+    "ForwardStar",
+    "ShortestPathTree",
+    "shortest_path",
+    "k_shortest_paths",
+    "betweenness_centrality",
+    "closeness_centrality",
+    "CycleError",
+    "topological_sort",
+    "dag_distances",
+    "dag_path",
+    "critical_path",
+    "Partition",
+    "Shard",
+    "partition_graph",
+    "Validator",
+    "validate_file",
+    "validate_graph",
 ]
@@ -0,0 +1,199 @@
+"""
+This module contains betweenness and closeness centrality. Betweenness follows Brandes'
+algorithm with Dijkstra for weighted and breadth-first search for unweighted graphs. On request,
+the source nodes are split across a pool of worker processes, which receive only the flat arrays
+of the forward star and return partial result vectors that are summed up at the end. Workers
+are started only when asked for, since they pay off only for large graphs and need the calling
+script to guard its main code with if __name__ == "__main__" on platforms that spawn them.
+"""
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from math import inf
+from random import Random
+
+from .core import Graph
+from .shortest_paths import ForwardStar
+
+# forward star arrays and node count of a worker process, set by the pool initializer
+WORKER_STATE = None
+
+
+def init_worker(state: tuple) -> None:
+    """
+    Stores the forward star arrays and the node count in a worker process.
+    """
+    global WORKER_STATE  # pylint: disable=global-statement
+    WORKER_STATE = state
+
+
+def single_source(star_arrays: tuple, source: int, weighted: bool) -> tuple:
+    """
+    Runs the search of Brandes' algorithm from source and returns the settled nodes in order of
+    distance, the number of shortest paths sigma, the predecessor lists and the distances.
+    """
+    offsets, targets, weights = star_arrays
+    node_slots = len(offsets) - 1
+    order = []
+    sigma = [0] * node_slots
+    preds = [[] for _ in range(node_slots)]
+    dist = [inf] * node_slots
+    sigma[source] = 1
+    dist[source] = 0.0
+    if weighted:
+        done = bytearray(node_slots)
+        heap = [(0.0, source)]
+        while heap:
+            distance, node = heappop(heap)
+            if done[node]:
+                continue
+            done[node] = 1
+            order.append(node)
+            for arc in range(offsets[node], offsets[node + 1]):
+                other = targets[arc]
+                candidate = distance + weights[arc]
+                if candidate < dist[other]:
+                    dist[other] = candidate
+                    sigma[other] = sigma[node]
+                    preds[other] = [node]
+                    heappush(heap, (candidate, other))
+                elif candidate == dist[other] and not done[other]:
+                    sigma[other] += sigma[node]
+                    preds[other].append(node)
+    else:
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            distance = dist[node] + 1.0
+            for arc in range(offsets[node], offsets[node + 1]):
+                other = targets[arc]
+                if dist[other] == inf:
+                    dist[other] = distance
+                    queue.append(other)
+                if dist[other] == distance:
+                    sigma[other] += sigma[node]
+                    preds[other].append(node)
+    return order, sigma, preds, dist
+
+
+def betweenness_chunk(sources: list[int], weighted: bool, state: tuple = None) -> array:
+    """
+    Returns the summed dependencies of all nodes on the given sources. state holds the forward
+    star arrays and the node count and defaults to the one of the worker process.
+    """
+    star_arrays, _ = WORKER_STATE if state is None else state
+    result = array("d", bytes(8 * (len(star_arrays[0]) - 1)))
+    for source in sources:
+        order, sigma, preds, _ = single_source(star_arrays, source, weighted)
+        delta = dict.fromkeys(order, 0.0)
+        for node in reversed(order):
+            coefficient = (1.0 + delta[node]) / sigma[node]
+            for pred in preds[node]:
+                delta[pred] += sigma[pred] * coefficient
+            if node != source:
+                result[node] += delta[node]
+    return result
+
+
+def closeness_chunk(sources: list[int], weighted: bool, state: tuple = None) -> array:
+    """
+    Returns the closeness of the given sources, all other entries are 0. state is the same as
+    for betweenness_chunk().
+    """
+    star_arrays, node_count = WORKER_STATE if state is None else state
+    result = array("d", bytes(8 * (len(star_arrays[0]) - 1)))
+    for source in sources:
+        order, _, _, dist = single_source(star_arrays, source, weighted)
+        total = sum(dist[node] for node in order)
+        if total > 0:
+            reached = len(order) - 1
+            result[source] = reached / total * reached / (node_count - 1)
+    return result
+
+
+def forward_star(graph: Graph, weighted: bool, function: str) -> ForwardStar:
+    """
+    Returns the forward star of a graph. Raises a ValueError for negative weights, which
+    Dijkstra's algorithm does not support.
+    """
+    star = ForwardStar(graph, weighted)
+    if any(weight < 0 for weight in star.weights):
+        raise ValueError(f"{function}: negative edge weights are not supported!")
+    return star
+
+
+def run(function, star: ForwardStar, sources: list[int], weighted: bool, processes: int) -> array:
+    """
+    Runs a chunk function over the sources, split into chunks for a pool of processes workers,
+    one per CPU for None, and sums up the partial results. With a single process, or too few
+    sources per process, it runs in the calling process.
+    """
+    state = (star.arrays(), sum(1 for node in star.nodes if node is not None))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1 or len(sources) < 2 * processes:
+        return function(sources, weighted, state)
+    # a few chunks per process balance sources with differently large search spaces
+    chunk_count = 4 * processes
+    chunks = [sources[i::chunk_count] for i in range(chunk_count)]
+    result = array("d", bytes(8 * star.node_slots))
+    with ProcessPoolExecutor(processes, initializer=init_worker, initargs=(state,)) as pool:
+        for partial in pool.map(function, chunks, [weighted] * chunk_count):
+            for i, value in enumerate(partial):
+                if value:
+                    result[i] += value
+    return result
+
+
+def betweenness_centrality(
+        graph: Graph,
+        weighted: bool = True,
+        normalized: bool = True,
+        processes: int = 1,
+        samples: int = None,
+        seed: int = None
+) -> array:
+    """
+    Returns the betweenness centrality of all nodes as array('d') indexed by Node.index. The
+    edges are weighted by Edge.weight, or all weighted 1 with weighted=False, in which case a
+    breadth-first search replaces Dijkstra. With normalized=True, the values are divided by
+    (n - 1)(n - 2), otherwise the values of undirected graphs are halved as every path is found
+    from both ends. With samples, only that many random source nodes are used and the result is
+    scaled up, which approximates the exact values. With processes > 1, the sources are split
+    across that many worker processes, with None across one per CPU.
+    """
+    star = forward_star(graph, weighted, "betweenness_centrality()")
+    sources = [node.index for node in star.nodes if node is not None]
+    node_count = len(sources)
+    scale = 1.0
+    if samples is not None and samples < node_count:
+        sources = Random(seed).sample(sources, samples)
+        scale = node_count / samples
+    if normalized:
+        scale *= 1.0 / ((node_count - 1) * (node_count - 2)) if node_count > 2 else 1.0
+    elif not graph.directed:
+        scale *= 0.5
+    result = run(betweenness_chunk, star, sources, weighted, processes)
+    if scale != 1.0:
+        for i, value in enumerate(result):
+            result[i] = value * scale
+    return result
+
+
+def closeness_centrality(
+        graph: Graph,
+        weighted: bool = True,
+        processes: int = 1
+) -> array:
+    """
+    Returns the closeness centrality of all nodes as array('d') indexed by Node.index, following
+    the edges from the node. A node reaching r other nodes at a total distance d gets
+    r / d * r / (n - 1), which is its inverse mean distance scaled down for nodes that reach only
+    part of the graph. The sources are split across worker processes like for betweenness.
+    """
+    star = forward_star(graph, weighted, "closeness_centrality()")
+    sources = [node.index for node in star.nodes if node is not None]
+    return run(closeness_chunk, star, sources, weighted, processes)
@@ -4,8 +4,21 @@ This module contains the core classes for the graph data structure. The
 classes can be used to construct a graph from a file or to construct a graph
 manually.
 """
-from functools import lru_cache
+import asyncio
+import gc
+import pickle
+import threading
+from array import array
+from contextlib import contextmanager
+from itertools import islice
+from math import isnan, nan
 from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from .stats import GraphStats, phase
+
+# serializes the lazy unpacking of unpickled graphs, which may be touched by several threads
+UNPACK_LOCK = threading.Lock()
 
 
 class Node:
@@ -42,8 +55,9 @@ class Node:
     def load_from_string(self, string: str, index: int) -> None:
         """
         This method can be used as an alternative constructor. It takes a string of the format
-        "name x_coord y_coord weight" and sets the corresponding parameters of the node object.
-        If any of the parameters are already set, the method will raise an exception.
+        "name", "name weight", "name x_coord y_coord" or "name x_coord y_coord weight" and sets the
+        corresponding parameters of the node object. A value nan stands for a missing value. If
+        any of the parameters are already set, the method will raise an exception.
         """
         # check if any of the parameters are already set
         for param in [self.name, self.x_coord, self.y_coord, self.weight]:
@@ -54,14 +68,16 @@ class Node:
         # split the string into its components
         components = string.split()
         # check if the string has the correct format
-        if len(components) not in [1, 3]:
+        if len(components) not in [1, 2, 3, 4]:
             raise ValueError(
                 f"Node: load_from_string() string {string} has incorrect format!"
             )
         self.name = components[0]
-        if len(components) == 3:
-            self.x_coord = float(components[1])
-            self.y_coord = float(components[2])
+        if len(components) >= 3:
+            self.x_coord = parse_number(components[1])
+            self.y_coord = parse_number(components[2])
+        if len(components) in [2, 4]:
+            self.weight = parse_number(components[-1])
         self.index = index
 
     def clear(self) -> None:
@@ -153,7 +169,7 @@ class Edge:
         self.tail = nodes_dict[components[2]]
         # set the weight if it is given
         if len(components) == 4:
-            self.weight = float(components[3])
+            self.weight = parse_number(components[3])
         self.index = index
 
     def clear(self) -> None:
@@ -183,6 +199,207 @@ class Edge:
         return out_string
 
 
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Context manager disabling the garbage collector while many Node and Edge objects are created.
+    Their neighbor sets would otherwise trigger collections that only find live objects.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+async def in_executor(function, *args):
+    """
+    Runs a function in the default executor of the running loop. If the awaiting task is
+    cancelled, the call is still waited for before the cancellation goes on, so the caller can
+    safely close a file the function uses.
+    """
+    future = asyncio.get_running_loop().run_in_executor(None, function, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        raise
+
+
+def read_lines(file, count: int) -> list[str]:
+    """
+    Reads up to count lines of a file.
+    """
+    return list(islice(file, count))
+
+
+def parse_number(string: str) -> float:
+    """
+    Converts a number of a graph file into a float, or None for nan.
+    """
+    value = float(string)
+    return None if isnan(value) else value
+
+
+def may_contain_nan(lines: list[str]) -> bool:
+    """
+    Returns True if a line may hold a NaN in any spelling float() accepts, like nan or NaN. Only
+    then the slower parse_number() is needed to turn them into None.
+    """
+    return any("nan" in line.lower() for line in lines)
+
+
+def as_list(values: Sequence) -> list:
+    """
+    Converts a list, array.array or NumPy array into a list of Python objects.
+    """
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def as_numbers(values: Sequence[float], count: int) -> list:
+    """
+    Converts an array of numbers into a list with None for NaN or None, or count times None if
+    values is None.
+    """
+    if values is None:
+        return [None] * count
+    values = as_list(values)
+    try:
+        if not any(map(isnan, values)):
+            return values
+    except TypeError:
+        pass
+    return [None if value is None or isnan(value) else value for value in values]
+
+
+def to_float_array(values: list) -> array:
+    """
+    Converts a list of numbers or None into array('d') with NaN for None, or None if all values
+    are None.
+    """
+    try:
+        return array("d", values)
+    except TypeError:
+        if all(value is None for value in values):
+            return None
+        return array("d", (nan if value is None else value for value in values))
+
+
+def pack_numbers(values: list, buffers: bool = False) -> tuple:
+    """
+    Packs a list of numbers or None into (typecode, floats, data). Integral values that fit into
+    32 bits are stored as 'i', other values as 'd' with None as NaN. floats tells whether the
+    values were floats. A list of only None is packed as None.
+    """
+    try:
+        data, typecode, floats = array("i", values), "i", False
+    except (TypeError, OverflowError):
+        floats = True
+        try:
+            data, typecode = array("d", values), "d"
+        except TypeError:
+            if all(value is None for value in values):
+                return None
+            data, typecode = array("d", (nan if value is None else value for value in values)), "d"
+        else:
+            # store integral floats as integers, compared as arrays in one pass
+            try:
+                integers = array("i", map(int, data))
+                if array("d", integers) == data:
+                    data, typecode = integers, "i"
+            except (OverflowError, ValueError):
+                pass
+    return typecode, floats, pickle.PickleBuffer(data) if buffers else data
+
+
+def unpack_numbers(packed: tuple, count: int) -> list:
+    """
+    Unpacks the result of pack_numbers() into a list of count numbers or None.
+    """
+    if packed is None:
+        return [None] * count
+    typecode, floats, data = packed
+    data = memoryview(data).cast("B").cast(typecode)
+    if typecode == "d":
+        return [None if isnan(value) else value for value in data]
+    if floats:
+        return [float(value) for value in data]
+    return data.tolist()
+
+
+def pack_indices(indices: list, buffers: bool = False) -> tuple:
+    """
+    Packs a list of indices, which is left out if every index equals its position. Missing
+    indices are stored as -1, so they stay apart from the left out positions.
+    """
+    if indices == list(range(len(indices))):
+        return None
+    return pack_numbers([-1 if index is None else index for index in indices], buffers)
+
+
+def unpack_indices(packed: tuple, count: int) -> list:
+    """
+    Unpacks the result of pack_indices() into a list of count indices or None.
+    """
+    if packed is None:
+        return list(range(count))
+    return [None if index == -1 else index for index in unpack_numbers(packed, count)]
+
+
+def pack_names(names: list, buffers: bool = False) -> tuple:
+    """
+    Packs a list of names into the packed lengths of the names and one string of all names, which
+    is left out if every name is its position as a string. Missing names are stored as empty
+    strings. The lengths keep names apart whatever characters they contain.
+    """
+    if names == [str(i) for i in range(len(names))]:
+        return None
+    names = ["" if name is None else str(name) for name in names]
+    data = "".join(names).encode()
+    return (
+        pack_numbers([len(name) for name in names], buffers),
+        pickle.PickleBuffer(data) if buffers else data
+    )
+
+
+def unpack_names(packed: tuple, count: int) -> list:
+    """
+    Unpacks the result of pack_names() into a list of count names or None.
+    """
+    if packed is None:
+        return [str(i) for i in range(count)]
+    lengths, data = packed
+    text = str(memoryview(data), "utf-8")
+    names = []
+    end = 0
+    for length in unpack_numbers(lengths, count):
+        start, end = end, end + length
+        names.append(text[start:end] or None)
+    return names
+
+
+def repack(field, buffers: bool = False):
+    """
+    Packs a field of pack() again, after unpickling, which may have left the arrays and names
+    as PickleBuffer objects of out-of-band buffers. These are copied into an array or bytes
+    unless they are to be passed out-of-band again.
+    """
+    if field is None:
+        return None
+    if isinstance(field, tuple) and len(field) == 2:
+        return repack(field[0], buffers), repack(field[1], buffers)
+    if isinstance(field, tuple):
+        typecode, floats, data = field
+        if not buffers:
+            copy = array(typecode)
+            copy.frombytes(memoryview(data).cast("B"))
+            data = copy
+        return typecode, floats, pickle.PickleBuffer(data) if buffers else data
+    return pickle.PickleBuffer(field) if buffers else bytes(memoryview(field))
+
+
 class Graph:
     """
     Class for a graph data structure. Translation of the graph class
@@ -195,6 +412,7 @@ class Graph:
         nodes: list[Node] = None,
         edges: list[Edge] = None,
         init_neighbors: bool = False,
+        stats: GraphStats = None,
     ):
         self.name = name
         self.directed = directed
@@ -202,6 +420,7 @@ class Graph:
         self.edges = edges
         self.node_count = len(self.nodes) if self.nodes is not None else 0
         self.edge_count = len(self.edges) if self.edges is not None else 0
+        self.stats = stats
         if init_neighbors:
             self.init_neighbors()
 
@@ -230,6 +449,19 @@ class Graph:
         Searches the edges for forward and backward neighbors and stores them in the corresponding
         lists of the nodes.
         """
+        with phase(self.stats, "init_neighbors"):
+            reversed_edges = self.link_edges()
+        if self.stats is not None:
+            self.stats.count("edges_linked", len(self.edges))
+            self.stats.count("edges_expanded", len(reversed_edges))
+        # add the reversed edges to the graph
+        self.edges.extend(reversed_edges)
+
+    def link_edges(self) -> list[Edge]:
+        """
+        Adds the edges to the neighbor sets of their nodes and returns the reversed edges of an
+        undirected graph.
+        """
         reversed_edges = []
         for edge in self.edges:
             # add forward and backward neighbor nodes
@@ -255,8 +487,323 @@ class Graph:
                 # add the new edge to the node
                 edge.tail.f_edges.add(new_edge)
                 edge.head.b_edges.add(new_edge)
-        # add the reversed edges to the graph
-        self.edges.extend(reversed_edges)
+        return reversed_edges
+
+    @property
+    def node_slots(self) -> int:
+        """
+        Returns the size of arrays indexed by Node.index. Algorithms use the adjacency methods
+        below and node_slots instead of the node attributes, so they also accept a GraphView.
+        """
+        return len(self.nodes) if self.nodes is not None else 0
+
+    @property
+    def edge_slots(self) -> int:
+        """
+        Returns the size of arrays indexed by Edge.index. Reversed edges share the index of their
+        original edge.
+        """
+        return self.edge_count
+
+    def contains_node(self, node: Node) -> bool:
+        """
+        Returns True if the node belongs to the graph and is not cleared.
+        """
+        return node.allowed
+
+    def f_edges(self, node: Node) -> set[Edge]:
+        """
+        Returns the forward edges of a node.
+        """
+        return node.f_edges
+
+    def b_edges(self, node: Node) -> set[Edge]:
+        """
+        Returns the backward edges of a node.
+        """
+        return node.b_edges
+
+    def f_neighbors(self, node: Node) -> set[Node]:
+        """
+        Returns the forward neighbors of a node.
+        """
+        return node.f_neighbors
+
+    def b_neighbors(self, node: Node) -> set[Node]:
+        """
+        Returns the backward neighbors of a node.
+        """
+        return node.b_neighbors
+
+    def __getattr__(self, name: str):
+        """
+        Rebuilds the nodes and edges of an unpickled graph on first access. Only called for
+        attributes that are not set. Threads arriving during the rebuild wait for it.
+        """
+        if name in ("nodes", "edges") and ("packed" in self.__dict__ or name in self.__dict__):
+            with UNPACK_LOCK:
+                if "packed" in self.__dict__:
+                    self.unpack()
+            return self.__dict__[name]
+        raise AttributeError(f"'Graph' object has no attribute '{name}'")
+
+    def pack(self, buffers: bool = False) -> tuple:
+        """
+        Returns the graph as a tuple of a few flat arrays and name pools, which is what gets
+        pickled instead of the Node and Edge objects. Indices equal to the list positions and
+        names equal to the positions are left out, and so are the reversed edges of an undirected
+        graph, which are rebuilt by init_neighbors(). With buffers=True, the arrays are wrapped in
+        PickleBuffer objects for out-of-band transfer with pickle protocol 5.
+        """
+        packed = self.__dict__.get("packed")
+        if packed is not None:
+            return packed[:7] + tuple(repack(field, buffers) for field in packed[7:])
+        nodes = self.nodes or []
+        neighbors = any(node.f_edges or node.b_edges for node in nodes)
+        edges = self.original_edges()
+        node_indices = [node.index for node in nodes]
+        heads, tails = self.endpoint_positions(edges, node_indices)
+        fields = (
+            pack_indices(node_indices, buffers),
+            pack_names([node.name for node in nodes], buffers),
+            pack_numbers([node.x_coord for node in nodes], buffers),
+            pack_numbers([node.y_coord for node in nodes], buffers),
+            pack_numbers([node.weight for node in nodes], buffers),
+            pack_indices([edge.index for edge in edges], buffers),
+            pack_names([edge.name for edge in edges], buffers),
+            pack_numbers(heads, buffers),
+            pack_numbers(tails, buffers),
+            pack_numbers([edge.weight for edge in edges], buffers),
+        )
+        return (
+            self.name, self.directed, self.node_count, self.edge_count, neighbors,
+            len(nodes), len(edges)
+        ) + fields
+
+    def original_edges(self) -> list[Edge]:
+        """
+        Returns the edges without the reversed edges added by init_neighbors().
+        """
+        edges = self.edges or []
+        if not self.directed and len(edges) > self.edge_count:
+            return edges[:self.edge_count]
+        return edges
+
+    def endpoint_positions(self, edges: list[Edge], node_indices: list[int]) -> tuple[list, list]:
+        """
+        Returns the positions of the head and tail nodes of the edges in the node list.
+        """
+        if node_indices == list(range(len(node_indices))):
+            return [edge.head.index for edge in edges], [edge.tail.index for edge in edges]
+        positions = {id(node): i for i, node in enumerate(self.nodes)}
+        return (
+            [positions[id(edge.head)] for edge in edges],
+            [positions[id(edge.tail)] for edge in edges]
+        )
+
+    @classmethod
+    def from_edge_arrays(
+        cls,
+        heads: Sequence[int],
+        tails: Sequence[int],
+        weights: Sequence[float] = None,
+        node_names: Sequence[str] = None,
+        coords: tuple[Sequence[float], Sequence[float]] = None,
+        directed: bool = True,
+        edge_names: Sequence[str] = None,
+        node_weights: Sequence[float] = None,
+        node_count: int = None,
+        name: str = "",
+        init_neighbors: bool = False,
+    ) -> "Graph":
+        """
+        Creates a graph from arrays of head and tail node positions. All arguments can be lists,
+        array.array or NumPy arrays. coords is a pair of x and y coordinate arrays. NaN weights
+        and coordinates stand for missing values. Nodes and edges are named by their positions
+        unless names are given. The number of nodes is taken from node_count, the names, the
+        coordinates or the largest node position, in that order. Node positions are checked in
+        bulk and the objects are created with the garbage collector paused.
+        """
+        heads, tails = as_list(heads), as_list(tails)
+        if len(heads) != len(tails):
+            raise ValueError("Graph: from_edge_arrays() heads and tails differ in length!")
+        if node_count is None:
+            if node_names is not None:
+                node_count = len(node_names)
+            elif coords is not None:
+                node_count = len(coords[0])
+            else:
+                node_count = max(max(heads, default=-1), max(tails, default=-1)) + 1
+        if heads and (
+                min(min(heads), min(tails)) < 0 or max(max(heads), max(tails)) >= node_count
+        ):
+            first = next(
+                i for i, (head, tail) in enumerate(zip(heads, tails))
+                if not (0 <= head < node_count and 0 <= tail < node_count)
+            )
+            raise ValueError(
+                f"Graph: from_edge_arrays() edge {first} ({heads[first]}, {tails[first]}) "
+                f"has a node position outside of 0 to {node_count - 1}!"
+            )
+        node_names = (
+            [str(i) for i in range(node_count)] if node_names is None else as_list(node_names)
+        )
+        edge_names = (
+            [str(i) for i in range(len(heads))] if edge_names is None else as_list(edge_names)
+        )
+        x_coords, y_coords = (None, None) if coords is None else coords
+        arrays = {
+            "node_names": (node_names, node_count),
+            "x_coords": (as_numbers(x_coords, node_count), node_count),
+            "y_coords": (as_numbers(y_coords, node_count), node_count),
+            "node_weights": (as_numbers(node_weights, node_count), node_count),
+            "weights": (as_numbers(weights, len(heads)), len(heads)),
+            "edge_names": (edge_names, len(heads)),
+        }
+        for key, (values, count) in arrays.items():
+            if len(values) != count:
+                raise ValueError(
+                    f"Graph: from_edge_arrays() {key} has length {len(values)} instead of {count}!"
+                )
+        with paused_gc():
+            nodes = list(map(
+                Node, node_names, arrays["x_coords"][0], arrays["y_coords"][0], range(node_count),
+                arrays["node_weights"][0]
+            ))
+            node_at = nodes.__getitem__
+            edges = list(map(
+                Edge, edge_names, map(node_at, heads), map(node_at, tails), range(len(heads)),
+                arrays["weights"][0]
+            ))
+            return cls(
+                name=name,
+                directed=directed,
+                nodes=nodes,
+                edges=edges,
+                init_neighbors=init_neighbors
+            )
+
+    def to_arrays(self) -> dict:
+        """
+        Returns the graph as flat arrays, the counterpart of from_edge_arrays(): head and tail
+        node positions as array('q'), and weights, coordinates and node weights as array('d')
+        with NaN for missing values, or None if all are missing. The reversed edges of an
+        undirected graph are left out. Graph.from_edge_arrays(**graph.to_arrays()) rebuilds the
+        graph.
+        """
+        nodes = self.nodes or []
+        edges = self.original_edges()
+        heads, tails = self.endpoint_positions(edges, [node.index for node in nodes])
+        x_coords = to_float_array([node.x_coord for node in nodes])
+        y_coords = to_float_array([node.y_coord for node in nodes])
+        return {
+            "heads": array("q", heads),
+            "tails": array("q", tails),
+            "weights": to_float_array([edge.weight for edge in edges]),
+            "node_names": [node.name for node in nodes],
+            "coords": None if x_coords is None else (x_coords, y_coords),
+            "directed": self.directed,
+            "edge_names": [edge.name for edge in edges],
+            "node_weights": to_float_array([node.weight for node in nodes]),
+            "node_count": len(nodes),
+            "name": self.name,
+        }
+
+    def to_adjacency_matrix(self, layout: str = "csr", weighted: bool = True, scipy: bool = False):
+        """
+        Returns the sparse adjacency matrix of the graph, see matrix.adjacency_matrix().
+        """
+        # pylint: disable=import-outside-toplevel
+        from .matrix import adjacency_matrix
+        return adjacency_matrix(self, layout, weighted, scipy)
+
+    def to_incidence_matrix(
+            self,
+            layout: str = "csr",
+            weighted: bool = False,
+            oriented: bool = None,
+            scipy: bool = False
+    ):
+        """
+        Returns the sparse incidence matrix of the graph, see matrix.incidence_matrix().
+        """
+        # pylint: disable=import-outside-toplevel
+        from .matrix import incidence_matrix
+        return incidence_matrix(self, layout, weighted, oriented, scipy)
+
+    @classmethod
+    def from_adjacency_matrix(cls, matrix, directed: bool = True, **kwargs) -> "Graph":
+        """
+        Creates a graph from an adjacency matrix, see matrix.from_adjacency_matrix().
+        """
+        # pylint: disable=import-outside-toplevel
+        from .matrix import from_adjacency_matrix
+        return from_adjacency_matrix(matrix, directed, **kwargs)
+
+    @classmethod
+    def from_incidence_matrix(
+            cls,
+            matrix,
+            directed: bool = True,
+            weighted: bool = False,
+            **kwargs
+    ) -> "Graph":
+        """
+        Creates a graph from an incidence matrix, see matrix.from_incidence_matrix().
+        """
+        # pylint: disable=import-outside-toplevel
+        from .matrix import from_incidence_matrix
+        return from_incidence_matrix(matrix, directed, weighted, **kwargs)
+
+    def __reduce_ex__(self, protocol: int):
+        """
+        Pickles the graph as the flat arrays of pack(). With protocol 5 the arrays are passed as
+        PickleBuffer objects, so they can be transferred out-of-band without copies.
+        """
+        return (Graph.from_packed, self.pack(buffers=protocol >= 5))
+
+    @classmethod
+    def from_packed(cls, *packed) -> "Graph":
+        """
+        Creates a graph from the result of pack(). The Node and Edge objects are only created on
+        the first access of nodes or edges.
+        """
+        graph = cls.__new__(cls)
+        graph.name, graph.directed, graph.node_count, graph.edge_count = packed[:4]
+        graph.stats = None
+        graph.packed = packed
+        return graph
+
+    def unpack(self) -> None:
+        """
+        Creates the Node and Edge objects of an unpickled graph from its packed arrays. Nodes and
+        edges are set together once the neighbors are linked, so no thread sees a partial graph.
+        """
+        (
+            neighbors, node_total, edge_total, node_index, node_names, x_coords, y_coords,
+            node_weights, edge_index, edge_names, heads, tails, edge_weights
+        ) = self.packed[4:]
+        node_index = unpack_indices(node_index, node_total)
+        node_names = unpack_names(node_names, node_total)
+        x_coords = unpack_numbers(x_coords, node_total)
+        y_coords = unpack_numbers(y_coords, node_total)
+        node_weights = unpack_numbers(node_weights, node_total)
+        nodes = [
+            Node(node_names[i], x_coords[i], y_coords[i], node_index[i], node_weights[i])
+            for i in range(node_total)
+        ]
+        edge_index = unpack_indices(edge_index, edge_total)
+        edge_names = unpack_names(edge_names, edge_total)
+        heads = unpack_numbers(heads, edge_total)
+        tails = unpack_numbers(tails, edge_total)
+        edge_weights = unpack_numbers(edge_weights, edge_total)
+        edges = [
+            Edge(edge_names[i], nodes[heads[i]], nodes[tails[i]], edge_index[i], edge_weights[i])
+            for i in range(edge_total)
+        ]
+        graph = Graph(self.name, self.directed, nodes, edges, init_neighbors=neighbors)
+        self.__dict__.update(nodes=graph.nodes, edges=graph.edges)
+        del self.packed
 
     def auto_name(self) -> None:
         """
@@ -271,7 +818,12 @@ class GraphReader:
     """
     Class for loading and reading the file containing the graph data.
     """
-    def __init__(self, path: str, init_neighbors: bool = False) -> None:
+    def __init__(
+            self,
+            path: str,
+            init_neighbors: bool = False,
+            stats: GraphStats = None
+    ) -> None:
         self.path = path
         self.node_count = None
         self.edge_count = None
@@ -279,6 +831,8 @@ class GraphReader:
         self.nodes_raw = None
         self.edges_raw = None
         self.init_neighbors = init_neighbors
+        self.stats = stats
+        self.nodes_dict_cache = None
 
     @property
     def directed(self) -> bool:
@@ -292,18 +846,14 @@ class GraphReader:
             return True
         raise ValueError(f"Directedness not specified correctly in file {self.path}")
 
-    @lru_cache
     def nodes_dict(self) -> dict[str, Node]:
         """
         Creates a dictionary with the node names as keys and the node objects as
-        values.
+        values. The dictionary is created once and reused by later calls.
         """
-        nodes_dict = {}
-        for i, node_string in enumerate(self.nodes_raw):
-            node = Node()
-            node.load_from_string(node_string, i)
-            nodes_dict[node.name] = node
-        return nodes_dict
+        if self.nodes_dict_cache is None:
+            self.nodes_dict_cache = {node.name: node for node in self.parse_nodes(self.nodes_raw)}
+        return self.nodes_dict_cache
 
     @property
     def nodes(self) -> list[Node]:
@@ -318,47 +868,233 @@ class GraphReader:
         This method creates a list of edges from the raw edge strings. The nodes_dict is needed to
         look up the nodes by their names.
         """
-        edges = []
-        for i, edge_raw in enumerate(self.edges_raw):
-            edge = Edge()
-            edge.load_from_string(edge_raw, self.nodes_dict(), i)
-            edges.append(edge)
-        return edges
+        return self.parse_edges(self.edges_raw, self.nodes_dict())
+
+    @staticmethod
+    def line_format(lines: list[str], formats: tuple[int, ...], kind: str) -> int:
+        """
+        Returns the number of fields of the first line, which all lines of a section share.
+        """
+        fields = len(lines[0].split()) if lines else formats[0]
+        if fields not in formats:
+            raise ValueError(
+                f"GraphReader: {kind} line {lines[0]} has {fields} fields instead of {formats}!"
+            )
+        return fields
+
+    @classmethod
+    def edge_format(cls, lines: list[str]) -> int:
+        """
+        Returns the number of fields of the edge lines. Additional fields, which might hold
+        further edge attributes, raise a Warning.
+        """
+        if lines and len(lines[0].split()) > 4:
+            raise Warning(
+                f"Edge {lines[0]} has additional parameters that are not yet supported!"
+            )
+        return cls.line_format(lines, (3, 4), "edge")
+
+    @staticmethod
+    def format_error(lines: list[str], fields: int, kind: str, error: ValueError) -> ValueError:
+        """
+        Returns the error for the first line of a section that does not match its format.
+        """
+        for line in lines:
+            if len(line.split()) != fields:
+                return ValueError(
+                    f"GraphReader: {kind} line {line} has {len(line.split())} fields, "
+                    f"but the section has {fields}!"
+                )
+        return ValueError(f"GraphReader: {kind} section has invalid numbers, {error}!")
+
+    def parse_nodes(self, lines: list[str], start: int = 0, fields: int = None) -> list[Node]:
+        """
+        Creates the nodes of node lines, indexed from start. The format is one of "name",
+        "name weight", "name x_coord y_coord" and "name x_coord y_coord weight". It is taken from
+        the first line, or from fields, and every line must have the same format, so it is
+        checked once for the section instead of once per line.
+        """
+        fields = self.line_format(lines, (1, 2, 3, 4), "node") if fields is None else fields
+        # nan stands for a missing value, the slower conversion is only needed if it occurs
+        number = parse_number if may_contain_nan(lines) else float
+        rows = enumerate(map(str.split, lines), start)
+        try:
+            if fields == 1:
+                return [Node(name, None, None, i) for i, (name,) in rows]
+            if fields == 2:
+                return [Node(name, None, None, i, number(weight)) for i, (name, weight) in rows]
+            if fields == 3:
+                return [Node(name, number(x), number(y), i) for i, (name, x, y) in rows]
+            return [
+                Node(name, number(x), number(y), i, number(weight))
+                for i, (name, x, y, weight) in rows
+            ]
+        except ValueError as error:
+            raise self.format_error(lines, fields, "node", error) from error
+
+    def parse_edges(
+            self,
+            lines: list[str],
+            nodes_dict: dict[str, Node],
+            start: int = 0,
+            fields: int = None
+    ) -> list[Edge]:
+        """
+        Creates the edges of edge lines of the format "name head_name tail_name" or
+        "name head_name tail_name weight", indexed from start. Like for the nodes, the format
+        is taken from the first line, or from fields, and shared by all lines.
+        """
+        fields = self.edge_format(lines) if fields is None else fields
+        number = parse_number if may_contain_nan(lines) else float
+        rows = enumerate(map(str.split, lines), start)
+        try:
+            if fields == 3:
+                return [
+                    Edge(name, nodes_dict[head], nodes_dict[tail], i)
+                    for i, (name, head, tail) in rows
+                ]
+            return [
+                Edge(name, nodes_dict[head], nodes_dict[tail], i, number(weight))
+                for i, (name, head, tail, weight) in rows
+            ]
+        except ValueError as error:
+            raise self.format_error(lines, fields, "edge", error) from error
+
+    @staticmethod
+    def clean_lines(raw_lines: list[str]) -> list[str]:
+        """
+        Removes comments and empty lines.
+        """
+        lines = []
+        for line in raw_lines:
+            line = line.split("#")[0].strip()
+            if line != "":
+                lines.append(line)
+        return lines
+
+    def split_lines(self, lines: list[str]) -> None:
+        """
+        Retrieves the number of nodes and edges and the directedness from the cleaned lines and
+        splits the remaining lines into the raw node and edge strings.
+        """
+        self.node_count = int(lines[0])
+        self.edge_count = int(lines[1])
+        self.directed_raw = lines[2]
+        self.nodes_raw = lines[3:3 + self.node_count]
+        self.edges_raw = lines[3 + self.node_count:3 + self.node_count + self.edge_count]
+        self.nodes_dict_cache = None
+
+    def count_stats(self, raw_line_count: int, line_count: int, graph: Graph) -> None:
+        """
+        Records the counters of a finished read in the stats object.
+        """
+        self.stats.count("lines_read", raw_line_count)
+        self.stats.count("lines_parsed", line_count)
+        self.stats.count("nodes_created", graph.node_count)
+        self.stats.count("edges_created", graph.edge_count)
 
     def read(self) -> Graph:
         """
         Main function of the class. It reads the file and creates a graph object.
         """
+        stats = self.stats
         # open file, read lines and remove comments and empty lines
-        with open(f"{self.path}", "r", encoding="utf-8") as file:
-            lines = []
-            for line in file.readlines():
-                line = line.split("#")[0].strip()
-                if line != "":
-                    lines.append(line)
+        with phase(stats, "read_file"):
+            with open(f"{self.path}", "r", encoding="utf-8") as file:
+                raw_lines = file.readlines()
+        with phase(stats, "clean_lines"):
+            lines = self.clean_lines(raw_lines)
         # retrieve number of nodes and edges and directedness
-        self.node_count = int(lines.pop(0))
-        self.edge_count = int(lines.pop(0))
-        self.directed_raw = lines.pop(0)
-        self.nodes_raw = lines[:self.node_count]
-        self.edges_raw = lines[self.node_count:self.node_count + self.edge_count]
+        self.split_lines(lines)
+        with paused_gc():
+            with phase(stats, "parse_nodes"):
+                nodes = self.nodes
+            with phase(stats, "parse_edges"):
+                edges = self.edges
         # create graph
-        return Graph(
+        graph = Graph(
+            directed=self.directed,
+            nodes=nodes,
+            edges=edges,
+            init_neighbors=self.init_neighbors,
+            stats=stats
+        )
+        if stats is not None:
+            self.count_stats(len(raw_lines), len(lines), graph)
+        return graph
+
+    async def aread(self, chunk_size: int = 10000) -> Graph:
+        """
+        Asynchronous variant of read(). The file is read by the default executor in chunks of
+        chunk_size lines, and nodes and edges are parsed in chunks of chunk_size lines with
+        a yield to the event loop after each chunk, so the task can be cancelled in between.
+        init_neighbors() runs in the executor. The result is the same graph as the one of read().
+        """
+        stats = self.stats
+        raw_line_count = 0
+        lines = []
+        with phase(stats, "read_file"):
+            with open(f"{self.path}", "r", encoding="utf-8") as file:
+                while True:
+                    raw_lines = await in_executor(read_lines, file, chunk_size)
+                    if not raw_lines:
+                        break
+                    raw_line_count += len(raw_lines)
+                    lines.extend(self.clean_lines(raw_lines))
+        self.split_lines(lines)
+        with phase(stats, "parse_nodes"):
+            nodes_dict = {}
+            fields = self.line_format(self.nodes_raw, (1, 2, 3, 4), "node")
+            for start in range(0, len(self.nodes_raw), chunk_size):
+                for node in self.parse_nodes(
+                        self.nodes_raw[start:start + chunk_size], start, fields
+                ):
+                    nodes_dict[node.name] = node
+                await asyncio.sleep(0)
+            self.nodes_dict_cache = nodes_dict
+        with phase(stats, "parse_edges"):
+            edges = []
+            fields = self.edge_format(self.edges_raw)
+            for start in range(0, len(self.edges_raw), chunk_size):
+                edges.extend(self.parse_edges(
+                    self.edges_raw[start:start + chunk_size], nodes_dict, start, fields
+                ))
+                await asyncio.sleep(0)
+        graph = Graph(
             directed=self.directed,
-            nodes=self.nodes,
-            edges=self.edges,
-            init_neighbors=self.init_neighbors
+            nodes=list(nodes_dict.values()),
+            edges=edges,
+            stats=stats
         )
+        if self.init_neighbors:
+            await in_executor(graph.init_neighbors)
+        if stats is not None:
+            self.count_stats(raw_line_count, len(lines), graph)
+        return graph
 
 
 class GraphWriter:
     """
     This class is used to create a text file from a graph object.
     """
-    def __init__(self, graph: Graph, path: str, lang: str = "ger") -> None:
+    vocab = {
+        'ger': ('Knoten', 'Kanten', 'gerichtet', 'ungerichtet'),
+        'eng': ('nodes', 'edges', 'directed', 'undirected')
+    }
+
+    def __init__(
+            self,
+            graph: Graph,
+            path: str,
+            lang: str = "ger",
+            comments: list[str] = None,
+            stats: GraphStats = None
+    ) -> None:
         self.graph = graph
         self.path = path
         self.lang = lang
+        self.comments = comments
+        self.stats = stats
         self.text = ""
 
     def write_blank_line(self) -> None:
@@ -367,92 +1103,162 @@ class GraphWriter:
         """
         self.text += "\n"
 
+    def graph_info(self) -> str:
+        """
+        Returns the leading comments, the node and edge count and the directedness of the graph
+        in the specified language.
+        """
+        if self.lang not in self.vocab:
+            raise ValueError(f"Language {self.lang} not supported")
+        nodes, edges, directed, undirected = self.vocab[self.lang]
+        text = ""
+        if self.comments:
+            for comment in self.comments:
+                text += f"# {comment}\n"
+            text += "\n"
+        text += f"{self.graph.node_count}   # {nodes}\n"
+        text += f"{self.graph.edge_count}   # {edges}\n"
+        text += f"{directed if self.graph.directed else undirected}\n"
+        return text
+
+    def node_header(self, coords: bool, weights: bool = False) -> str:
+        """
+        Returns the comment line describing the node section.
+        """
+        if self.lang == "ger":
+            columns = ("# Knotenname", " xKoord yKoord", " Knotengewicht")
+        elif self.lang == "eng":
+            columns = ("# NodeName", " xCoord yCoord", " NodeWeight")
+        else:
+            raise ValueError(f"Language {self.lang} not supported")
+        return f"{columns[0]}{columns[1] if coords else ''}{columns[2] if weights else ''}\n"
+
+    def edge_header(self, weights: bool) -> str:
+        """
+        Returns the comment line describing the edge section.
+        """
+        if self.lang == "ger":
+            if weights:
+                return "# Kantenname Knotenname1 Knotenname2 Kantengewicht\n"
+            return "# Kantenname Knotenname1 Knotenname2\n"
+        if self.lang == "eng":
+            if weights:
+                return "# EdgeName NodeName1 NodeName2 EdgeWeight\n"
+            return "# EdgeName NodeName1 NodeName2\n"
+        raise ValueError(f"Language {self.lang} not supported")
+
+    @staticmethod
+    def coord_string(coord: float) -> str:
+        """
+        Returns a coordinate as written to the file. Integer coordinates are written without
+        decimals and missing ones as nan.
+        """
+        if coord is None:
+            return "nan"
+        # make integers of coordinates if they are integers
+        return str(int(coord) if float(coord).is_integer() else coord)
+
+    @staticmethod
+    def node_line(
+            name: str,
+            x_coord: float = None,
+            y_coord: float = None,
+            weight: float = None,
+            coords: bool = None,
+            weights: bool = None
+    ) -> str:
+        """
+        Returns the line of a single node. coords and weights tell whether the node section has
+        these columns and default to the presence of the values. Missing values in a column of
+        the section are written as nan, so all lines of a section have the same format.
+        """
+        line = f"{name}"
+        if x_coord is not None or y_coord is not None if coords is None else coords:
+            line += f" {GraphWriter.coord_string(x_coord)} {GraphWriter.coord_string(y_coord)}"
+        if weight is not None if weights is None else weights:
+            line += f" {nan if weight is None else weight}"
+        return f"{line}\n"
+
+    @staticmethod
+    def edge_line(
+            name: str,
+            head: str,
+            tail: str,
+            weight: float = None,
+            weights: bool = None
+    ) -> str:
+        """
+        Returns the line of a single edge given the names of the edge and its nodes. Like for
+        node_line(), weights tells whether the edge section has a weight column.
+        """
+        if weight is not None if weights is None else weights:
+            return f"{name} {head} {tail} {nan if weight is None else weight}\n"
+        return f"{name} {head} {tail}\n"
+
+    def section_columns(self) -> tuple[bool, bool, bool]:
+        """
+        Returns whether the node section has coordinates and weights and whether the edge
+        section has weights, which is the case if any node or edge has them.
+        """
+        return (
+            any(node.x_coord is not None or node.y_coord is not None for node in self.graph.nodes),
+            any(node.weight is not None for node in self.graph.nodes),
+            any(edge.weight is not None for edge in self.graph.edges)
+        )
+
     def write_graph_info(self) -> None:
         """
         Writes the graph information to the text file.
         """
-        # define languages and corresponding vocabulary
-        vocab = {
-            'ger': ('Knoten', 'Kanten', 'gerichtet', 'ungerichtet'),
-            'eng': ('nodes', 'edges', 'directed', 'undirected')
-        }
-        # write graph information in the specified language
-        for language in vocab:
-            if language == self.lang:
-                self.text += f"{self.graph.node_count}   # {vocab[language][0]}\n"
-                self.text += f"{self.graph.edge_count}   # {vocab[language][1]}\n"
-                if self.graph.directed:
-                    self.text += f"{vocab[language][2]}\n"
-                else:
-                    self.text += f"{vocab[language][3]}\n"
-                break
-            raise ValueError(f"Language {self.lang} not supported")
+        self.text += self.graph_info()
         self.write_blank_line()
 
     def write_nodes(self) -> None:
         """
         Writes the node information to the text file.
         """
+        coords, weights, _ = self.section_columns()
         # write header in the specified language
-        if all(v is not None for v in [self.graph.nodes[0].x_coord, self.graph.nodes[0].y_coord]):
-            if self.lang == "ger":
-                self.text += "# Knotenname xKoord yKoord\n"
-            elif self.lang == "eng":
-                self.text += "# NodeName xCoord yCoord\n"
-        elif all(v is None for v in [self.graph.nodes[0].x_coord, self.graph.nodes[0].y_coord]):
-            if self.lang == "ger":
-                self.text += "# Knotenname\n"
-            elif self.lang == "eng":
-                self.text += "# NodeName\n"
-        else:
-            raise ValueError(f"Language {self.lang} not supported")
+        self.text += self.node_header(coords, weights)
         self.write_blank_line()
         # write nodes
-        for node in self.graph.nodes:
-            # make integers of coordinates if they are integers
-            x_coord = int(node.x_coord) if node.x_coord.is_integer() else node.x_coord
-            y_coord = int(node.y_coord) if node.y_coord.is_integer() else node.y_coord
-            self.text += f"{node.name} {x_coord} {y_coord}\n"
+        self.text += "".join([
+            self.node_line(node.name, node.x_coord, node.y_coord, node.weight, coords, weights)
+            for node in self.graph.nodes
+        ])
         self.write_blank_line()
 
     def write_edges(self) -> None:
         """
         Writes the edge information to the text file.
         """
-        if self.lang == "ger":
-            if any(edge.weight is not None for edge in self.graph.edges):
-                self.text += "# Kantenname Knotenname1 Knotenname2 Kantengewicht\n"
-            else:
-                self.text += "# Kantenname Knotenname1 Knotenname2\n"
-        elif self.lang == "eng":
-            if any(edge.weight is not None for edge in self.graph.edges):
-                self.text += "# EdgeName NodeName1 NodeName2 EdgeWeight\n"
-            else:
-                self.text += "# EdgeName NodeName1 NodeName2\n"
-        else:
-            raise ValueError(f"Language {self.lang} not supported")
+        weights = self.section_columns()[2]
+        self.text += self.edge_header(weights)
         self.write_blank_line()
         # write edges
-        for edge in self.graph.edges:
-            if "_reversed" not in edge.name:
-                if edge.weight is not None:
-                    self.text += f"{edge.name} {edge.head.name} {edge.tail.name} {edge.weight}\n"
-                else:
-                    self.text += f"{edge.name} {edge.head.name} {edge.tail.name}\n"
+        self.text += "".join([
+            self.edge_line(edge.name, edge.head.name, edge.tail.name, edge.weight, weights)
+            for edge in self.graph.edges if "_reversed" not in edge.name
+        ])
+
+    def file_path(self) -> Path:
+        """
+        Returns the path of the text file. If a directory is given, the file is named after the
+        graph.
+        """
+        if self.path is None:
+            return Path.cwd() / f"{self.graph.auto_name()}.gra"
+        if self.path.endswith(".gra"):
+            return Path(self.path)
+        if Path(self.path).is_dir():
+            return Path(self.path) / f"{self.graph.auto_name()}.gra"
+        raise ValueError(f"Path {self.path} not valid")
 
     def save(self) -> None:
         """
         Saves the text file.
         """
-        if self.path.endswith(".gra"):
-            path = Path(self.path)
-        elif Path(self.path).is_dir():
-            path = Path(self.path) / self.graph.auto_name() / ".gra"
-        elif self.path is None:
-            path = Path.cwd() / self.graph.auto_name() / ".gra"
-        else:
-            raise ValueError(f"Path {self.path} not valid")
-        with open(path, "w", encoding="utf-8") as file:
+        with open(self.file_path(), "w", encoding="utf-8") as file:
             file.write(self.text)
 
     def write(self) -> None:
@@ -461,7 +1267,96 @@ class GraphWriter:
         """
         # write graph
         self.write_graph_info()
-        self.write_nodes()
-        self.write_edges()
+        with phase(self.stats, "write_nodes"):
+            self.write_nodes()
+        with phase(self.stats, "write_edges"):
+            self.write_edges()
         # save file
-        self.save()
+        with phase(self.stats, "save"):
+            self.save()
+        if self.stats is not None:
+            self.stats.count("lines_written", self.text.count("\n"))
+
+    def text_chunks(
+            self,
+            node_rows: Iterable[tuple] = None,
+            edge_rows: Iterable[tuple] = None,
+            coords: bool = True,
+            weights: bool = True,
+            chunk_size: int = 65536,
+            node_weights: bool = False
+    ) -> Iterator[str]:
+        """
+        Yields the text of the file in chunks of at most chunk_size node or edge lines. The nodes
+        and edges are given as rows (name, x_coord, y_coord) or (name, x_coord, y_coord, weight)
+        and (name, head, tail, weight), which may be generators. coords, node_weights and weights
+        tell which columns the sections have. If no rows are given, they are taken from the graph
+        object together with the columns.
+        """
+        if node_rows is None:
+            coords, node_weights, _ = self.section_columns()
+            node_rows = (
+                (node.name, node.x_coord, node.y_coord, node.weight) for node in self.graph.nodes
+            )
+        if edge_rows is None:
+            weights = self.section_columns()[2]
+            edge_rows = (
+                (edge.name, edge.head.name, edge.tail.name, edge.weight)
+                for edge in self.graph.edges if "_reversed" not in edge.name
+            )
+        node_line = self.node_line
+        edge_line = self.edge_line
+        nodes_written = 0
+        edges_written = 0
+        yield f"{self.graph_info()}\n{self.node_header(coords, node_weights)}\n"
+        chunk = []
+        for row in node_rows:
+            chunk.append(node_line(*row, coords=coords, weights=node_weights))
+            if len(chunk) == chunk_size:
+                nodes_written += len(chunk)
+                yield "".join(chunk)
+                chunk.clear()
+        nodes_written += len(chunk)
+        chunk.append(f"\n{self.edge_header(weights)}\n")
+        yield "".join(chunk)
+        chunk.clear()
+        for row in edge_rows:
+            chunk.append(edge_line(*row, weights=weights))
+            if len(chunk) == chunk_size:
+                edges_written += len(chunk)
+                yield "".join(chunk)
+                chunk.clear()
+        edges_written += len(chunk)
+        yield "".join(chunk)
+        if self.stats is not None:
+            self.stats.count("nodes_written", nodes_written)
+            self.stats.count("edges_written", edges_written)
+
+    def stream(
+            self,
+            node_rows: Iterable[tuple] = None,
+            edge_rows: Iterable[tuple] = None,
+            coords: bool = True,
+            weights: bool = True,
+            chunk_size: int = 65536,
+            node_weights: bool = False
+    ) -> None:
+        """
+        Writes the graph to the text file without building the whole text in memory. See
+        text_chunks() for the arguments.
+        """
+        with phase(self.stats, "stream"), open(self.file_path(), "w", encoding="utf-8") as file:
+            for chunk in self.text_chunks(
+                    node_rows, edge_rows, coords, weights, chunk_size, node_weights
+            ):
+                file.write(chunk)
+
+    async def awrite(self, chunk_size: int = 10000) -> None:
+        """
+        Asynchronous variant of write(). The text is built in chunks of chunk_size lines and every
+        chunk is written by the default executor, so the event loop is never blocked for long and
+        the task can be cancelled between chunks. The file is identical to the one of write().
+        """
+        with phase(self.stats, "stream"), open(self.file_path(), "w", encoding="utf-8") as file:
+            for chunk in self.text_chunks(chunk_size=chunk_size):
+                await in_executor(file.write, chunk)
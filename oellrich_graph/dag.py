@@ -0,0 +1,183 @@
+"""
+This module contains algorithms for directed acyclic graphs, such as scheduling networks: a
+topological sort after Kahn, which reports a cycle if there is one, and shortest and longest
+paths in O(V + E) by relaxing the edges in topological order. Longest paths give the critical
+path of a network whose node weights are durations.
+"""
+from array import array
+from collections import deque
+from math import inf
+
+from .core import Graph, Node, Edge
+from .shortest_paths import ForwardStar
+from .stats import phase
+
+
+class CycleError(ValueError):
+    """
+    Error raised for a graph that contains a cycle. The attribute cycle holds the edges of one
+    cycle of the graph in their order along it.
+    """
+    def __init__(self, message: str, cycle: list[Edge]):
+        super().__init__(message)
+        self.cycle = cycle
+
+
+def topological_order(graph: Graph, star: ForwardStar) -> list[int]:
+    """
+    Returns the node indices of a graph in topological order after Kahn. The in-degrees are
+    counted from the backward edges of the nodes. Raises a CycleError if the graph has a cycle.
+    """
+    if not graph.directed:
+        raise ValueError("topological_sort(graph): the graph is not directed!")
+    in_degree = array("q", bytes(8 * star.node_slots))
+    for node in star.nodes:
+        if node is not None:
+            in_degree[node.index] = sum(1 for _ in graph.b_edges(node))
+    queue = deque(i for i, node in enumerate(star.nodes) if node is not None and not in_degree[i])
+    offsets, targets = star.offsets, star.targets
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for arc in range(offsets[node], offsets[node + 1]):
+            other = targets[arc]
+            in_degree[other] -= 1
+            if not in_degree[other]:
+                queue.append(other)
+    if len(order) < sum(1 for node in star.nodes if node is not None):
+        cycle = find_cycle(graph, star, in_degree)
+        raise CycleError(
+            "topological_sort(graph): the graph contains the cycle "
+            f"{' -> '.join([cycle[0].head.name] + [edge.tail.name for edge in cycle])}!",
+            cycle
+        )
+    return order
+
+
+def find_cycle(graph: Graph, star: ForwardStar, in_degree: array) -> list[Edge]:
+    """
+    Returns a cycle among the nodes left over by Kahn's algorithm. Every such node has a
+    backward edge from another one, so following them must close a cycle.
+    """
+    node = next(node for node in star.nodes if node is not None and in_degree[node.index])
+    position = {}
+    edges = []
+    while node.index not in position:
+        position[node.index] = len(edges)
+        edge = next(edge for edge in graph.b_edges(node) if in_degree[edge.head.index])
+        edges.append(edge)
+        node = edge.head
+    cycle = edges[position[node.index]:]
+    cycle.reverse()
+    return cycle
+
+
+def topological_sort(graph: Graph) -> list[Node]:
+    """
+    Returns the nodes of a directed graph in topological order, so every edge leads from an
+    earlier to a later node. Raises a CycleError with a witness cycle if there is no such order.
+    """
+    star = ForwardStar(graph, weighted=False)
+    with phase(graph.stats, "topological_sort"):
+        return [star.nodes[i] for i in topological_order(graph, star)]
+
+
+def dag_distances(
+        graph: Graph,
+        source: Node = None,
+        longest: bool = False,
+        weighted: bool = True,
+        node_weights: bool = False
+) -> tuple[array, list]:
+    """
+    Returns the shortest, or with longest=True the longest, path lengths from source to all nodes
+    of a directed acyclic graph as array('d') indexed by Node.index, together with a list of the
+    last edge of each path or None. Without source, paths start at all nodes without backward
+    edges, which gives the finish times of a schedule for longest=True. The edges are
+    weighted by Edge.weight, or all 1 with weighted=False. With node_weights=True, Node.weight is
+    added for every node on a path, its first included, so the lengths are finish times when the
+    node weights are durations. Unreachable nodes have the length inf, or -inf for longest=True.
+    """
+    star = ForwardStar(graph, weighted)
+    with phase(graph.stats, "dag_distances"):
+        order = topological_order(graph, star)
+        durations = array("d", bytes(8 * star.node_slots))
+        if node_weights:
+            for node in star.nodes:
+                if node is not None and node.weight is not None:
+                    durations[node.index] = node.weight
+        unreached = -inf if longest else inf
+        dist = array("d", [unreached]) * star.node_slots
+        pred = [None] * star.node_slots
+        if source is None:
+            for node in star.nodes:
+                if node is not None and next(iter(graph.b_edges(node)), None) is None:
+                    dist[node.index] = durations[node.index]
+        else:
+            dist[source.index] = durations[source.index]
+        offsets, targets, weights = star.offsets, star.targets, star.weights
+        for node in order:
+            distance = dist[node]
+            if distance == unreached:
+                continue
+            for arc in range(offsets[node], offsets[node + 1]):
+                other = targets[arc]
+                candidate = distance + weights[arc] + durations[other]
+                if candidate > dist[other] if longest else candidate < dist[other]:
+                    dist[other] = candidate
+                    pred[other] = star.edges[arc]
+    return dist, pred
+
+
+def edge_path(pred: list, target: Node) -> list[Edge]:
+    """
+    Returns the edges of the path to target encoded in a list of last edges.
+    """
+    path = []
+    edge = pred[target.index]
+    while edge is not None:
+        path.append(edge)
+        edge = pred[edge.head.index]
+    path.reverse()
+    return path
+
+
+def dag_path(
+        graph: Graph,
+        source: Node,
+        target: Node,
+        longest: bool = False,
+        weighted: bool = True,
+        node_weights: bool = False
+) -> tuple[float, list[Edge]]:
+    """
+    Returns the length and the edges of a shortest, or with longest=True a longest, path from
+    source to target in a directed acyclic graph. The arguments are those of dag_distances(). An
+    unreachable target gives inf, or -inf for longest=True, and an empty list.
+    """
+    dist, pred = dag_distances(graph, source, longest, weighted, node_weights)
+    return dist[target.index], edge_path(pred, target)
+
+
+def critical_path(
+        graph: Graph,
+        weighted: bool = True,
+        node_weights: bool = True
+) -> tuple[float, list[Node]]:
+    """
+    Returns the length and the nodes of a longest path of a directed acyclic graph from a node
+    without backward edges to one without forward edges. With the node weights as durations,
+    which is the default, the length is the duration of the whole schedule and the nodes are the
+    critical activities.
+    """
+    dist, pred = dag_distances(graph, None, True, weighted, node_weights)
+    nodes = [
+        node for node in graph.nodes
+        if graph.contains_node(node) and next(iter(graph.f_edges(node)), None) is None
+    ]
+    if not nodes:
+        return 0.0, []
+    end = max(nodes, key=lambda node: dist[node.index])
+    path = edge_path(pred, end)
+    return dist[end.index], [edge.head for edge in path] + [end]
@@ -0,0 +1,290 @@
+"""
+This module contains seeded generators for large synthetic graphs. The generators produce random
+geometric, grid and scale-free graphs with integer coordinates and edge weights. They can either
+stream their nodes and edges straight into a .gra file via the GraphWriter or build a Graph object.
+Streaming runs in linear time and constant extra memory, since coordinates are derived from a hash
+of the seed and the node number instead of being stored.
+"""
+from abc import ABC, abstractmethod
+from math import ceil, isqrt
+from random import Random
+from typing import Iterator
+
+from .core import Graph, Node, Edge, GraphWriter
+
+MASK_64 = (1 << 64) - 1
+
+
+def mix(value: int) -> int:
+    """
+    Returns the splitmix64 hash of an integer. It is used to derive reproducible pseudo random
+    numbers from a seed and a node number without keeping any state.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class GeneratorWriter(GraphWriter):
+    """
+    GraphWriter with the section headers of the files of the generator 2.2 by Martin Oellrich.
+    """
+    def node_header(self, coords: bool, weights: bool = False) -> str:
+        if self.lang == "ger" and coords and not weights:
+            return "# KnotenNr   x-Koord   y-Koord\n"
+        return super().node_header(coords, weights)
+
+    def edge_header(self, weights: bool) -> str:
+        if self.lang == "ger" and weights:
+            return "# KanteNr   KnotenA   KnotenB   Gewicht\n"
+        return super().edge_header(weights)
+
+
+class GraphGenerator(ABC):
+    """
+    Base class for the synthetic graph generators. Subclasses implement node_rows() and
+    edge_rows(), which yield the rows (name, x_coord, y_coord) and (name, head, tail, weight) in
+    the order they appear in the file. Node and edge names are their numbers, like in the files of
+    the generator 2.2 by Martin Oellrich.
+    """
+    graph_type = "synthetic"
+
+    def __init__(self, node_count: int, edge_count: int, seed: int = 0, directed: bool = False):
+        self.node_count = node_count
+        self.edge_count = edge_count
+        self.seed = seed
+        self.directed = directed
+        self.name = ""
+
+    @abstractmethod
+    def node_rows(self) -> Iterator[tuple]:
+        """
+        Yields the node rows (name, x_coord, y_coord).
+        """
+
+    @abstractmethod
+    def edge_rows(self) -> Iterator[tuple]:
+        """
+        Yields the edge rows (name, head, tail, weight) with node names as head and tail.
+        """
+
+    def comments(self) -> list[str]:
+        """
+        Returns the header comments of the file in the format of the generator 2.2. The graph
+        type is written as a name, since the numeric types of the generator 2.2 are not known
+        for these graphs.
+        """
+        return [
+            f"generator 2.2 (oellrich_graph, seed {self.seed})",
+            f"Graphtyp {self.graph_type}",
+        ]
+
+    def auto_name(self) -> str:
+        """
+        Creates a name for the generated graph based on its type, size and seed.
+        """
+        if self.name == "":
+            return (
+                f"{self.graph_type}_{self.node_count}-nodes_{self.edge_count}-edges"
+                f"_seed-{self.seed}"
+            )
+        return self.name
+
+    def write(self, path: str, lang: str = "ger") -> None:
+        """
+        Streams the graph into a .gra file without creating Node or Edge objects.
+        """
+        GeneratorWriter(self, path, lang, comments=self.comments()).stream(
+            self.node_rows(), self.edge_rows()
+        )
+
+    def to_graph(self, init_neighbors: bool = False) -> Graph:
+        """
+        Builds a Graph object holding the generated nodes and edges. Names, coordinates and
+        weights have the same types as in a graph read from the written file.
+        """
+        nodes = [
+            Node(str(name), float(x_coord), float(y_coord), index)
+            for index, (name, x_coord, y_coord) in enumerate(self.node_rows())
+        ]
+        edges = [
+            Edge(str(name), nodes[int(head)], nodes[int(tail)], index, float(weight))
+            for index, (name, head, tail, weight) in enumerate(self.edge_rows())
+        ]
+        return Graph(
+            name=self.name,
+            directed=self.directed,
+            nodes=nodes,
+            edges=edges,
+            init_neighbors=init_neighbors
+        )
+
+
+class GridGraph(GraphGenerator):
+    """
+    Generator for a rectangular grid graph with rows * cols nodes. Node r * cols + c lies at the
+    coordinates (c * spacing, r * spacing) and is connected to its right and lower neighbor. The
+    edge weights are drawn uniformly from 1 to max_weight.
+    """
+    graph_type = "grid"
+
+    def __init__(
+            self,
+            rows: int,
+            cols: int,
+            seed: int = 0,
+            directed: bool = False,
+            spacing: int = 1,
+            max_weight: int = 1
+    ):
+        super().__init__(rows * cols, rows * (cols - 1) + (rows - 1) * cols, seed, directed)
+        self.rows = rows
+        self.cols = cols
+        self.spacing = spacing
+        self.max_weight = max_weight
+
+    def node_rows(self) -> Iterator[tuple]:
+        spacing = self.spacing
+        for row in range(self.rows):
+            for col in range(self.cols):
+                yield row * self.cols + col, col * spacing, row * spacing
+
+    def edge_rows(self) -> Iterator[tuple]:
+        rng = Random(self.seed)
+        max_weight = self.max_weight
+        cols = self.cols
+        name = 0
+        for row in range(self.rows):
+            for col in range(cols):
+                node = row * cols + col
+                if col + 1 < cols:
+                    yield name, node, node + 1, rng.randint(1, max_weight)
+                    name += 1
+                if row + 1 < self.rows:
+                    yield name, node, node + cols, rng.randint(1, max_weight)
+                    name += 1
+
+
+class RandomGeometricGraph(GraphGenerator):
+    """
+    Generator for a random geometric graph. The plane is divided into square cells of side
+    cell_size, which are filled with consecutive node numbers at random positions. Every edge
+    connects a random node to a random node in the same or an adjacent cell and is weighted with
+    the rounded up euclidean distance. Parallel edges are possible, self-loops are not.
+    """
+    graph_type = "random_geometric"
+
+    def __init__(
+            self,
+            node_count: int,
+            edge_count: int = None,
+            seed: int = 0,
+            directed: bool = False,
+            nodes_per_cell: int = 4,
+            cell_size: int = 10
+    ):
+        if node_count < 2:
+            raise ValueError("RandomGeometricGraph: at least two nodes are needed!")
+        super().__init__(
+            node_count, 2 * node_count if edge_count is None else edge_count, seed, directed
+        )
+        self.cell_size = cell_size
+        self.side = max(1, isqrt(ceil(node_count / nodes_per_cell)))
+        self.cells = self.side * self.side
+
+    def cell(self, node: int) -> int:
+        """
+        Returns the cell of a node.
+        """
+        return ((node + 1) * self.cells - 1) // self.node_count
+
+    def cell_start(self, cell: int) -> int:
+        """
+        Returns the first node of a cell. The nodes of a cell are the numbers from cell_start(cell)
+        up to cell_start(cell + 1).
+        """
+        return cell * self.node_count // self.cells
+
+    def coords(self, node: int) -> tuple[int, int]:
+        """
+        Returns the coordinates of a node derived from the seed and the node number.
+        """
+        row, col = divmod(self.cell(node), self.side)
+        value = mix((self.seed << 40) ^ node)
+        return (
+            col * self.cell_size + (value & 0xFFFFFFFF) % self.cell_size,
+            row * self.cell_size + (value >> 32) % self.cell_size
+        )
+
+    def node_rows(self) -> Iterator[tuple]:
+        coords = self.coords
+        for node in range(self.node_count):
+            x_coord, y_coord = coords(node)
+            yield node, x_coord, y_coord
+
+    def edge_rows(self) -> Iterator[tuple]:
+        rng = Random(self.seed)
+        side = self.side
+        name = 0
+        while name < self.edge_count:
+            head = rng.randrange(self.node_count)
+            row, col = divmod(self.cell(head), side)
+            row = min(max(row + rng.randint(-1, 1), 0), side - 1)
+            col = min(max(col + rng.randint(-1, 1), 0), side - 1)
+            cell = row * side + col
+            start = self.cell_start(cell)
+            end = self.cell_start(cell + 1)
+            if end == start:
+                continue
+            tail = rng.randrange(start, end)
+            if tail == head:
+                continue
+            (x_head, y_head), (x_tail, y_tail) = self.coords(head), self.coords(tail)
+            distance = ((x_head - x_tail) ** 2 + (y_head - y_tail) ** 2) ** 0.5
+            yield name, head, tail, max(1, ceil(distance))
+            name += 1
+
+
+class ScaleFreeGraph(GraphGenerator):
+    """
+    Generator for a scale-free graph by index based preferential attachment. Node i connects to
+    min(i, edges_per_node) earlier nodes floor(i * u ** 2) for uniform u, which favors old nodes
+    and yields a power law degree distribution with exponent about 3, like the Barabasi-Albert
+    model, without storing the degrees. Parallel edges are possible. Coordinates are uniform in
+    [0, extent) and the edge weights are drawn uniformly from 1 to max_weight.
+    """
+    graph_type = "scale_free"
+
+    def __init__(
+            self,
+            node_count: int,
+            edges_per_node: int = 2,
+            seed: int = 0,
+            directed: bool = False,
+            extent: int = 1000,
+            max_weight: int = 10
+    ):
+        m = min(edges_per_node, max(node_count - 1, 0))
+        # the first m nodes connect to all earlier nodes, all others to m of them
+        edge_count = m * (m - 1) // 2 + m * max(node_count - m, 0)
+        super().__init__(node_count, edge_count, seed, directed)
+        self.edges_per_node = edges_per_node
+        self.extent = extent
+        self.max_weight = max_weight
+
+    def node_rows(self) -> Iterator[tuple]:
+        extent = self.extent
+        for node in range(self.node_count):
+            value = mix((self.seed << 40) ^ node)
+            yield node, (value & 0xFFFFFFFF) % extent, (value >> 32) % extent
+
+    def edge_rows(self) -> Iterator[tuple]:
+        rng = Random(self.seed)
+        random = rng.random
+        max_weight = self.max_weight
+        name = 0
+        for head in range(1, self.node_count):
+            for _ in range(min(head, self.edges_per_node)):
+                yield name, head, int(head * random() ** 2), rng.randint(1, max_weight)
+                name += 1
@@ -0,0 +1,211 @@
+"""
+This module contains the conversion of graphs to and from sparse adjacency and incidence matrices
+for linear algebra workloads. Matrices are returned in the argument format of the SciPy sparse
+constructors: ((data, indices, indptr), shape) for CSR and ((data, (row, col)), shape) for COO,
+with NumPy arrays, or as SciPy sparse matrices on request. NumPy is required, SciPy is optional.
+"""
+from .core import Graph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LAYOUTS = ("csr", "coo")
+
+
+def require_numpy() -> None:
+    """
+    Raises an ImportError if NumPy is not installed.
+    """
+    if numpy is None:
+        raise ImportError("The matrix conversion of oellrich_graph requires NumPy!")
+
+
+def edge_arrays(graph: Graph, weighted: bool) -> tuple:
+    """
+    Returns the head and tail positions in the node list and the weights of the original edges
+    of a graph or view as NumPy arrays. Missing weights and all weights of an unweighted
+    conversion are 1.
+    """
+    nodes = graph.nodes or []
+    edges = graph.original_edges()
+    positions = {id(node): i for i, node in enumerate(nodes)}
+    count = len(edges)
+    heads = numpy.fromiter((positions[id(edge.head)] for edge in edges), numpy.int64, count)
+    tails = numpy.fromiter((positions[id(edge.tail)] for edge in edges), numpy.int64, count)
+    if weighted:
+        weights = numpy.fromiter(
+            (1.0 if edge.weight is None else edge.weight for edge in edges), numpy.float64, count
+        )
+    else:
+        weights = numpy.ones(count)
+    return heads, tails, weights, len(nodes)
+
+
+def stable_order(keys):
+    """
+    Returns the permutation sorting non-negative integer keys stably, in linear time for keys
+    below 2^32: NumPy sorts keys of 16 bits with a radix sort, so the keys are sorted by their
+    low and then by their high 16 bits. Larger keys fall back to a merge sort.
+    """
+    if len(keys) == 0 or keys.max() >= 1 << 32:
+        return numpy.argsort(keys, kind="stable")
+    order = numpy.argsort((keys & 0xFFFF).astype(numpy.uint16), kind="stable")
+    high = (keys[order] >> 16).astype(numpy.uint16)
+    return order[numpy.argsort(high, kind="stable")]
+
+
+def build(data, row, col, shape: tuple[int, int], layout: str, scipy: bool):
+    """
+    Builds a matrix in the requested layout from COO triplets. CSR rows are sorted with a
+    stable radix sort in linear time, so entries of a row keep their edge order.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Matrix layout {layout} not supported, use one of {LAYOUTS}")
+    if layout == "coo":
+        matrix = ((data, (row, col)), shape)
+    else:
+        order = stable_order(row)
+        indptr = numpy.zeros(shape[0] + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(row, minlength=shape[0]), out=indptr[1:])
+        matrix = ((data[order], col[order], indptr), shape)
+    if scipy:
+        # pylint: disable=import-outside-toplevel
+        from scipy import sparse
+        return (sparse.coo_matrix if layout == "coo" else sparse.csr_matrix)(*matrix)
+    return matrix
+
+
+def adjacency_matrix(
+        graph: Graph,
+        layout: str = "csr",
+        weighted: bool = True,
+        scipy: bool = False
+):
+    """
+    Returns the n x n adjacency matrix of a graph with the entry (head, tail) for every edge,
+    weighted by Edge.weight. Undirected graphs get a symmetric matrix with a single diagonal
+    entry per self-loop. Parallel edges give duplicate entries, which SciPy sums up.
+    """
+    require_numpy()
+    heads, tails, weights, node_count = edge_arrays(graph, weighted)
+    if graph.directed:
+        row, col, data = heads, tails, weights
+    else:
+        loops = heads == tails
+        row = numpy.concatenate((heads, tails[~loops]))
+        col = numpy.concatenate((tails, heads[~loops]))
+        data = numpy.concatenate((weights, weights[~loops]))
+    return build(data, row, col, (node_count, node_count), layout, scipy)
+
+
+def incidence_matrix(
+        graph: Graph,
+        layout: str = "csr",
+        weighted: bool = False,
+        oriented: bool = None,
+        scipy: bool = False
+):
+    """
+    Returns the n x m incidence matrix of a graph with one column per edge. An oriented matrix,
+    the default for directed graphs, has -w at the head and w at the tail of an edge, an
+    unoriented one w at both nodes, where w is the weight or 1. Self-loops have no entries in an
+    oriented matrix and a single entry 2w in an unoriented one.
+    """
+    require_numpy()
+    heads, tails, weights, node_count = edge_arrays(graph, weighted)
+    oriented = graph.directed if oriented is None else oriented
+    columns = numpy.arange(len(heads))
+    loops = heads == tails
+    if oriented:
+        keep = ~loops
+        row = numpy.concatenate((heads[keep], tails[keep]))
+        col = numpy.concatenate((columns[keep], columns[keep]))
+        data = numpy.concatenate((-weights[keep], weights[keep]))
+    else:
+        row = numpy.concatenate((heads, tails[~loops]))
+        col = numpy.concatenate((columns, columns[~loops]))
+        data = numpy.concatenate((numpy.where(loops, 2 * weights, weights), weights[~loops]))
+    # sort by column, so the matrix lists the nodes of each edge together
+    order = stable_order(col)
+    return build(data[order], row[order], col[order], (node_count, len(heads)), layout, scipy)
+
+
+def coo_triplets(matrix) -> tuple:
+    """
+    Returns the data, row and col arrays and the shape of a SciPy sparse matrix, a dense NumPy
+    array or a matrix in one of the tuple formats returned by this module.
+    """
+    require_numpy()
+    if hasattr(matrix, "tocoo"):
+        matrix = matrix.tocoo()
+        return matrix.data, matrix.row, matrix.col, matrix.shape
+    if isinstance(matrix, tuple):
+        arrays, shape = matrix
+        if len(arrays) == 2:
+            data, (row, col) = arrays
+            return numpy.asarray(data), numpy.asarray(row), numpy.asarray(col), shape
+        data, indices, indptr = (numpy.asarray(array) for array in arrays)
+        row = numpy.repeat(numpy.arange(shape[0]), numpy.diff(indptr))
+        return data, row, indices, shape
+    matrix = numpy.asarray(matrix)
+    row, col = numpy.nonzero(matrix)
+    return matrix[row, col], row, col, matrix.shape
+
+
+def from_adjacency_matrix(matrix, directed: bool = True, **kwargs) -> Graph:
+    """
+    Creates a graph with an edge for every nonzero entry of an adjacency matrix, weighted by the
+    entry. For undirected graphs only the upper triangle with the diagonal is used. Further
+    keyword arguments are passed to Graph.from_edge_arrays().
+    """
+    data, row, col, shape = coo_triplets(matrix)
+    if shape[0] != shape[1]:
+        raise ValueError(f"Adjacency matrix must be square, got shape {shape}")
+    keep = data != 0 if directed else (data != 0) & (row <= col)
+    return Graph.from_edge_arrays(
+        row[keep], col[keep], weights=data[keep].astype(numpy.float64), directed=directed,
+        node_count=shape[0], **kwargs
+    )
+
+
+def from_incidence_matrix(
+        matrix,
+        directed: bool = True,
+        weighted: bool = False,
+        **kwargs
+) -> Graph:
+    """
+    Creates a graph from an incidence matrix with one edge per column. Columns of directed graphs
+    hold a negative entry at the head and a positive one at the tail, columns of undirected
+    graphs two positive entries or a single one for a self-loop. With weighted=True, the edges
+    are weighted by the absolute value of their entries. Further keyword arguments are passed to
+    Graph.from_edge_arrays().
+    """
+    data, row, col, shape = coo_triplets(matrix)
+    keep = data != 0
+    data, row, col = data[keep], row[keep], col[keep]
+    counts = numpy.bincount(col, minlength=shape[1])
+    invalid = (counts < 1) | (counts > 2)
+    if directed:
+        invalid |= counts != 2
+    if numpy.any(invalid):
+        bad = int(numpy.flatnonzero(invalid)[0])
+        raise ValueError(f"Incidence matrix column {bad} has {counts[bad]} nonzero entries")
+    # sort the entries by column and, within a column, the negative entry first
+    order = numpy.lexsort((data, col))
+    data, row = data[order], row[order]
+    first = numpy.zeros(shape[1], dtype=numpy.int64)
+    numpy.cumsum(counts[:-1], out=first[1:])
+    last = first + counts - 1
+    if directed and numpy.any((data[first] >= 0) | (data[last] <= 0)):
+        raise ValueError("Incidence matrix of a directed graph needs a negative and a positive "
+                         "entry per column")
+    weights = None
+    if weighted:
+        weights = numpy.abs(data[last]).astype(numpy.float64)
+        weights[counts == 1] /= 2
+    return Graph.from_edge_arrays(
+        row[first], row[last], weights=weights, directed=directed, node_count=shape[0], **kwargs
+    )
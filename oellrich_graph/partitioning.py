@@ -0,0 +1,436 @@
+"""
+This module contains the partitioning of a graph into k balanced parts with few cut edges, for
+graphs that are processed by several workers. Regions are grown by breadth-first search from
+seeds spread over the node coordinates and then refined with Fiduccia-Mattheyses passes. Each part
+can be written as a shard: a graph of its own nodes, its halo of adjacent nodes owned by other
+parts and the edges between them, together with the metadata workers need to exchange the
+values of boundary nodes.
+"""
+import pickle
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+from math import ceil, floor, hypot, inf
+from pathlib import Path
+
+from .core import Graph, GraphReader, GraphWriter, Node, Edge
+
+
+class Shard:
+    """
+    Class for one part of a partitioned graph. graph holds the nodes of the part, followed by its
+    halo nodes, and every edge with at least one node in the part. halo maps the name of every
+    halo node to the part owning it, and boundary maps the name of every node of the part with
+    neighbors in other parts to the sorted list of these parts. A worker sends the values of its
+    boundary nodes to the listed parts and receives the values of its halo nodes from their
+    owners.
+    """
+    def __init__(
+            self,
+            graph: Graph,
+            part: int,
+            part_count: int,
+            halo: dict[str, int],
+            boundary: dict[str, list[int]]
+    ) -> None:
+        self.graph = graph
+        self.part = part
+        self.part_count = part_count
+        self.halo = halo
+        self.boundary = boundary
+
+    def owns(self, node: Node) -> bool:
+        """
+        Returns True if the node belongs to the part and not to its halo.
+        """
+        return node.name not in self.halo
+
+    def owned_nodes(self) -> list[Node]:
+        """
+        Returns the nodes of the part without the halo.
+        """
+        return [node for node in self.graph.nodes if node.name not in self.halo]
+
+    def halo_nodes(self) -> list[Node]:
+        """
+        Returns the halo nodes, which belong to other parts.
+        """
+        return [node for node in self.graph.nodes if node.name in self.halo]
+
+    def comments(self) -> list[str]:
+        """
+        Returns the metadata of the shard as header comments of a .gra file.
+        """
+        return (
+            [f"shard {self.part} {self.part_count}"]
+            + [f"halo {name} {owner}" for name, owner in self.halo.items()]
+            + [
+                f"boundary {name} {' '.join(map(str, parts))}"
+                for name, parts in self.boundary.items()
+            ]
+        )
+
+    def write(self, path: str) -> None:
+        """
+        Writes the shard to a .gra file with the metadata in its header comments, or to a binary
+        pickle file for any other suffix.
+        """
+        if str(path).endswith(".gra"):
+            GraphWriter(self.graph, str(path), comments=self.comments()).write()
+        else:
+            with open(path, "wb") as file:
+                pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def read(cls, path: str, init_neighbors: bool = False) -> "Shard":
+        """
+        Reads a shard written by write().
+        """
+        if not str(path).endswith(".gra"):
+            with open(path, "rb") as file:
+                shard = pickle.load(file)
+            if init_neighbors:
+                shard.graph.init_neighbors()
+            return shard
+        part, part_count, halo, boundary = None, None, {}, {}
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip() and not line.startswith("#"):
+                    break
+                fields = line[1:].split()
+                if fields[:1] == ["shard"]:
+                    part, part_count = int(fields[1]), int(fields[2])
+                elif fields[:1] == ["halo"]:
+                    halo[fields[1]] = int(fields[2])
+                elif fields[:1] == ["boundary"]:
+                    boundary[fields[1]] = [int(field) for field in fields[2:]]
+        if part is None:
+            raise ValueError(f"Shard: read(path), {path} has no shard metadata!")
+        graph = GraphReader(str(path), init_neighbors=init_neighbors).read()
+        return cls(graph, part, part_count, halo, boundary)
+
+    def __str__(self) -> str:
+        """
+        Returns relevant information about the shard.
+        """
+        return (
+            f"Object type: Shard, part: {self.part} of {self.part_count}, "
+            f"nodes: {self.graph.node_count - len(self.halo)}, halo: {len(self.halo)}, "
+            f"boundary: {len(self.boundary)}, edges: {self.graph.edge_count}"
+        )
+
+
+class Partition:
+    """
+    Class for an assignment of the nodes of a graph or view to part_count parts. parts is an
+    array indexed by Node.index holding the part of every node, or -1 for nodes outside the
+    view. Edges count in both directions, so a directed edge is cut like an undirected one.
+    """
+    def __init__(self, graph: Graph, part_count: int, parts: array) -> None:
+        self.graph = graph
+        self.part_count = part_count
+        self.parts = parts
+        self.nodes = [node for node in graph.nodes if graph.contains_node(node)]
+        self.edges = graph.original_edges()
+
+    def part_of(self, node: Node) -> int:
+        """
+        Returns the part of a node.
+        """
+        return self.parts[node.index]
+
+    def sizes(self) -> list[int]:
+        """
+        Returns the number of nodes of every part.
+        """
+        sizes = [0] * self.part_count
+        for node in self.nodes:
+            sizes[self.parts[node.index]] += 1
+        return sizes
+
+    def part_nodes(self, part: int) -> list[Node]:
+        """
+        Returns the nodes of a part.
+        """
+        return [node for node in self.nodes if self.parts[node.index] == part]
+
+    def cut_edges(self) -> list[Edge]:
+        """
+        Returns the edges whose nodes lie in different parts.
+        """
+        parts = self.parts
+        return [edge for edge in self.edges if parts[edge.head.index] != parts[edge.tail.index]]
+
+    def boundary_nodes(self, part: int = None) -> list[Node]:
+        """
+        Returns the nodes with an edge to another part, only those of one part if given.
+        """
+        boundary = set()
+        for edge in self.cut_edges():
+            boundary.add(edge.head)
+            boundary.add(edge.tail)
+        return [
+            node for node in self.nodes
+            if node in boundary and (part is None or self.parts[node.index] == part)
+        ]
+
+    def shard(self, part: int) -> Shard:
+        """
+        Returns the shard of a part with new Node and Edge objects and consecutive indices.
+        """
+        parts = self.parts
+        edges = [
+            edge for edge in self.edges
+            if parts[edge.head.index] == part or parts[edge.tail.index] == part
+        ]
+        halo = {}
+        boundary = {}
+        for edge in edges:
+            for node, other in ((edge.head, edge.tail), (edge.tail, edge.head)):
+                if parts[node.index] != part:
+                    halo[node.name] = parts[node.index]
+                elif parts[other.index] != part:
+                    boundary.setdefault(node.name, set()).add(parts[other.index])
+        nodes = self.part_nodes(part)
+        halo_nodes = [node for node in self.nodes if node.name in halo]
+        copies = {}
+        for node in nodes + halo_nodes:
+            copies[node.index] = Node(
+                node.name, node.x_coord, node.y_coord, len(copies), node.weight
+            )
+        graph = Graph(
+            name=f"{self.graph.name or 'graph'}-{part}",
+            directed=self.graph.directed,
+            nodes=list(copies.values()),
+            edges=[
+                Edge(edge.name, copies[edge.head.index], copies[edge.tail.index], i, edge.weight)
+                for i, edge in enumerate(edges)
+            ]
+        )
+        return Shard(
+            graph, part, self.part_count, dict(sorted(halo.items(), key=lambda item: item[1])),
+            {name: sorted(parts) for name, parts in boundary.items()}
+        )
+
+    def write(self, directory: str, binary: bool = False) -> list[Path]:
+        """
+        Writes every part as a shard into a directory, as .gra files or binary .shard files, and
+        returns their paths.
+        """
+        paths = []
+        for part in range(self.part_count):
+            shard = self.shard(part)
+            path = Path(directory) / f"{shard.graph.name}.{'shard' if binary else 'gra'}"
+            shard.write(str(path))
+            paths.append(path)
+        return paths
+
+    def __str__(self) -> str:
+        """
+        Returns relevant information about the partition.
+        """
+        return (
+            f"Object type: Partition, parts: {self.part_count}, sizes: {self.sizes()}, "
+            f"cut edges: {len(self.cut_edges())}"
+        )
+
+
+def adjacency(graph: Graph) -> list[list[int]]:
+    """
+    Returns the neighbor indices of every node index, ignoring edge directions. Parallel edges
+    give repeated neighbors and self-loops are left out.
+    """
+    neighbors = [[] for _ in range(graph.node_slots)]
+    for edge in graph.original_edges():
+        head, tail = edge.head.index, edge.tail.index
+        if head != tail:
+            neighbors[head].append(tail)
+            neighbors[tail].append(head)
+    return neighbors
+
+
+def bfs_distances(neighbors: list[list[int]], source: int) -> list[float]:
+    """
+    Returns the number of edges from source to every node index, inf if unreachable.
+    """
+    dist = [inf] * len(neighbors)
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for other in neighbors[node]:
+            if dist[other] == inf:
+                dist[other] = dist[node] + 1
+                queue.append(other)
+    return dist
+
+
+def spread_seeds(nodes: list[Node], neighbors: list[list[int]], count: int) -> list[int]:
+    """
+    Returns count node indices spread over the graph by farthest point sampling: every seed is
+    the node farthest from the seeds before it. Distances are euclidean if all nodes have
+    coordinates, and numbers of edges otherwise, where unreachable nodes are the farthest.
+    """
+    coords = all(node.x_coord is not None and node.y_coord is not None for node in nodes)
+    if coords:
+        seed = min(nodes, key=lambda node: (node.x_coord, node.y_coord))
+    else:
+        seed = nodes[0]
+    seeds = [seed.index]
+    nearest = [inf] * len(nodes)
+    while len(seeds) < count:
+        if coords:
+            distances = (
+                hypot(node.x_coord - seed.x_coord, node.y_coord - seed.y_coord) for node in nodes
+            )
+        else:
+            dist = bfs_distances(neighbors, seed.index)
+            distances = (dist[node.index] for node in nodes)
+        for i, distance in enumerate(distances):
+            if distance < nearest[i]:
+                nearest[i] = distance
+        seed = nodes[max(range(len(nodes)), key=nearest.__getitem__)]
+        seeds.append(seed.index)
+    return seeds
+
+
+def grow_regions(
+        nodes: list[Node],
+        neighbors: list[list[int]],
+        seeds: list[int],
+        capacity: int
+) -> array:
+    """
+    Grows a region from every seed by breadth-first search, always extending the smallest region
+    that can still grow, until the regions hold capacity nodes. Nodes not reached, e.g. in other
+    components, start new searches of the smallest region. Returns the parts by node index.
+    """
+    parts = array("q", [-1]) * len(neighbors)
+    sizes = [0] * len(seeds)
+    queues = [deque([seed]) for seed in seeds]
+    heap = [(0, part) for part in range(len(seeds))]
+    unassigned = iter(nodes)
+    while True:
+        while heap:
+            size, part = heappop(heap)
+            queue = queues[part]
+            while queue and parts[queue[0]] != -1:
+                queue.popleft()
+            if not queue or size >= capacity:
+                continue
+            node = queue.popleft()
+            parts[node] = part
+            sizes[part] += 1
+            queue.extend(other for other in neighbors[node] if parts[other] == -1)
+            heappush(heap, (sizes[part], part))
+        node = next((node for node in unassigned if parts[node.index] == -1), None)
+        if node is None:
+            return parts
+        part = min(range(len(seeds)), key=sizes.__getitem__)
+        queues[part] = deque([node.index])
+        heap = [(sizes[part], part)]
+
+
+def best_move(neighbors: list[list[int]], parts: array, node: int) -> tuple[int, int]:
+    """
+    Returns the gain in cut edges and the target of the best move of a node to the part of one
+    of its neighbors, or (None, None) if all neighbors are in its own part.
+    """
+    counts = {}
+    for other in neighbors[node]:
+        counts[parts[other]] = counts.get(parts[other], 0) + 1
+    own = counts.pop(parts[node], 0)
+    if not counts:
+        return None, None
+    target = max(counts, key=lambda part: (counts[part], -part))
+    return counts[target] - own, target
+
+
+def refine(
+        nodes: list[Node],
+        neighbors: list[list[int]],
+        parts: array,
+        bounds: tuple[int, int],
+        passes: int
+) -> None:
+    """
+    Improves the parts by Fiduccia-Mattheyses passes. A pass moves boundary nodes one at a time,
+    best gain first and even if the gain is negative, locks every moved node and finally rolls
+    back the moves after the smallest cut seen. Moves must keep the part sizes within bounds.
+    """
+    min_size, max_size = bounds
+    sizes = {}
+    for node in nodes:
+        sizes[parts[node.index]] = sizes.get(parts[node.index], 0) + 1
+    # a pass gives up after this many moves without a new smallest cut
+    patience = max(50, len(nodes) // 20)
+    for _ in range(passes):
+        locked = bytearray(len(neighbors))
+        heap = []
+        for node in nodes:
+            gain, target = best_move(neighbors, parts, node.index)
+            if target is not None:
+                heappush(heap, (-gain, node.index, target))
+        moves = []
+        gain_sum = best_sum = 0
+        best_length = 0
+        while heap and len(moves) - best_length <= patience:
+            gain, node, target = heappop(heap)
+            if locked[node]:
+                continue
+            current = best_move(neighbors, parts, node)
+            if current != (-gain, target):
+                if current[1] is not None:
+                    heappush(heap, (-current[0], node, current[1]))
+                continue
+            source = parts[node]
+            if sizes.get(target, 0) >= max_size or sizes[source] <= min_size:
+                continue
+            parts[node] = target
+            sizes[source] -= 1
+            sizes[target] = sizes.get(target, 0) + 1
+            locked[node] = 1
+            moves.append((node, source, target))
+            gain_sum -= gain
+            if gain_sum > best_sum:
+                best_sum, best_length = gain_sum, len(moves)
+            for other in neighbors[node]:
+                if not locked[other]:
+                    other_gain, other_target = best_move(neighbors, parts, other)
+                    if other_target is not None:
+                        heappush(heap, (-other_gain, other, other_target))
+        for node, source, target in reversed(moves[best_length:]):
+            parts[node] = source
+            sizes[target] -= 1
+            sizes[source] += 1
+        if best_sum == 0:
+            break
+
+
+def partition_graph(
+        graph: Graph,
+        part_count: int,
+        imbalance: float = 0.03,
+        passes: int = 8
+) -> Partition:
+    """
+    Splits the nodes of a graph or view into part_count parts of balanced size with few cut
+    edges. The regions are grown from seeds spread over the coordinates of the nodes, or over
+    the graph if nodes lack coordinates, and refined by up to passes Fiduccia-Mattheyses passes.
+    Part sizes may deviate from n / part_count by imbalance times that size, but at least by one
+    node, which single moves need.
+    """
+    nodes = [node for node in graph.nodes if graph.contains_node(node)]
+    if not 1 <= part_count <= len(nodes):
+        raise ValueError(
+            f"partition_graph(): part_count {part_count} must be between 1 and {len(nodes)}!"
+        )
+    neighbors = adjacency(graph)
+    seeds = spread_seeds(nodes, neighbors, part_count)
+    parts = grow_regions(nodes, neighbors, seeds, ceil(len(nodes) / part_count))
+    average = len(nodes) / part_count
+    slack = max(imbalance * average, 1)
+    bounds = (max(floor(average - slack), 1), ceil(average + slack))
+    if part_count > 1:
+        refine(nodes, neighbors, parts, bounds, passes)
+    return Partition(graph, part_count, parts)
@@ -0,0 +1,206 @@
+"""
+This module contains the GraphRegistry, a thread-safe cache of graphs loaded from .gra files.
+Graphs are loaded on first use, kept within a memory budget by evicting the least recently used
+ones and reloaded when their file changes.
+"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .core import Graph, GraphReader
+from .stats import GraphStats
+
+# approximate memory footprint of the Python objects, measured on zufall10000.gra
+NODE_BYTES = 1000
+EDGE_BYTES = 300
+LINK_BYTES = 150
+
+
+class GraphRegistry:
+    """
+    Class for caching graphs by the resolved path of their file. A cached graph is returned as
+    long as the modification time and size of its file are unchanged. If the estimated memory of
+    all cached graphs exceeds max_bytes, the least recently used graphs are evicted. Concurrent
+    threads asking for the same file wait for a single load. The functions in remove_callbacks are
+    called with the key and the graph whenever a graph leaves the cache, so data derived from it
+    can be dropped as well.
+    """
+    def __init__(
+            self,
+            max_bytes: int = 1 << 30,
+            init_neighbors: bool = True,
+            stats: GraphStats = None
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.init_neighbors = init_neighbors
+        self.stats = stats
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.load_locks = {}
+        self.remove_callbacks = []
+        # removed entries whose callbacks are still due, called after the lock is released
+        self.removed = []
+
+    @staticmethod
+    def key(path: str) -> str:
+        """
+        Returns the key of a file, which is its resolved path.
+        """
+        return str(Path(path).resolve())
+
+    @staticmethod
+    def signature(key: str) -> tuple[int, int]:
+        """
+        Returns the modification time in nanoseconds and the size of a file.
+        """
+        stat = Path(key).stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def estimate_bytes(self, graph: Graph) -> int:
+        """
+        Returns the estimated memory of a graph based on its node and edge counts.
+        """
+        edge_bytes = EDGE_BYTES + LINK_BYTES if self.init_neighbors else EDGE_BYTES
+        return graph.node_count * NODE_BYTES + len(graph.edges) * edge_bytes
+
+    def lookup(self, key: str, signature: tuple[int, int]) -> Graph:
+        """
+        Returns the cached graph of a key if its signature matches and marks it as recently used.
+        Must be called with the lock held.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[1] != signature:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def get(self, path: str) -> Graph:
+        """
+        Returns the graph of a file, loading it if it is not cached or its file has changed.
+        """
+        key = self.key(path)
+        signature = self.signature(key)
+        with self.lock:
+            graph = self.lookup(key, signature)
+            if graph is not None:
+                self.count("registry_hits")
+                return graph
+            # the lock of a load and the number of threads holding or waiting for it
+            load = self.load_locks.setdefault(key, [threading.Lock(), 0])
+            load[1] += 1
+        try:
+            with load[0]:
+                # another thread may have loaded the graph while waiting for the lock
+                with self.lock:
+                    graph = self.lookup(key, signature)
+                if graph is not None:
+                    self.count("registry_hits")
+                    return graph
+                self.count("registry_misses")
+                graph = GraphReader(
+                    key, init_neighbors=self.init_neighbors, stats=self.stats
+                ).read()
+                with self.lock:
+                    self.remove(key)
+                    size = self.estimate_bytes(graph)
+                    self.entries[key] = (graph, signature, size)
+                    self.total_bytes += size
+                    self.evict(keep=key)
+        finally:
+            with self.lock:
+                load[1] -= 1
+                if load[1] == 0:
+                    del self.load_locks[key]
+            self.notify()
+        return graph
+
+    def remove(self, key: str) -> bool:
+        """
+        Removes a graph from the cache. Must be called with the lock held.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_bytes -= entry[2]
+        self.removed.append((key, entry[0]))
+        return True
+
+    def evict(self, keep: str = None) -> None:
+        """
+        Evicts the least recently used graphs until the memory budget is met. The graph of the key
+        keep is never evicted. Must be called with the lock held.
+        """
+        for key in list(self.entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key != keep:
+                self.remove(key)
+                self.count("registry_evictions")
+
+    def discard(self, path: str) -> bool:
+        """
+        Removes the graph of a file from the cache. Returns True if it was cached.
+        """
+        with self.lock:
+            removed = self.remove(self.key(path))
+        self.notify()
+        return removed
+
+    def clear(self) -> None:
+        """
+        Removes all graphs from the cache.
+        """
+        with self.lock:
+            for key in list(self.entries):
+                self.remove(key)
+        self.notify()
+
+    def notify(self) -> None:
+        """
+        Calls the remove callbacks for the graphs removed so far. Must be called without the lock
+        held, so the callbacks may use the registry.
+        """
+        with self.lock:
+            removed, self.removed = self.removed, []
+        for key, graph in removed:
+            for callback in self.remove_callbacks:
+                callback(key, graph)
+
+    def holds(self, path: str, graph: Graph) -> bool:
+        """
+        Returns True if graph is the cached graph of a file.
+        """
+        with self.lock:
+            entry = self.entries.get(self.key(path))
+            return entry is not None and entry[0] is graph
+
+    def count(self, name: str) -> None:
+        """
+        Counts a registry event in the stats object, if any.
+        """
+        if self.stats is not None:
+            self.stats.count(name)
+
+    def __contains__(self, path: str) -> bool:
+        with self.lock:
+            return self.key(path) in self.entries
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+
+DEFAULT_REGISTRY = None
+DEFAULT_REGISTRY_LOCK = threading.Lock()
+
+
+def default_registry() -> GraphRegistry:
+    """
+    Returns the process-wide registry, creating it on first use.
+    """
+    global DEFAULT_REGISTRY  # pylint: disable=global-statement
+    with DEFAULT_REGISTRY_LOCK:
+        if DEFAULT_REGISTRY is None:
+            DEFAULT_REGISTRY = GraphRegistry()
+        return DEFAULT_REGISTRY
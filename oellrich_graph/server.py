@@ -0,0 +1,489 @@
+"""
+This module contains a daemon keeping graphs loaded between scripts and the client to query it.
+The daemon listens on a Unix domain socket and holds the graphs in a GraphRegistry keyed by the
+path of their file. Messages are framed as a 4 byte big-endian length followed by that many
+bytes of UTF-8 JSON. A request frame holds a list of queries, which the daemon answers in one
+response frame after running them on a worker pool, so a slow batch of one client does not hold
+up the others. The daemon is started with "python -m oellrich_graph.server SOCKET_PATH".
+"""
+import argparse
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from math import inf
+from typing import Iterator
+
+from .core import Graph, Node
+from .registry import GraphRegistry
+from .shortest_paths import ForwardStar, dijkstra
+from .stats import GraphStats
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_BYTES = 1 << 28
+
+
+def send_frame(sock: socket.socket, message) -> None:
+    """
+    Sends a message as a frame of its length and its JSON encoding.
+    """
+    data = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def receive_exactly(sock: socket.socket, size: int) -> bytes:
+    """
+    Receives exactly size bytes, or fewer if the connection is closed.
+    """
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def receive_frame(sock: socket.socket):
+    """
+    Receives a frame and returns its decoded message, or None if the connection was closed
+    before the frame.
+    """
+    header = receive_exactly(sock, HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ConnectionError("Connection closed within a frame header")
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds the limit of {MAX_FRAME_BYTES} bytes")
+    data = receive_exactly(sock, size)
+    if len(data) < size:
+        raise ConnectionError("Connection closed within a frame")
+    return json.loads(data)
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Removes the socket file of a daemon that is no longer running. Raises a FileExistsError if
+    the path is not a socket or another daemon still answers on it.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"GraphDaemon: start(), {path} exists and is not a socket!")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise FileExistsError(f"GraphDaemon: start(), another daemon is listening on {path}!")
+
+
+def socket_identity(path: str) -> tuple[int, int]:
+    """
+    Returns the device and inode of a file, or None if it does not exist.
+    """
+    try:
+        status = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return status.st_dev, status.st_ino
+
+
+def node_info(node: Node) -> dict:
+    """
+    Returns the attributes of a node as a JSON object.
+    """
+    return {
+        "name": node.name,
+        "index": node.index,
+        "x_coord": node.x_coord,
+        "y_coord": node.y_coord,
+        "weight": node.weight,
+    }
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    """
+    Handler of a client connection, which may send any number of request frames.
+    """
+    def handle(self) -> None:
+        while True:
+            try:
+                message = receive_frame(self.request)
+            except (ConnectionError, ValueError):
+                return
+            if message is None:
+                return
+            future = self.server.pool.submit(self.server.daemon.run_batch, message)
+            try:
+                send_frame(self.request, future.result())
+            except OSError:
+                return
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix domain socket server with a thread per connection.
+    """
+    daemon_threads = True
+
+
+class ResidentGraph:
+    """
+    Class for the data the daemon derives from a resident graph: its nodes by name and the
+    forward stars of shortest path queries, built on first use.
+    """
+    def __init__(self, graph: Graph) -> None:
+        self.graph = graph
+        self.names = {}
+        for node in graph.nodes:
+            # the first node of a name wins, like in Graph.node_by_name()
+            if node is not None:
+                self.names.setdefault(node.name, node)
+        self.stars = {}
+
+    def node(self, name: str) -> Node:
+        """
+        Returns the node with the given name.
+        """
+        node = self.names.get(name)
+        if node is None:
+            raise ValueError(f"GraphDaemon: Node {name} not found!")
+        return node
+
+    def star(self, weighted: bool) -> ForwardStar:
+        """
+        Returns the forward star of the graph, weighted or not.
+        """
+        star = self.stars.get(weighted)
+        if star is None:
+            star = self.stars.setdefault(weighted, ForwardStar(self.graph, weighted))
+        return star
+
+
+class GraphDaemon:
+    """
+    Class for the daemon answering graph queries on a Unix domain socket. Graphs are loaded by
+    the registry on first use and stay resident within its memory budget. The nodes by name and
+    the forward stars of shortest path queries are cached per resident graph and dropped when
+    the registry evicts or reloads the graph. Batches run on a pool of worker threads.
+    """
+    def __init__(
+            self,
+            socket_path: str,
+            registry: GraphRegistry = None,
+            workers: int = 4,
+            stats: GraphStats = None
+    ) -> None:
+        self.socket_path = socket_path
+        self.registry = registry if registry is not None else GraphRegistry(stats=stats)
+        self.registry.remove_callbacks.append(self.forget)
+        self.workers = workers
+        self.stats = stats
+        self.residents = {}
+        self.residents_lock = threading.Lock()
+        self.operations = {
+            "load": self.load,
+            "node": self.node,
+            "neighbors": self.neighbors,
+            "shortest_path": self.shortest_path,
+        }
+        self.server = None
+        self.thread = None
+        self.socket_identity = None
+
+    def resident(self, query: dict) -> ResidentGraph:
+        """
+        Returns the cached data of the graph of the path of a query.
+        """
+        path = query["path"]
+        graph = self.registry.get(path)
+        key = self.registry.key(path)
+        with self.residents_lock:
+            resident = self.residents.get(key)
+        if resident is None or resident.graph is not graph:
+            resident = ResidentGraph(graph)
+            with self.residents_lock:
+                # a graph evicted meanwhile is used for this query but not cached
+                if self.registry.holds(path, graph):
+                    self.residents[key] = resident
+        return resident
+
+    def forget(self, key: str, graph: Graph) -> None:
+        """
+        Drops the cached data of a graph that left the registry.
+        """
+        with self.residents_lock:
+            resident = self.residents.get(key)
+            if resident is not None and resident.graph is graph:
+                del self.residents[key]
+
+    def load(self, query: dict) -> dict:
+        """
+        Loads a graph and returns its node and edge counts.
+        """
+        graph = self.resident(query).graph
+        return {"node_count": graph.node_count, "edge_count": graph.edge_count}
+
+    def node(self, query: dict) -> dict:
+        """
+        Returns the attributes of the node with the name of a query.
+        """
+        return node_info(self.resident(query).node(query["name"]))
+
+    def neighbors(self, query: dict) -> list[str]:
+        """
+        Returns the names of the forward neighbors of a node, or the backward ones for the
+        direction "in", ordered by index.
+        """
+        node = self.resident(query).node(query["name"])
+        direction = query.get("direction", "out")
+        if direction not in ("out", "in"):
+            raise ValueError(f"GraphDaemon: neighbors(), direction {direction} not supported!")
+        neighbors = node.f_neighbors if direction == "out" else node.b_neighbors
+        return [neighbor.name for neighbor in sorted(neighbors, key=lambda node: node.index)]
+
+    def shortest_path(self, query: dict) -> dict:
+        """
+        Returns the length and the edge and node names of a shortest path, with length None and
+        empty lists if the target cannot be reached.
+        """
+        resident = self.resident(query)
+        star = resident.star(query.get("weighted", True))
+        source = resident.node(query["source"])
+        target = resident.node(query["target"])
+        dist, pred = dijkstra(star, source.index, target.index, self.stats)
+        path = star.path(pred, target.index)
+        if dist[target.index] == inf:
+            return {"length": None, "edges": [], "nodes": []}
+        return {
+            "length": dist[target.index],
+            "edges": [edge.name for edge in path],
+            "nodes": [source.name] + [edge.tail.name for edge in path],
+        }
+
+    def run_query(self, query: dict) -> dict:
+        """
+        Runs a single query and returns its result or the error it raised. Any error, also from
+        reading a malformed file, fails only this query and not the rest of its batch.
+        """
+        try:
+            if not isinstance(query, dict):
+                raise ValueError(f"GraphDaemon: query {query} is not an object!")
+            operation = self.operations.get(query.get("op"))
+            if operation is None:
+                raise ValueError(f"GraphDaemon: operation {query.get('op')} not supported!")
+            return {"ok": True, "result": operation(query)}
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    def run_batch(self, message: dict) -> dict:
+        """
+        Runs the queries of a request frame and returns the response frame. A frame that is not
+        an object with a list of queries is answered with a single failed result.
+        """
+        queries = message.get("queries", ()) if isinstance(message, dict) else None
+        if not isinstance(queries, list):
+            error = f"ValueError: GraphDaemon: request {message} has no list of queries!"
+            return {"results": [{"ok": False, "error": error}]}
+        if self.stats is not None:
+            self.stats.count("batches")
+            self.stats.count("queries", len(queries))
+        return {"results": [self.run_query(query) for query in queries]}
+
+    def start(self) -> None:
+        """
+        Starts serving in a background thread. The socket file of a daemon that is no longer
+        running is replaced, any other file at the socket path raises a FileExistsError.
+        """
+        remove_stale_socket(self.socket_path)
+        self.server = UnixServer(self.socket_path, RequestHandler)
+        self.socket_identity = socket_identity(self.socket_path)
+        self.server.pool = ThreadPoolExecutor(self.workers)
+        self.server.daemon = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def serve_forever(self) -> None:
+        """
+        Starts serving and blocks until stop() is called or the process is interrupted.
+        """
+        self.start()
+        try:
+            self.thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Stops serving and removes the socket file, unless it was replaced by another one.
+        """
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.pool.shutdown()
+        self.server = None
+        if socket_identity(self.socket_path) == self.socket_identity:
+            os.unlink(self.socket_path)
+        self.socket_identity = None
+
+    def __enter__(self) -> "GraphDaemon":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class GraphClient:
+    """
+    Class for a client of the graph daemon. Connections are kept in a pool of at most pool_size
+    idle connections and reused by later calls, also from several threads. batch() sends many
+    queries in one frame, the other methods a single query each.
+    """
+    def __init__(self, socket_path: str, pool_size: int = 4, timeout: float = None) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.idle = queue.LifoQueue(pool_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[socket.socket]:
+        """
+        Lends a pooled connection, opening a new one if none is idle. A connection that failed
+        is closed instead of being returned to the pool.
+        """
+        try:
+            sock = self.idle.get_nowait()
+        except queue.Empty:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        try:
+            yield sock
+        except BaseException:
+            sock.close()
+            raise
+        try:
+            self.idle.put_nowait(sock)
+        except queue.Full:
+            sock.close()
+
+    def batch(self, queries: list[dict]) -> list:
+        """
+        Sends queries as dicts with the key "op" and the arguments of the operation and returns
+        their results. A failed query gives a ValueError in place of its result, so it does not
+        discard the results of the others.
+        """
+        with self.connection() as sock:
+            send_frame(sock, {"queries": queries})
+            response = receive_frame(sock)
+            # raised within the block, so the closed connection is not returned to the pool
+            if response is None:
+                raise ConnectionError("GraphClient: the daemon closed the connection!")
+        return [
+            result["result"] if result["ok"] else ValueError(result["error"])
+            for result in response["results"]
+        ]
+
+    def query(self, query: dict):
+        """
+        Sends a single query and returns its result. Raises a ValueError if it failed.
+        """
+        result = self.batch([query])[0]
+        if isinstance(result, ValueError):
+            raise result
+        return result
+
+    def load(self, path: str) -> dict:
+        """
+        Makes the daemon load a graph and returns its node and edge counts.
+        """
+        return self.query({"op": "load", "path": path})
+
+    def node(self, path: str, name: str) -> dict:
+        """
+        Returns the attributes of a node looked up by name.
+        """
+        return self.query({"op": "node", "path": path, "name": name})
+
+    def neighbors(self, path: str, name: str, direction: str = "out") -> list[str]:
+        """
+        Returns the names of the forward ("out") or backward ("in") neighbors of a node.
+        """
+        return self.query({"op": "neighbors", "path": path, "name": name, "direction": direction})
+
+    def shortest_path(
+            self,
+            path: str,
+            source: str,
+            target: str,
+            weighted: bool = True
+    ) -> dict:
+        """
+        Returns the length and the edge and node names of a shortest path between two nodes
+        given by name.
+        """
+        return self.query({
+            "op": "shortest_path", "path": path, "source": source, "target": target,
+            "weighted": weighted
+        })
+
+    def close(self) -> None:
+        """
+        Closes all idle connections.
+        """
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> "GraphClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def interrupt(*_) -> None:
+    """
+    Signal handler stopping the daemon on SIGTERM like on Ctrl+C, which removes the socket file.
+    """
+    raise KeyboardInterrupt
+
+
+def main() -> None:
+    """
+    Runs the daemon from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Daemon keeping oellrich_graph graphs loaded")
+    parser.add_argument("socket_path", help="path of the Unix domain socket")
+    parser.add_argument("--workers", type=int, default=4, help="number of worker threads")
+    parser.add_argument(
+        "--max-bytes", type=int, default=1 << 30, help="memory budget of the loaded graphs"
+    )
+    args = parser.parse_args()
+    signal.signal(signal.SIGTERM, interrupt)
+    GraphDaemon(
+        args.socket_path, GraphRegistry(max_bytes=args.max_bytes), workers=args.workers
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
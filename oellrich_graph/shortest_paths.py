@@ -0,0 +1,388 @@
+"""
+This module contains the forward star representation of a graph and Dijkstra's algorithm on it.
+The forward star stores the edges leaving each node in flat arrays indexed by Node.index, which
+is what the algorithms of this package work on. It is built through the adjacency methods of
+Graph and GraphView, so all algorithms accept both. ShortestPathTree keeps the result of a
+single-source search up to date while edge weights change.
+"""
+from array import array
+from heapq import heappop, heappush
+from math import inf
+from typing import Iterator
+
+from .core import Graph, Node, Edge
+from .stats import phase
+
+
+class ForwardStar:
+    """
+    Class for the forward star of a graph: the arcs leaving node i are the positions
+    offsets[i] to offsets[i + 1] of the arrays targets, weights and edges. With reverse=True, the
+    arcs follow the backward edges instead, so a search runs against the edge directions. Missing
+    weights and all weights of an unweighted star are 1. The neighbors of the graph must be
+    initialized with init_neighbors().
+    """
+    def __init__(self, graph: Graph, weighted: bool = True, reverse: bool = False):
+        self.graph = graph
+        self.weighted = weighted
+        self.reverse = reverse
+        self.node_slots = graph.node_slots
+        self.nodes = [None] * self.node_slots
+        offsets = array("q", bytes(8 * (self.node_slots + 1)))
+        targets = array("q")
+        weights = array("d")
+        edges = []
+        adjacent = graph.b_edges if reverse else graph.f_edges
+        for node in graph.nodes:
+            if graph.contains_node(node):
+                self.nodes[node.index] = node
+        for i, node in enumerate(self.nodes):
+            if node is not None:
+                for edge in sorted(adjacent(node), key=edge_order):
+                    targets.append((edge.head if reverse else edge.tail).index)
+                    weights.append(
+                        1.0 if not weighted or edge.weight is None else float(edge.weight)
+                    )
+                    edges.append(edge)
+            offsets[i + 1] = len(targets)
+        if not edges and graph.edges:
+            raise ValueError("ForwardStar: the graph has edges but no neighbors, "
+                             "call init_neighbors() first!")
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edges = edges
+
+    def arrays(self) -> tuple[array, array, array]:
+        """
+        Returns the arrays offsets, targets and weights, which is all a search needs. They are
+        cheap to pickle for worker processes.
+        """
+        return self.offsets, self.targets, self.weights
+
+    def path(self, pred: array, target: int) -> list[Edge]:
+        """
+        Returns the edges of the path to target encoded in an array of predecessor arcs. Arcs of
+        a reverse star lead back to the source, so their path is returned from target onwards.
+        """
+        path = []
+        arc = pred[target]
+        while arc >= 0:
+            path.append(self.edges[arc])
+            node = self.edges[arc].tail if self.reverse else self.edges[arc].head
+            arc = pred[node.index]
+        if not self.reverse:
+            path.reverse()
+        return path
+
+
+def edge_order(edge: Edge) -> tuple:
+    """
+    Sort key giving the arcs of a node a reproducible order.
+    """
+    return (edge.index if edge.index is not None else -1, edge.name or "")
+
+
+def dijkstra(
+        star: ForwardStar,
+        source: int,
+        target: int = None,
+        stats=None,
+        blocked_nodes: bytearray = None,
+        blocked_arcs: bytearray = None
+) -> tuple[array, array]:
+    """
+    Runs Dijkstra's algorithm from the node index source on a forward star and returns the arrays
+    dist and pred indexed by Node.index. pred holds the arc leading to a node or -1. The search
+    stops once target is settled, if given. Heap operations are counted in stats, if given. Nodes
+    and arcs with a true entry in blocked_nodes or blocked_arcs are not used.
+    """
+    offsets, targets, weights = star.offsets, star.targets, star.weights
+    dist = array("d", [inf]) * star.node_slots
+    pred = array("q", [-1]) * star.node_slots
+    # blocked nodes count as settled, so they are never reached
+    done = bytearray(star.node_slots) if blocked_nodes is None else bytearray(blocked_nodes)
+    done[source] = 0
+    blocked_arcs = bytes(len(targets)) if blocked_arcs is None else blocked_arcs
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    pushes = 1
+    pops = 0
+    while heap:
+        distance, node = heappop(heap)
+        pops += 1
+        if done[node]:
+            continue
+        done[node] = 1
+        if node == target:
+            break
+        for arc in range(offsets[node], offsets[node + 1]):
+            other = targets[arc]
+            candidate = distance + weights[arc]
+            if candidate < dist[other] and not done[other] and not blocked_arcs[arc]:
+                dist[other] = candidate
+                pred[other] = arc
+                heappush(heap, (candidate, other))
+                pushes += 1
+    if stats is not None:
+        stats.count("heap_pushes", pushes)
+        stats.count("heap_pops", pops)
+    return dist, pred
+
+
+def shortest_path(
+        graph: Graph,
+        source: Node,
+        target: Node,
+        weighted: bool = True
+) -> tuple[float, list[Edge]]:
+    """
+    Returns the length and the edges of a shortest path from source to target, or inf and an
+    empty list if target cannot be reached.
+    """
+    star = ForwardStar(graph, weighted)
+    dist, pred = dijkstra(star, source.index, target.index, graph.stats)
+    return dist[target.index], star.path(pred, target.index)
+
+
+def arc_path(star: ForwardStar, pred: array, target: int) -> list[int]:
+    """
+    Returns the arcs of the path to target encoded in an array of predecessor arcs.
+    """
+    arcs = []
+    arc = pred[target]
+    while arc >= 0:
+        arcs.append(arc)
+        arc = pred[star.edges[arc].head.index]
+    arcs.reverse()
+    return arcs
+
+
+def k_shortest_paths(
+        graph: Graph,
+        source: Node,
+        target: Node,
+        weighted: bool = True,
+        stats=None
+) -> Iterator[tuple[float, list[Edge]]]:
+    """
+    Yields the loopless paths from source to target in order of increasing length as pairs of
+    length and edges, following Yen's algorithm. Every spur search runs Dijkstra from a node of
+    the last path to target, with the nodes of the root path before it and the next arcs of the
+    earlier paths sharing the root blocked in flat masks, so the graph is never copied. The
+    length of a root path is read from the prefix sums of its path, and spur searches start at
+    the node where a path deviated from the path it was found from (Lawler's improvement).
+    Paths are computed only when the next one is requested.
+    """
+    star = ForwardStar(graph, weighted)
+    stats = stats if stats is not None else graph.stats
+    weights = star.weights
+    if source is target:
+        yield 0.0, []
+        return
+    dist, pred = dijkstra(star, source.index, target.index, stats)
+    if dist[target.index] == inf:
+        return
+    blocked_nodes = bytearray(star.node_slots)
+    blocked_arcs = bytearray(len(star.targets))
+    # candidates as (length, counter, arcs, deviation) and the next arcs taken after each root
+    candidates = [(dist[target.index], 0, arc_path(star, pred, target.index), 0)]
+    seen = {tuple(candidates[0][2])}
+    branches = {}
+    counter = 1
+    while candidates:
+        length, _, arcs, deviation = heappop(candidates)
+        yield length, [star.edges[arc] for arc in arcs]
+        nodes = [source.index] + [star.targets[arc] for arc in arcs]
+        prefix = [0.0]
+        for i, arc in enumerate(arcs):
+            prefix.append(prefix[i] + weights[arc])
+            branches.setdefault(tuple(arcs[:i]), set()).add(arc)
+        for i in range(deviation, len(arcs)):
+            spur = nodes[i]
+            for arc in branches[tuple(arcs[:i])]:
+                blocked_arcs[arc] = 1
+            for node in nodes[:i]:
+                blocked_nodes[node] = 1
+            dist, pred = dijkstra(star, spur, target.index, stats, blocked_nodes, blocked_arcs)
+            for arc in branches[tuple(arcs[:i])]:
+                blocked_arcs[arc] = 0
+            for node in nodes[:i]:
+                blocked_nodes[node] = 0
+            if dist[target.index] == inf:
+                continue
+            path = arcs[:i] + arc_path(star, pred, target.index)
+            if tuple(path) not in seen:
+                seen.add(tuple(path))
+                heappush(candidates, (prefix[i] + dist[target.index], counter, path, i))
+                counter += 1
+
+
+class ShortestPathTree:
+    """
+    Class for the shortest path tree of a source node that is repaired after edge weight changes
+    instead of being recomputed. update() follows Ramalingam and Reps: the subtrees hanging below
+    tree edges that got heavier lose their distances and are searched again from the unaffected
+    rest of the tree, while edges that got lighter start the search at their tail. Only nodes
+    whose distance may change are touched. The tree owns a weighted forward star of the graph and
+    does not follow changes of the graph other than those passed to update().
+    """
+    def __init__(self, graph: Graph, source: Node, stats=None):
+        self.graph = graph
+        self.source = source
+        self.stats = stats if stats is not None else graph.stats
+        self.star = ForwardStar(graph)
+        star = self.star
+        # the node each arc starts at and the arcs entering each node, sorted by their target
+        self.arc_sources = array("q", bytes(8 * len(star.targets)))
+        for i in range(star.node_slots):
+            for arc in range(star.offsets[i], star.offsets[i + 1]):
+                self.arc_sources[arc] = i
+        self.in_offsets = array("q", bytes(8 * (star.node_slots + 1)))
+        for target in star.targets:
+            self.in_offsets[target + 1] += 1
+        for i in range(star.node_slots):
+            self.in_offsets[i + 1] += self.in_offsets[i]
+        position = array("q", self.in_offsets)
+        self.in_arcs = array("q", bytes(8 * len(star.targets)))
+        for arc, target in enumerate(star.targets):
+            self.in_arcs[position[target]] = arc
+            position[target] += 1
+        # the arcs of every edge by id, shared with the reversed twin on undirected graphs
+        self.edge_arcs = {id(edge): [arc] for arc, edge in enumerate(star.edges)}
+        if not graph.directed:
+            root = getattr(graph, "graph", graph)
+            # init_neighbors() appends the reversed edges in the order of the original ones
+            for edge, twin in zip(root.edges[:root.edge_count], root.edges[root.edge_count:]):
+                arcs = self.edge_arcs.get(id(edge), []) + self.edge_arcs.get(id(twin), [])
+                if arcs:
+                    self.edge_arcs[id(edge)] = self.edge_arcs[id(twin)] = arcs
+        if any(weight < 0 for weight in star.weights):
+            raise ValueError("ShortestPathTree: negative edge weights are not supported!")
+        self.dist = None
+        self.pred = None
+        self.recompute()
+
+    def recompute(self) -> None:
+        """
+        Computes the tree from scratch with Dijkstra's algorithm.
+        """
+        with phase(self.stats, "dijkstra"):
+            self.dist, self.pred = dijkstra(self.star, self.source.index, stats=self.stats)
+
+    def distance(self, node: Node) -> float:
+        """
+        Returns the distance from the source to a node, inf if it cannot be reached.
+        """
+        return self.dist[node.index]
+
+    def path(self, node: Node) -> list[Edge]:
+        """
+        Returns the edges of the tree path from the source to a node.
+        """
+        return self.star.path(self.pred, node.index)
+
+    def update(self, changes) -> list[Node]:
+        """
+        Sets new edge weights and repairs the tree. changes is a dict or an iterable of
+        (edge, weight) pairs. The weights are also set on the Edge objects, including the
+        reversed edges of undirected graphs. Returns the nodes whose distance changed.
+        """
+        items = changes.items() if isinstance(changes, dict) else changes
+        star = self.star
+        weights, targets = star.weights, star.targets
+        dist, pred = self.dist, self.pred
+        increased = []
+        decreased = []
+        for edge, weight in items:
+            weight = 1.0 if weight is None else float(weight)
+            if weight < 0:
+                raise ValueError(
+                    f"ShortestPathTree: update(changes), Edge {edge.name} with negative weight!"
+                )
+            for arc in self.edge_arcs.get(id(edge), ()):
+                star.edges[arc].weight = weight
+                if weight > weights[arc]:
+                    increased.append(arc)
+                elif weight < weights[arc]:
+                    decreased.append(arc)
+                weights[arc] = weight
+            edge.weight = weight
+        with phase(self.stats, "repair"):
+            old = {}
+            affected = self.invalidate(increased, old)
+            heap = []
+            # the affected nodes start from their best entering arc of the unaffected tree
+            in_offsets, in_arcs, arc_sources = self.in_offsets, self.in_arcs, self.arc_sources
+            for node in affected:
+                for i in range(in_offsets[node], in_offsets[node + 1]):
+                    arc = in_arcs[i]
+                    candidate = dist[arc_sources[arc]] + weights[arc]
+                    if candidate < dist[node]:
+                        dist[node] = candidate
+                        pred[node] = arc
+                if dist[node] < inf:
+                    heap.append((dist[node], node))
+            for arc in decreased:
+                node = targets[arc]
+                candidate = dist[self.arc_sources[arc]] + weights[arc]
+                if candidate < dist[node]:
+                    old.setdefault(node, dist[node])
+                    dist[node] = candidate
+                    pred[node] = arc
+                    heap.append((candidate, node))
+            heap.sort()
+            self.propagate(heap, old)
+        if self.stats is not None:
+            self.stats.count("nodes_affected", len(affected))
+        return [star.nodes[node] for node, distance in old.items() if dist[node] != distance]
+
+    def invalidate(self, arcs: list[int], old: dict) -> list[int]:
+        """
+        Removes the subtrees below the given tree arcs from the tree and returns their nodes. The
+        old distances of the nodes are stored in old.
+        """
+        offsets, targets = self.star.offsets, self.star.targets
+        dist, pred = self.dist, self.pred
+        affected = []
+        stack = [targets[arc] for arc in arcs if pred[targets[arc]] == arc]
+        while stack:
+            node = stack.pop()
+            if node in old:
+                continue
+            for arc in range(offsets[node], offsets[node + 1]):
+                if pred[targets[arc]] == arc:
+                    stack.append(targets[arc])
+            old[node] = dist[node]
+            affected.append(node)
+        for node in affected:
+            dist[node] = inf
+            pred[node] = -1
+        return affected
+
+    def propagate(self, heap: list, old: dict) -> None:
+        """
+        Continues Dijkstra's algorithm from the nodes on the heap, whose distances were lowered,
+        until no distance can be lowered any more.
+        """
+        offsets, targets, weights = self.star.offsets, self.star.targets, self.star.weights
+        dist, pred = self.dist, self.pred
+        pushes = len(heap)
+        pops = 0
+        while heap:
+            distance, node = heappop(heap)
+            pops += 1
+            if distance > dist[node]:
+                continue
+            for arc in range(offsets[node], offsets[node + 1]):
+                other = targets[arc]
+                candidate = distance + weights[arc]
+                if candidate < dist[other]:
+                    old.setdefault(other, dist[other])
+                    dist[other] = candidate
+                    pred[other] = arc
+                    heappush(heap, (candidate, other))
+                    pushes += 1
+        if self.stats is not None:
+            self.stats.count("heap_pushes", pushes)
+            self.stats.count("heap_pops", pops)
@@ -0,0 +1,183 @@
+"""
+This module contains the SpatialIndex class for nearest node, radius and bounding box queries on
+the coordinates of the nodes. The index is a uniform grid stored in flat arrays: the nodes are
+sorted by cell, and cell_start holds the position of the first node of every cell.
+"""
+from array import array
+from heapq import heappush, heappushpop, nlargest
+from math import floor, hypot, sqrt
+from typing import Iterable
+
+from .core import Graph, Node
+
+
+class SpatialIndex:
+    """
+    Class for a uniform grid over the node coordinates of a graph or view. Nodes without both
+    coordinates are not indexed. The cell size defaults to a value that puts about nodes_per_cell
+    nodes into a cell. The index does not follow later changes of the graph.
+    """
+    def __init__(self, graph: Graph, cell_size: float = None, nodes_per_cell: float = 2.0):
+        nodes = [
+            node for node in graph.nodes if node.x_coord is not None and node.y_coord is not None
+        ]
+        self.graph = graph
+        self.size = len(nodes)
+        if not nodes:
+            raise ValueError("SpatialIndex: the graph has no nodes with coordinates!")
+        self.x_min = min(node.x_coord for node in nodes)
+        self.y_min = min(node.y_coord for node in nodes)
+        x_max = max(node.x_coord for node in nodes)
+        y_max = max(node.y_coord for node in nodes)
+        if cell_size is None:
+            width, height = x_max - self.x_min, y_max - self.y_min
+            # the second bound keeps the grid at O(n) cells if the nodes lie on a line
+            cell_size = max(
+                sqrt(width * height * nodes_per_cell / len(nodes)),
+                max(width, height) * nodes_per_cell / len(nodes)
+            ) or 1.0
+        self.cell_size = cell_size
+        self.cols = int((x_max - self.x_min) / cell_size) + 1
+        self.rows = int((y_max - self.y_min) / cell_size) + 1
+        # counting sort of the nodes by cell
+        cells = array("q", (self.cell(node.x_coord, node.y_coord) for node in nodes))
+        cell_start = array("q", bytes(8 * (self.cols * self.rows + 1)))
+        for cell in cells:
+            cell_start[cell + 1] += 1
+        for cell in range(self.cols * self.rows):
+            cell_start[cell + 1] += cell_start[cell]
+        position = array("q", cell_start)
+        order = array("q", bytes(8 * len(nodes)))
+        for i, cell in enumerate(cells):
+            order[position[cell]] = i
+            position[cell] += 1
+        self.cell_start = cell_start
+        self.nodes = [nodes[i] for i in order]
+        self.x_coords = array("d", (node.x_coord for node in self.nodes))
+        self.y_coords = array("d", (node.y_coord for node in self.nodes))
+
+    def column(self, x_coord: float) -> int:
+        """
+        Returns the grid column of an x coordinate, clamped to the grid.
+        """
+        return min(max(floor((x_coord - self.x_min) / self.cell_size), 0), self.cols - 1)
+
+    def row(self, y_coord: float) -> int:
+        """
+        Returns the grid row of a y coordinate, clamped to the grid.
+        """
+        return min(max(floor((y_coord - self.y_min) / self.cell_size), 0), self.rows - 1)
+
+    def cell(self, x_coord: float, y_coord: float) -> int:
+        """
+        Returns the grid cell of a point, clamped to the grid.
+        """
+        return self.row(y_coord) * self.cols + self.column(x_coord)
+
+    def nearest(self, x_coord: float, y_coord: float, k: int = 1) -> list[Node]:
+        """
+        Returns the k nodes nearest to a point, ordered by distance. The rings of cells around
+        the cell of the point are searched until no unvisited cell can hold a closer node.
+        """
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+        col, row = self.column(x_coord), self.row(y_coord)
+        cell_size = self.cell_size
+        # distance of the point to the border of its cell, a lower bound for the first ring
+        x_cell = min(max(x_coord - self.x_min - col * cell_size, 0), cell_size)
+        y_cell = min(max(y_coord - self.y_min - row * cell_size, 0), cell_size)
+        border = min(x_cell, cell_size - x_cell, y_cell, cell_size - y_cell)
+        cols, rows = self.cols, self.rows
+        cell_start = self.cell_start
+        x_coords, y_coords = self.x_coords, self.y_coords
+        # max heap of the best k candidates as (-distance, position)
+        best = []
+        max_ring = max(col, cols - 1 - col, row, rows - 1 - row)
+        for ring in range(max_ring + 1):
+            if len(best) == k and -best[0][0] <= (ring - 1) * cell_size + border:
+                break
+            for ring_row in range(max(row - ring, 0), min(row + ring, rows - 1) + 1):
+                # inner rows of the ring only hold its leftmost and rightmost cell
+                step = 1 if ring_row in (row - ring, row + ring) else 2 * ring
+                for ring_col in range(col - ring, col + ring + 1, step):
+                    if ring_col < 0 or ring_col >= cols:
+                        continue
+                    cell = ring_row * cols + ring_col
+                    for i in range(cell_start[cell], cell_start[cell + 1]):
+                        distance = hypot(x_coords[i] - x_coord, y_coords[i] - y_coord)
+                        if len(best) < k:
+                            heappush(best, (-distance, i))
+                        elif distance < -best[0][0]:
+                            heappushpop(best, (-distance, i))
+        return [self.nodes[i] for _, i in nlargest(k, best)]
+
+    def nearest_node(self, x_coord: float, y_coord: float) -> Node:
+        """
+        Returns the node nearest to a point.
+        """
+        return self.nearest(x_coord, y_coord, 1)[0]
+
+    def nearest_batch(self, points: Iterable[tuple[float, float]], k: int = 1) -> list:
+        """
+        Answers nearest node queries for many points. Returns a list with the nearest node of
+        every point for k = 1, and a list of the k nearest nodes of every point otherwise.
+        """
+        nearest = self.nearest
+        if k == 1:
+            return [nearest(x_coord, y_coord, 1)[0] for x_coord, y_coord in points]
+        return [nearest(x_coord, y_coord, k) for x_coord, y_coord in points]
+
+    def cells_in_box(self, x_min: float, y_min: float, x_max: float, y_max: float):
+        """
+        Yields the position ranges of the nodes in the cells overlapping a box.
+        """
+        if x_max < x_min or y_max < y_min:
+            return
+        col_min, col_max = self.column(x_min), self.column(x_max)
+        for row in range(self.row(y_min), self.row(y_max) + 1):
+            yield (
+                self.cell_start[row * self.cols + col_min],
+                self.cell_start[row * self.cols + col_max + 1]
+            )
+
+    def within_bbox(self, x_min: float, y_min: float, x_max: float, y_max: float) -> list[Node]:
+        """
+        Returns the nodes inside a bounding box, borders included.
+        """
+        x_coords, y_coords = self.x_coords, self.y_coords
+        return [
+            self.nodes[i]
+            for start, end in self.cells_in_box(x_min, y_min, x_max, y_max)
+            for i in range(start, end)
+            if x_min <= x_coords[i] <= x_max and y_min <= y_coords[i] <= y_max
+        ]
+
+    def within_radius(self, x_coord: float, y_coord: float, radius: float) -> list[Node]:
+        """
+        Returns the nodes within a radius around a point, ordered by distance.
+        """
+        x_coords, y_coords = self.x_coords, self.y_coords
+        found = []
+        for start, end in self.cells_in_box(
+                x_coord - radius, y_coord - radius, x_coord + radius, y_coord + radius
+        ):
+            for i in range(start, end):
+                distance = hypot(x_coords[i] - x_coord, y_coords[i] - y_coord)
+                if distance <= radius:
+                    found.append((distance, i))
+        found.sort()
+        return [self.nodes[i] for _, i in found]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __str__(self) -> str:
+        """
+        Returns relevant information about the index.
+        """
+        return (
+            f"Object type: SpatialIndex, nodes: {self.size}, cells: {self.cols}x{self.rows}, "
+            f"cell_size: {self.cell_size}"
+        )
+
@@ -0,0 +1,70 @@
+"""
+This module contains the opt-in instrumentation of the graph classes. A GraphStats object can be
+handed to the GraphReader, the Graph, the GraphWriter and the algorithms, which then record the
+time spent in their phases and count the objects and operations of each phase. Without a stats
+object, the classes skip all bookkeeping.
+"""
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Callable, Iterator
+
+
+class GraphStats:
+    """
+    Class for collecting per-phase timings in seconds and counters. Timings and counters of the
+    same name are accumulated. The optional callback is called as callback(kind, name, value)
+    with kind "phase" after every finished phase and kind "count" after every counter update.
+    """
+    def __init__(self, callback: Callable[[str, str, float], None] = None) -> None:
+        self.timings = {}
+        self.counters = {}
+        self.callback = callback
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Context manager measuring the time spent in a phase.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            if self.callback is not None:
+                self.callback("phase", name, elapsed)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Adds value to the counter of the given name.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+        if self.callback is not None:
+            self.callback("count", name, value)
+
+    def reset(self) -> None:
+        """
+        Clears all timings and counters.
+        """
+        self.timings = {}
+        self.counters = {}
+
+    def __str__(self) -> str:
+        """
+        Returns the timings and counters, one per line.
+        """
+        lines = ["Object type: GraphStats"]
+        for name, seconds in self.timings.items():
+            lines.append(f"{name}: {seconds * 1000:.3f} ms")
+        for name, value in self.counters.items():
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+
+def phase(stats: GraphStats, name: str):
+    """
+    Returns the phase context manager of stats, or a no-op context manager if stats is None.
+    """
+    if stats is None:
+        return nullcontext()
+    return stats.phase(name)
@@ -0,0 +1,373 @@
+"""
+This module contains the validation of graphs and the statistics gathered along the way. The
+Validator checks the raw lines of a .gra file in a single pass, without building Node and Edge
+objects: header counts against the actual lines, the format of every line, duplicate names,
+unknown edge endpoints, self-loops, parallel edges and negative weights. Problems are reported
+with their line numbers. A loaded Graph is checked the same way, with positions instead of line
+numbers. Besides the names, the validator keeps a few counters per node and, for the detection
+of parallel edges, one integer per edge, which can be switched off for very large files.
+"""
+from array import array
+from math import isnan, sqrt
+from typing import Iterable
+
+from .core import Graph
+
+# directedness keywords accepted by GraphReader
+DIRECTED = {
+    "gerichtet": True, "directed": True, "g": True, "G": True,
+    "ungerichtet": False, "undirected": False, "u": False, "U": False,
+}
+
+
+class Problem:
+    """
+    Class for a problem found by the validator. kind is a short identifier like
+    "duplicate_node", line the line number in the file or None for a loaded graph.
+    """
+    def __init__(self, kind: str, message: str, line: int = None) -> None:
+        self.kind = kind
+        self.message = message
+        self.line = line
+
+    def __str__(self) -> str:
+        location = f"line {self.line}: " if self.line is not None else ""
+        return f"{location}{self.kind}: {self.message}"
+
+
+class ValueStats:
+    """
+    Class for running statistics of numbers: count, missing values, minimum, maximum, mean and
+    standard deviation, updated in constant memory with Welford's method.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.missing = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        self.squares = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Adds a value, None for a missing one.
+        """
+        if value is None:
+            self.missing += 1
+            return
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        """
+        Returns the standard deviation of the values.
+        """
+        return sqrt(self.squares / self.count) if self.count else 0.0
+
+    def __str__(self) -> str:
+        if not self.count:
+            return f"count: 0, missing: {self.missing}"
+        return (
+            f"count: {self.count}, missing: {self.missing}, min: {self.minimum}, "
+            f"max: {self.maximum}, mean: {self.mean:.6g}, std: {self.std:.6g}"
+        )
+
+
+class Validator:
+    """
+    Class for validating a graph node by node and edge by edge. The report is kept in the
+    attributes: the declared and actual counts, the problems, the node and edge weight statistics
+    and the degrees of all nodes. At most max_problems problems are stored, all are counted in
+    problem_count. With parallel_edges=False, parallel edges are not detected, which saves the
+    memory of one integer per edge.
+    """
+    def __init__(self, max_problems: int = 1000, parallel_edges: bool = True) -> None:
+        self.max_problems = max_problems
+        self.problems = []
+        self.problem_count = 0
+        self.declared_node_count = None
+        self.declared_edge_count = None
+        self.directed = True
+        self.node_count = 0
+        self.edge_count = 0
+        self.self_loops = 0
+        self.parallel_edges = 0
+        self.node_weights = ValueStats()
+        self.edge_weights = ValueStats()
+        # position of every node name, and the line, or position, of every node and edge name
+        self.node_positions = {}
+        self.node_lines = array("q")
+        self.edge_lines = {}
+        self.out_degrees = array("q")
+        self.in_degrees = array("q")
+        self.pairs = set() if parallel_edges else None
+
+    def report(self, kind: str, message: str, line: int = None) -> None:
+        """
+        Records a problem.
+        """
+        self.problem_count += 1
+        if len(self.problems) < self.max_problems:
+            self.problems.append(Problem(kind, message, line))
+
+    def add_node(self, name: str, weight: float = None, line: int = None) -> None:
+        """
+        Checks a node and adds it to the statistics.
+        """
+        position = self.node_count
+        self.node_count += 1
+        self.node_weights.add(weight)
+        first = self.node_positions.get(name)
+        if first is not None:
+            where = "line" if line is not None else "node"
+            first_line = self.node_lines[first]
+            self.report(
+                "duplicate_node", f"Node {name} already defined at {where} {first_line}", line
+            )
+            return
+        self.node_positions[name] = len(self.node_lines)
+        self.node_lines.append(position if line is None else line)
+        self.out_degrees.append(0)
+        self.in_degrees.append(0)
+
+    def add_edge(
+            self,
+            name: str,
+            head: str,
+            tail: str,
+            weight: float = None,
+            line: int = None
+    ) -> None:
+        """
+        Checks an edge given by the names of its nodes and adds it to the statistics. A node name
+        None stands for a node outside the graph.
+        """
+        position = self.edge_count
+        self.edge_count += 1
+        self.edge_weights.add(weight)
+        first = self.edge_lines.get(name)
+        if first is not None:
+            where = "line" if line is not None else "edge"
+            self.report("duplicate_edge", f"Edge {name} already defined at {where} {first}", line)
+        else:
+            self.edge_lines[name] = position if line is None else line
+        if weight is not None and weight < 0:
+            self.report("negative_weight", f"Edge {name} has the weight {weight}", line)
+        head_position = self.node_positions.get(head)
+        tail_position = self.node_positions.get(tail)
+        for node, node_position in ((head, head_position), (tail, tail_position)):
+            if node_position is None:
+                node = "outside the graph" if node is None else node
+                self.report("unknown_node", f"Edge {name} refers to the unknown node {node}", line)
+        if head_position is None or tail_position is None:
+            return
+        self.out_degrees[head_position] += 1
+        self.in_degrees[tail_position] += 1
+        if head_position == tail_position:
+            self.self_loops += 1
+            self.report("self_loop", f"Edge {name} connects node {head} to itself", line)
+        if self.pairs is not None:
+            if not self.directed and head_position > tail_position:
+                head_position, tail_position = tail_position, head_position
+            pair = head_position << 32 | tail_position
+            if pair in self.pairs:
+                self.parallel_edges += 1
+                self.report("parallel_edge", f"Edge {name} repeats an edge {head} {tail}", line)
+            else:
+                self.pairs.add(pair)
+
+    def check_counts(self, line: int = None) -> None:
+        """
+        Compares the declared node and edge counts with the actual ones.
+        """
+        for kind, declared, actual in (
+                ("nodes", self.declared_node_count, self.node_count),
+                ("edges", self.declared_edge_count, self.edge_count)
+        ):
+            if declared is not None and declared != actual:
+                self.report(
+                    "count_mismatch", f"the header declares {declared} {kind}, found {actual}", line
+                )
+
+    @property
+    def valid(self) -> bool:
+        """
+        Returns True if no problems were found.
+        """
+        return self.problem_count == 0
+
+    def degree_histogram(self, direction: str = "out") -> dict[int, int]:
+        """
+        Returns how many nodes have each degree, counting the forward ("out"), backward ("in") or
+        all ("all") edges of the nodes. For undirected graphs, "all" is the usual degree.
+        """
+        if direction == "out":
+            degrees = self.out_degrees
+        elif direction == "in":
+            degrees = self.in_degrees
+        elif direction == "all":
+            degrees = map(sum, zip(self.out_degrees, self.in_degrees))
+        else:
+            raise ValueError(f"Validator: degree_histogram(), direction {direction} not supported!")
+        histogram = {}
+        for degree in degrees:
+            histogram[degree] = histogram.get(degree, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def __str__(self) -> str:
+        """
+        Returns the report: counts, statistics and the stored problems.
+        """
+        degrees = self.degree_histogram("out" if self.directed else "all")
+        lines = [
+            f"nodes: {self.node_count} (declared {self.declared_node_count}), "
+            f"edges: {self.edge_count} (declared {self.declared_edge_count}), "
+            f"{'directed' if self.directed else 'undirected'}",
+            f"degrees: min {min(degrees, default=0)}, max {max(degrees, default=0)}, "
+            f"isolated nodes: {degrees.get(0, 0)}",
+            f"node weights: {self.node_weights}",
+            f"edge weights: {self.edge_weights}",
+            f"problems: {self.problem_count}",
+        ]
+        lines.extend(f"  {problem}" for problem in self.problems)
+        if self.problem_count > len(self.problems):
+            lines.append(f"  ... {self.problem_count - len(self.problems)} more")
+        return "\n".join(lines)
+
+
+def parse_numbers(validator: Validator, fields: list[str], line: int) -> list[float]:
+    """
+    Converts fields into numbers with None for nan, reporting fields that are no numbers.
+    """
+    numbers = []
+    for field in fields:
+        try:
+            value = float(field)
+        except ValueError:
+            validator.report("invalid_number", f"{field} is not a number", line)
+            value = None
+        numbers.append(None if value is None or isnan(value) else value)
+    return numbers
+
+
+def validate_lines(
+        lines: Iterable[str],
+        max_problems: int = 1000,
+        parallel_edges: bool = True
+) -> Validator:
+    """
+    Validates the raw lines of a .gra file, e.g. an open file, in a single pass and returns the
+    validator holding the report. Like GraphReader, the node section is taken to be the declared
+    number of data lines after the header, so a wrong node count shows up as lines changing their
+    format and as a count mismatch. Every line of a section must have the number of fields of its
+    first line.
+    """
+    validator = Validator(max_problems, parallel_edges)
+    header = []
+    node_fields = edge_fields = None
+    data_lines = 0
+    number = 0
+    for number, raw_line in enumerate(lines, 1):
+        line = raw_line.split("#")[0].strip()
+        if not line:
+            continue
+        if len(header) < 3:
+            header.append(line)
+            if len(header) == 1 or len(header) == 2:
+                try:
+                    count = int(line)
+                except ValueError:
+                    validator.report("invalid_header", f"{line} is no node or edge count", number)
+                    count = 0
+                if len(header) == 1:
+                    validator.declared_node_count = count
+                else:
+                    validator.declared_edge_count = count
+            elif line in DIRECTED:
+                validator.directed = DIRECTED[line]
+            else:
+                validator.report("invalid_header", f"{line} is no directedness", number)
+            continue
+        fields = line.split()
+        if data_lines < validator.declared_node_count:
+            data_lines += 1
+            if node_fields is None:
+                node_fields = len(fields)
+                if node_fields > 4:
+                    validator.report(
+                        "invalid_format", f"node line with {node_fields} fields", number
+                    )
+            elif len(fields) != node_fields:
+                validator.report(
+                    "invalid_format",
+                    f"node line with {len(fields)} fields in a section of {node_fields}",
+                    number
+                )
+            numbers = parse_numbers(validator, fields[1:4], number)
+            validator.add_node(fields[0], numbers[-1] if len(fields) in (2, 4) else None, number)
+            continue
+        data_lines += 1
+        if edge_fields is None:
+            edge_fields = len(fields)
+        elif len(fields) != edge_fields:
+            validator.report(
+                "invalid_format",
+                f"edge line with {len(fields)} fields in a section of {edge_fields}",
+                number
+            )
+        if len(fields) not in (3, 4):
+            validator.report("invalid_format", f"edge line with {len(fields)} fields", number)
+            if len(fields) < 3:
+                continue
+        weight = parse_numbers(validator, fields[3:4], number)[0] if len(fields) >= 4 else None
+        validator.add_edge(fields[0], fields[1], fields[2], weight, number)
+    if len(header) < 3:
+        validator.report("invalid_header", "the file ends within the header", number)
+    validator.check_counts(number)
+    return validator
+
+
+def validate_file(path: str, max_problems: int = 1000, parallel_edges: bool = True) -> Validator:
+    """
+    Validates a .gra file, reading it line by line.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return validate_lines(file, max_problems, parallel_edges)
+
+
+def validate_graph(
+        graph: Graph,
+        max_problems: int = 1000,
+        parallel_edges: bool = True
+) -> Validator:
+    """
+    Validates a loaded graph or view. Edges whose nodes are not part of the graph are reported
+    as unknown nodes, and the node_count and edge_count of the graph are checked against its
+    lists. Problems carry no line numbers, the messages name the nodes and edges instead.
+    """
+    validator = Validator(max_problems, parallel_edges)
+    validator.directed = graph.directed
+    nodes = [node for node in graph.nodes if graph.contains_node(node)]
+    edges = graph.original_edges()
+    validator.declared_node_count = graph.node_count
+    validator.declared_edge_count = graph.edge_count
+    members = set()
+    for node in nodes:
+        members.add(id(node))
+        validator.add_node(node.name, node.weight)
+    for edge in edges:
+        validator.add_edge(
+            edge.name,
+            edge.head.name if id(edge.head) in members else None,
+            edge.tail.name if id(edge.tail) in members else None,
+            edge.weight
+        )
+    validator.check_counts()
+    return validator
@@ -0,0 +1,236 @@
+"""
+This module contains the GraphView class, a subgraph of a Graph defined by node and edge masks.
+A view shares the Node and Edge objects and the neighbor sets of its graph and filters them on
+access, so creating a view does not copy anything.
+"""
+from typing import Callable, Iterable, Iterator
+
+from .core import Graph, Node, Edge
+
+
+class GraphView:
+    """
+    Class for a zero-copy view of a graph. The masks are sequences indexed by Node.index and
+    Edge.index, e.g. a bytearray, where a true value means the node or edge belongs to the view.
+    A mask of None keeps all nodes or edges. An edge belongs to the view only if it and both of
+    its nodes are unmasked. The view offers the same attributes and adjacency methods as a Graph,
+    so the algorithms accept both. Lists and counts are computed on every access, so changes of
+    the masks are visible immediately.
+    """
+    def __init__(self, graph: Graph, node_mask: bytearray = None, edge_mask: bytearray = None):
+        self.graph = graph
+        self.node_mask = node_mask
+        self.edge_mask = edge_mask
+
+    @classmethod
+    def from_nodes(cls, graph: Graph, nodes: Iterable[Node]) -> "GraphView":
+        """
+        Creates the view induced by the given nodes.
+        """
+        node_mask = bytearray(graph.node_slots)
+        for node in nodes:
+            node_mask[node.index] = 1
+        return cls(graph, node_mask=node_mask)
+
+    @classmethod
+    def from_bbox(
+            cls,
+            graph: Graph,
+            x_min: float,
+            y_min: float,
+            x_max: float,
+            y_max: float
+    ) -> "GraphView":
+        """
+        Creates the view induced by the nodes whose coordinates lie in the given bounding box,
+        borders included. Nodes without both coordinates are excluded.
+        """
+        return cls.from_nodes(graph, (
+            node for node in graph.nodes
+            if node.x_coord is not None and node.y_coord is not None
+            and x_min <= node.x_coord <= x_max and y_min <= node.y_coord <= y_max
+        ))
+
+    @classmethod
+    def from_edge_filter(cls, graph: Graph, predicate: Callable[[Edge], bool]) -> "GraphView":
+        """
+        Creates the view keeping all nodes and the edges for which predicate(edge) is true.
+        """
+        edge_mask = bytearray(graph.edge_slots)
+        for edge in graph.edges[:graph.edge_count]:
+            if predicate(edge):
+                edge_mask[edge.index] = 1
+        return cls(graph, edge_mask=edge_mask)
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the name of the underlying graph.
+        """
+        return self.graph.name
+
+    @property
+    def directed(self) -> bool:
+        """
+        Returns the directedness of the underlying graph.
+        """
+        return self.graph.directed
+
+    @property
+    def stats(self):
+        """
+        Returns the stats object of the underlying graph.
+        """
+        return self.graph.stats
+
+    @property
+    def node_slots(self) -> int:
+        """
+        Returns the size of arrays indexed by Node.index, which is the one of the graph.
+        """
+        return self.graph.node_slots
+
+    @property
+    def edge_slots(self) -> int:
+        """
+        Returns the size of arrays indexed by Edge.index, which is the one of the graph.
+        """
+        return self.graph.edge_slots
+
+    def contains_node(self, node: Node) -> bool:
+        """
+        Returns True if the node belongs to the view.
+        """
+        return node.allowed and (self.node_mask is None or bool(self.node_mask[node.index]))
+
+    def contains_edge(self, edge: Edge) -> bool:
+        """
+        Returns True if the edge and both of its nodes belong to the view.
+        """
+        return (
+            (self.edge_mask is None or bool(self.edge_mask[edge.index]))
+            and self.contains_node(edge.head) and self.contains_node(edge.tail)
+        )
+
+    def iter_nodes(self) -> Iterator[Node]:
+        """
+        Iterates over the nodes of the view.
+        """
+        if self.node_mask is None:
+            return (node for node in self.graph.nodes if node.allowed)
+        node_mask = self.node_mask
+        return (node for node in self.graph.nodes if node.allowed and node_mask[node.index])
+
+    def iter_edges(self) -> Iterator[Edge]:
+        """
+        Iterates over the edges of the view, including the reversed edges of an undirected graph
+        with initialized neighbors.
+        """
+        return (edge for edge in self.graph.edges if self.contains_edge(edge))
+
+    @property
+    def nodes(self) -> list[Node]:
+        """
+        Returns the list of nodes of the view.
+        """
+        return list(self.iter_nodes())
+
+    @property
+    def edges(self) -> list[Edge]:
+        """
+        Returns the list of edges of the view.
+        """
+        return list(self.iter_edges())
+
+    @property
+    def node_count(self) -> int:
+        """
+        Returns the number of nodes of the view.
+        """
+        return sum(1 for _ in self.iter_nodes())
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Returns the number of edges of the view without the reversed edges.
+        """
+        original_edges = self.graph.edges[:self.graph.edge_count]
+        return sum(1 for edge in original_edges if self.contains_edge(edge))
+
+    def original_edges(self) -> list[Edge]:
+        """
+        Returns the edges of the view without the reversed edges added by init_neighbors().
+        """
+        original_edges = self.graph.original_edges()
+        return [edge for edge in original_edges if self.contains_edge(edge)]
+
+    def node_by_name(self, name: str) -> Node:
+        """
+        Returns the node of the view with the given name.
+        """
+        node = self.graph.node_by_name(name)
+        if not self.contains_node(node):
+            raise ValueError(f"GraphView: node_by_name(name), Node {name} not in view!")
+        return node
+
+    def edge_by_name(self, name: str) -> Edge:
+        """
+        Returns the edge of the view with the given name.
+        """
+        edge = self.graph.edge_by_name(name)
+        if not self.contains_edge(edge):
+            raise ValueError(f"GraphView: edge_by_name(name), Edge {name} not in view!")
+        return edge
+
+    def f_edges(self, node: Node) -> Iterator[Edge]:
+        """
+        Iterates over the forward edges of a node that belong to the view.
+        """
+        edge_mask = self.edge_mask
+        contains_node = self.contains_node
+        for edge in node.f_edges:
+            if (edge_mask is None or edge_mask[edge.index]) and contains_node(edge.tail):
+                yield edge
+
+    def b_edges(self, node: Node) -> Iterator[Edge]:
+        """
+        Iterates over the backward edges of a node that belong to the view.
+        """
+        edge_mask = self.edge_mask
+        contains_node = self.contains_node
+        for edge in node.b_edges:
+            if (edge_mask is None or edge_mask[edge.index]) and contains_node(edge.head):
+                yield edge
+
+    def f_neighbors(self, node: Node) -> set[Node]:
+        """
+        Returns the forward neighbors of a node within the view.
+        """
+        if self.edge_mask is None:
+            return {neighbor for neighbor in node.f_neighbors if self.contains_node(neighbor)}
+        return {edge.tail for edge in self.f_edges(node)}
+
+    def b_neighbors(self, node: Node) -> set[Node]:
+        """
+        Returns the backward neighbors of a node within the view.
+        """
+        if self.edge_mask is None:
+            return {neighbor for neighbor in node.b_neighbors if self.contains_node(neighbor)}
+        return {edge.head for edge in self.b_edges(node)}
+
+    def to_graph(self) -> Graph:
+        """
+        Copies the view into a new Graph with new Node and Edge objects and consecutive indices.
+        """
+        nodes = []
+        copies = {}
+        for node in self.iter_nodes():
+            copy = Node(node.name, node.x_coord, node.y_coord, len(nodes), node.weight)
+            copies[node.index] = copy
+            nodes.append(copy)
+        original_edges = self.graph.edges[:self.graph.edge_count]
+        edges = [
+            Edge(edge.name, copies[edge.head.index], copies[edge.tail.index], i, edge.weight)
+            for i, edge in enumerate(edge for edge in original_edges if self.contains_edge(edge))
+        ]
+        return Graph(name=self.name, directed=self.directed, nodes=nodes, edges=edges)
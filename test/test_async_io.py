@@ -0,0 +1,87 @@
+"""
+This module contains the unit tests for the asynchronous reading and writing of graphs.
+"""
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from oellrich_graph.core import GraphReader, GraphWriter, in_executor, read_lines
+from test.test_graph_reader import compare_edge_lists
+
+
+class TestAsyncIO(IsolatedAsyncioTestCase):
+    """
+    TestCase class for testing GraphReader.aread() and GraphWriter.awrite().
+    """
+    async def test_aread_equals_read(self):
+        for name in ["graph9.gra", "test10.gra", "zufall1000.gra"]:
+            path = f"{Path.cwd()}/test/test-graphs/{name}"
+            expected = GraphReader(path, init_neighbors=True).read()
+            graph = await GraphReader(path, init_neighbors=True).aread(chunk_size=100)
+            self.assertEqual(graph.directed, expected.directed)
+            self.assertEqual(graph.node_count, expected.node_count)
+            self.assertEqual(graph.edge_count, expected.edge_count)
+            self.assertEqual(
+                [(node.name, node.x_coord, node.y_coord, node.index) for node in graph.nodes],
+                [(node.name, node.x_coord, node.y_coord, node.index) for node in expected.nodes]
+            )
+            self.assertTrue(compare_edge_lists(graph.edges, expected.edges))
+            self.assertEqual(
+                [sorted(n.name for n in node.f_neighbors) for node in graph.nodes],
+                [sorted(n.name for n in node.f_neighbors) for node in expected.nodes]
+            )
+
+    async def test_awrite_equals_write(self):
+        graph = GraphReader("test/test-graphs/test10.gra").read()
+        with TemporaryDirectory() as directory:
+            path_1 = str(Path(directory) / "sync.gra")
+            path_2 = str(Path(directory) / "async.gra")
+            GraphWriter(graph, path_1).write()
+            await GraphWriter(graph, path_2).awrite(chunk_size=4)
+            with open(path_1, "r", encoding="utf-8") as file1:
+                with open(path_2, "r", encoding="utf-8") as file2:
+                    self.assertEqual(file1.read(), file2.read())
+
+    async def test_aread_yields_to_loop(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await GraphReader("test/test-graphs/zufall1000.gra").aread(chunk_size=100)
+        task.cancel()
+        self.assertGreater(ticks, 10)
+
+    async def test_aread_cancel(self):
+        task = asyncio.create_task(
+            GraphReader("test/test-graphs/zufall10000.gra").aread(chunk_size=100)
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_cancel_waits_for_executor(self):
+        finished = []
+
+        def slow_write():
+            time.sleep(0.2)
+            finished.append(True)
+
+        task = asyncio.create_task(in_executor(slow_write))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(finished, [True])
+
+    async def test_read_lines(self):
+        with open("test/test-graphs/test10.gra", "r", encoding="utf-8") as file:
+            chunks = [read_lines(file, 7) for _ in range(3)]
+        self.assertEqual([len(chunk) for chunk in chunks], [7, 7, 7])
@@ -0,0 +1,146 @@
+"""
+This module contains the unit tests for the centrality functions.
+"""
+from itertools import product
+from math import inf, isclose
+from unittest import TestCase
+from unittest.mock import patch
+
+from oellrich_graph.core import GraphReader
+from oellrich_graph.centrality import betweenness_centrality, closeness_centrality
+from oellrich_graph.views import GraphView
+
+
+def all_pairs(graph, weighted):
+    """
+    Returns the distances and numbers of shortest paths between all nodes by Floyd-Warshall.
+    """
+    count = graph.node_count
+    dist = [[inf] * count for _ in range(count)]
+    sigma = [[0] * count for _ in range(count)]
+    for i in range(count):
+        dist[i][i] = 0.0
+        sigma[i][i] = 1
+    for edge in graph.edges:
+        head, tail = edge.head.index, edge.tail.index
+        dist[head][tail] = edge.weight if weighted else 1.0
+        sigma[head][tail] = 1
+    for k, i, j in product(range(count), repeat=3):
+        if k not in (i, j) and dist[i][k] + dist[k][j] < dist[i][j]:
+            dist[i][j] = dist[i][k] + dist[k][j]
+    # count the shortest paths along a topological order of every shortest path DAG
+    for i in range(count):
+        for j in sorted(range(count), key=lambda j, i=i: dist[i][j]):
+            if j != i and dist[i][j] < inf:
+                sigma[i][j] = sum(
+                    sigma[i][edge.head.index] for edge in graph.edges
+                    if edge.tail.index == j and isclose(
+                        dist[i][edge.head.index] + (edge.weight if weighted else 1.0), dist[i][j]
+                    )
+                )
+    return dist, sigma
+
+
+def brute_force_betweenness(graph, weighted):
+    """
+    Returns the unnormalized betweenness of all nodes from the definition.
+    """
+    dist, sigma = all_pairs(graph, weighted)
+    count = graph.node_count
+    result = [0.0] * count
+    for s, v, t in product(range(count), repeat=3):
+        if len({s, v, t}) < 3 or dist[s][t] == inf:
+            continue
+        if isclose(dist[s][v] + dist[v][t], dist[s][t]):
+            result[v] += sigma[s][v] * sigma[v][t] / sigma[s][t]
+    return result if graph.directed else [value / 2 for value in result]
+
+
+class TestCentrality(TestCase):
+    """
+    TestCase class for testing betweenness and closeness centrality against the definitions.
+    """
+    test10 = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+    graph9 = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+
+    def assert_close(self, values, expected):
+        self.assertEqual(len(values), len(expected))
+        for value, other in zip(values, expected):
+            self.assertAlmostEqual(value, other, places=9)
+
+    def test_betweenness(self):
+        for graph, weighted in ((self.test10, True), (self.test10, False), (self.graph9, False)):
+            expected = brute_force_betweenness(graph, weighted)
+            values = betweenness_centrality(graph, weighted, normalized=False, processes=1)
+            self.assert_close(values, expected)
+            # normalized values count the paths of undirected graphs in both directions
+            scale = (1 if graph.directed else 2) / ((graph.node_count - 1) * (graph.node_count - 2))
+            normalized = betweenness_centrality(graph, weighted, processes=1)
+            self.assert_close(normalized, [value * scale for value in values])
+
+    def test_components(self):
+        values = betweenness_centrality(self.graph9, weighted=False, normalized=False, processes=1)
+        values = {node.name: values[node.index] for node in self.graph9.nodes}
+        # C is a leaf, I connects F and H in their own component
+        self.assertEqual(values["C"], 0.0)
+        self.assertEqual(values["I"], 1.0)
+        self.assertEqual(values["B"], max(values.values()))
+
+    def test_closeness(self):
+        for graph, weighted in ((self.test10, True), (self.graph9, False)):
+            dist, _ = all_pairs(graph, weighted)
+            values = closeness_centrality(graph, weighted, processes=1)
+            count = graph.node_count
+            for i in range(count):
+                reached = [distance for distance in dist[i] if distance < inf]
+                if sum(reached) == 0:
+                    self.assertEqual(values[i], 0.0)
+                else:
+                    expected = (len(reached) - 1) ** 2 / sum(reached) / (count - 1)
+                    self.assertAlmostEqual(values[i], expected)
+
+    def test_processes(self):
+        graph = GraphReader("test/test-graphs/zufall100.gra", init_neighbors=True).read()
+        self.assert_close(
+            betweenness_centrality(graph, processes=2), betweenness_centrality(graph, processes=1)
+        )
+        self.assert_close(
+            closeness_centrality(graph, processes=2), closeness_centrality(graph, processes=1)
+        )
+
+    def test_serial_default(self):
+        graph = GraphReader("test/test-graphs/zufall100.gra", init_neighbors=True).read()
+        with patch("oellrich_graph.centrality.ProcessPoolExecutor", side_effect=AssertionError):
+            betweenness_centrality(graph)
+            closeness_centrality(graph)
+
+    def test_negative_weights(self):
+        graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+        graph.edges[0].weight = -1.0
+        with self.assertRaises(ValueError):
+            betweenness_centrality(graph)
+        with self.assertRaises(ValueError):
+            closeness_centrality(graph)
+        self.assertEqual(len(betweenness_centrality(graph, weighted=False)), 10)
+
+    def test_samples(self):
+        graph = self.test10
+        exact = betweenness_centrality(graph, processes=1)
+        self.assert_close(betweenness_centrality(graph, processes=1, samples=10), exact)
+        sampled = betweenness_centrality(graph, processes=1, samples=5, seed=3)
+        self.assertEqual(sampled, betweenness_centrality(graph, processes=1, samples=5, seed=3))
+        self.assertNotEqual(sampled, exact)
+
+    def test_view(self):
+        view = GraphView.from_nodes(self.test10, (
+            node for node in self.test10.nodes if node.name != "D"
+        ))
+        values = betweenness_centrality(view, normalized=False, processes=1)
+        self.assertEqual(values[self.test10.node_by_name("D").index], 0.0)
+        copy = view.to_graph()
+        copy.init_neighbors()
+        expected = dict(zip(
+            (node.name for node in copy.nodes), brute_force_betweenness(copy, True)
+        ))
+        for node in view.nodes:
+            self.assertAlmostEqual(values[node.index], expected[node.name])
@@ -0,0 +1,92 @@
+"""
+This module contains the unit tests for the algorithms on directed acyclic graphs.
+"""
+from math import inf
+from random import Random
+from unittest import TestCase
+
+from oellrich_graph.core import Graph, GraphReader
+from oellrich_graph.dag import (
+    CycleError, critical_path, dag_distances, dag_path, topological_sort
+)
+from oellrich_graph.generators import ScaleFreeGraph
+from oellrich_graph.shortest_paths import shortest_path
+
+
+def longest_distances(graph, source):
+    """
+    Returns the longest path lengths from source by relaxing all edges n times.
+    """
+    dist = {node: -inf for node in graph.nodes}
+    dist[source] = 0.0
+    for _ in graph.nodes:
+        for edge in graph.edges:
+            dist[edge.tail] = max(dist[edge.tail], dist[edge.head] + edge.weight)
+    return dist
+
+
+class TestDag(TestCase):
+    """
+    TestCase class for testing the topological sort and the paths in acyclic graphs.
+    """
+    dag = ScaleFreeGraph(300, seed=4, directed=True).to_graph(init_neighbors=True)
+    # a small project: activity durations as node weights, edges as precedences
+    project = Graph.from_edge_arrays(
+        [0, 0, 1, 2, 3, 4], [1, 2, 4, 3, 5, 5], weights=[0, 0, 0, 0, 0, 0],
+        node_names=["start", "a", "b", "c", "d", "end"], node_weights=[0, 3, 5, 2, 3, 0],
+        init_neighbors=True
+    )
+
+    def test_topological_sort(self):
+        order = topological_sort(self.dag)
+        self.assertEqual(len(order), self.dag.node_count)
+        position = {node: i for i, node in enumerate(order)}
+        for edge in self.dag.edges:
+            self.assertLess(position[edge.head], position[edge.tail])
+
+    def test_cycle(self):
+        graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+        with self.assertRaises(CycleError) as context:
+            topological_sort(graph)
+        cycle = context.exception.cycle
+        self.assertTrue(cycle)
+        for edge, other in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertIs(edge.tail, other.head)
+        undirected = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+        with self.assertRaises(ValueError):
+            topological_sort(undirected)
+
+    def test_shortest(self):
+        source = self.dag.nodes[-1]
+        dist, _ = dag_distances(self.dag, source)
+        for node in Random(1).sample(self.dag.nodes, 30):
+            length, path = dag_path(self.dag, source, node)
+            self.assertEqual(length, shortest_path(self.dag, source, node)[0])
+            self.assertEqual(length, dist[node.index])
+            if length < inf:
+                self.assertEqual(sum(edge.weight for edge in path), length)
+
+    def test_longest(self):
+        source = self.dag.nodes[-1]
+        expected = longest_distances(self.dag, source)
+        dist, _ = dag_distances(self.dag, source, longest=True)
+        for node in self.dag.nodes:
+            self.assertEqual(dist[node.index], expected[node])
+        length, path = dag_path(self.dag, source, self.dag.nodes[0], longest=True)
+        self.assertEqual(sum(edge.weight for edge in path), length)
+
+    def test_node_weights(self):
+        start, end = self.project.nodes[0], self.project.nodes[-1]
+        length, path = dag_path(self.project, start, end, longest=True, node_weights=True)
+        self.assertEqual(length, 7)
+        self.assertEqual([edge.tail.name for edge in path], ["b", "c", "end"])
+        length, path = dag_path(self.project, start, end, node_weights=True)
+        self.assertEqual(length, 6)
+        self.assertEqual([edge.tail.name for edge in path], ["a", "d", "end"])
+        length, nodes = critical_path(self.project)
+        self.assertEqual(length, 7)
+        self.assertEqual([node.name for node in nodes], ["start", "b", "c", "end"])
+        dist, _ = dag_distances(self.project, longest=True, node_weights=True)
+        self.assertEqual(list(dist), [0, 3, 5, 7, 6, 7])
+        dist, _ = dag_distances(self.project, node_weights=True)
+        self.assertEqual(list(dist), [0, 3, 5, 7, 6, 6])
@@ -0,0 +1,87 @@
+"""
+This module contains the unit tests for the graph generators.
+"""
+from unittest import TestCase
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from oellrich_graph.core import GraphReader
+from oellrich_graph.generators import (
+    GraphGenerator, GridGraph, RandomGeometricGraph, ScaleFreeGraph
+)
+
+
+class TestGenerators(TestCase):
+    """
+    TestCase class for testing the graph generators.
+    """
+    def test_grid(self):
+        graph = GridGraph(3, 4, seed=1).to_graph()
+        self.assertEqual(graph.node_count, 12)
+        self.assertEqual(graph.edge_count, 17)
+        self.assertEqual((graph.nodes[5].x_coord, graph.nodes[5].y_coord), (1, 1))
+        self.assertEqual(
+            {(edge.head.name, edge.tail.name) for edge in graph.edges if edge.head.name == "5"},
+            {("5", "6"), ("5", "9")}
+        )
+
+    def test_seed_is_reproducible(self):
+        for generator in [RandomGeometricGraph, ScaleFreeGraph]:
+            rows_1 = list(generator(200, seed=7).edge_rows())
+            rows_2 = list(generator(200, seed=7).edge_rows())
+            rows_3 = list(generator(200, seed=8).edge_rows())
+            self.assertEqual(rows_1, rows_2)
+            self.assertNotEqual(rows_1, rows_3)
+
+    def test_random_geometric(self):
+        generator = RandomGeometricGraph(500, seed=3)
+        rows = list(generator.edge_rows())
+        self.assertEqual(len(rows), generator.edge_count)
+        for _, head, tail, weight in rows:
+            self.assertNotEqual(head, tail)
+            # the tail lies in the same or an adjacent cell
+            (x_head, y_head), (x_tail, y_tail) = generator.coords(head), generator.coords(tail)
+            self.assertLess(abs(x_head - x_tail), 2 * generator.cell_size)
+            self.assertLess(abs(y_head - y_tail), 2 * generator.cell_size)
+            self.assertGreaterEqual(weight, 1)
+
+    def test_scale_free(self):
+        generator = ScaleFreeGraph(1000, 3, seed=2)
+        rows = list(generator.edge_rows())
+        self.assertEqual(len(rows), generator.edge_count)
+        self.assertTrue(all(tail < head for _, head, tail, _ in rows))
+        degrees = [0] * generator.node_count
+        for _, head, tail, _ in rows:
+            degrees[head] += 1
+            degrees[tail] += 1
+        # old nodes collect far more edges than the average
+        self.assertGreater(max(degrees), 10 * 2 * generator.edge_count / generator.node_count)
+
+    def test_write_and_read(self):
+        generator = RandomGeometricGraph(300, seed=5)
+        with TemporaryDirectory() as directory:
+            path = str(Path(directory) / "random.gra")
+            generator.write(path)
+            with open(path, "r", encoding="utf-8") as file:
+                self.assertEqual(file.readline(), "# generator 2.2 (oellrich_graph, seed 5)\n")
+                self.assertEqual(file.readline(), "# Graphtyp random_geometric\n")
+                text = file.read()
+            self.assertIn("\n# KnotenNr   x-Koord   y-Koord\n", text)
+            self.assertIn("\n# KanteNr   KnotenA   KnotenB   Gewicht\n", text)
+            graph = GraphReader(path).read()
+        expected = generator.to_graph()
+        self.assertEqual(graph.node_count, 300)
+        self.assertEqual(graph.edge_count, 600)
+        self.assertEqual(graph.directed, False)
+        self.assertEqual(
+            [(node.x_coord, node.y_coord) for node in graph.nodes],
+            [(node.x_coord, node.y_coord) for node in expected.nodes]
+        )
+        self.assertEqual(
+            [(edge.head.index, edge.tail.index, edge.weight) for edge in graph.edges],
+            [(edge.head.index, edge.tail.index, edge.weight) for edge in expected.edges]
+        )
+
+    def test_abstract_base(self):
+        with self.assertRaises(TypeError):
+            GraphGenerator(10, 20)  # pylint: disable=abstract-class-instantiated
@@ -1,9 +1,15 @@
 """
 This module contains the unit tests for the Graph class.
 """
-from unittest import TestCase
+from array import array
+from unittest import TestCase, skipIf
 
-from oellrich_graph.core import Graph, Node, Edge
+from oellrich_graph.core import Graph, Node, Edge, GraphReader
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestGraph(TestCase):
@@ -213,3 +219,59 @@ class TestGraph(TestCase):
         )
         graph.name = "test"
         self.assertEqual(graph.auto_name(), "test")
+
+    def test_from_edge_arrays(self):
+        graph = Graph.from_edge_arrays(
+            [0, 1], array("q", [1, 2]), weights=[0.5, float("nan")], directed=False,
+            init_neighbors=True
+        )
+        self.assertEqual([node.name for node in graph.nodes], ["0", "1", "2"])
+        self.assertEqual([node.index for node in graph.nodes], [0, 1, 2])
+        self.assertEqual(
+            [edge.name for edge in graph.edges], ["0", "1", "0_reversed", "1_reversed"]
+        )
+        self.assertEqual(graph.edges[1].head, graph.nodes[1])
+        self.assertEqual(graph.edges[1].tail, graph.nodes[2])
+        self.assertEqual([edge.weight for edge in graph.edges[:2]], [0.5, None])
+        self.assertEqual((graph.node_count, graph.edge_count), (3, 2))
+        self.assertEqual(graph.nodes[1].f_neighbors, {graph.nodes[0], graph.nodes[2]})
+
+    def test_from_edge_arrays_errors(self):
+        with self.assertRaises(ValueError):
+            Graph.from_edge_arrays([0, 1], [1, 3], node_count=3)
+        with self.assertRaises(ValueError):
+            Graph.from_edge_arrays([0, -1], [1, 2])
+        with self.assertRaises(ValueError):
+            Graph.from_edge_arrays([0, 1], [1])
+        with self.assertRaises(ValueError):
+            Graph.from_edge_arrays([0], [1], weights=[1, 2])
+
+    def test_to_arrays(self):
+        graph = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+        arrays = graph.to_arrays()
+        self.assertEqual(list(arrays["heads"][:3]), [0, 1, 0])
+        self.assertEqual(list(arrays["tails"][:3]), [1, 2, 3])
+        self.assertIsNone(arrays["weights"])
+        self.assertEqual(list(arrays["coords"][0][:3]), [0, 1, 2])
+        self.assertEqual(len(arrays["edge_names"]), 9)
+        copied = Graph.from_edge_arrays(**arrays, init_neighbors=True)
+        self.assertEqual(
+            [(edge.name, edge.head.name, edge.tail.name) for edge in copied.edges],
+            [(edge.name, edge.head.name, edge.tail.name) for edge in graph.edges]
+        )
+        self.assertEqual(
+            [(node.name, node.x_coord, node.y_coord) for node in copied.nodes],
+            [(node.name, node.x_coord, node.y_coord) for node in graph.nodes]
+        )
+        self.assertFalse(copied.directed)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_from_edge_arrays_numpy(self):
+        graph = Graph.from_edge_arrays(
+            numpy.array([0, 1, 2]), numpy.array([1, 2, 0]), weights=numpy.array([1.0, 2.0, 3.0]),
+            coords=(numpy.zeros(3), numpy.arange(3.0))
+        )
+        self.assertEqual([edge.weight for edge in graph.edges], [1.0, 2.0, 3.0])
+        self.assertIsInstance(graph.edges[0].weight, float)
+        self.assertEqual([node.y_coord for node in graph.nodes], [0.0, 1.0, 2.0])
+        self.assertEqual(graph.edges[2].tail, graph.nodes[0])
@@ -130,3 +130,36 @@ class TestGraphReader(TestCase):
         self.assertEqual(graph.edges[2].head, graph.nodes[5])
         self.assertEqual(graph.edges[2].tail, graph.nodes[6])
         self.assertEqual(graph.edges[2].weight, 1.41)
+
+    def test_node_formats(self):
+        reader = GraphReader("")
+        lines = {
+            1: ["A", "B"],
+            2: ["A 1.5", "B nan"],
+            3: ["A 0 1", "B nan nan"],
+            4: ["A 0 1 2", "B NaN NAN 3"],
+        }
+        expected = {
+            1: [Node("A", None, None, 0), Node("B", None, None, 1)],
+            2: [Node("A", None, None, 0, 1.5), Node("B", None, None, 1)],
+            3: [Node("A", 0, 1, 0), Node("B", None, None, 1)],
+            4: [Node("A", 0, 1, 0, 2), Node("B", None, None, 1, 3)],
+        }
+        for fields, node_lines in lines.items():
+            self.assertTrue(compare_node_lists(reader.parse_nodes(node_lines), expected[fields]))
+        nodes = reader.parse_nodes(["C 5"], start=7, fields=2)
+        self.assertEqual((nodes[0].index, nodes[0].weight), (7, 5))
+
+    def test_section_format(self):
+        reader = GraphReader("")
+        with self.assertRaisesRegex(ValueError, "B 1 2 3 has 4 fields"):
+            reader.parse_nodes(["A 1 2", "B 1 2 3"])
+        with self.assertRaisesRegex(ValueError, "fields instead of"):
+            reader.parse_nodes(["A 1 2 3 4"])
+        nodes = {"A": Node("A"), "B": Node("B")}
+        with self.assertRaisesRegex(ValueError, "BA B A has 3 fields"):
+            reader.parse_edges(["AB A B 1", "BA B A"], nodes)
+        with self.assertRaises(Warning):
+            reader.parse_edges(["AB A B 1 2"], nodes)
+        edges = reader.parse_edges(["AB A B 1", "BA B A nan", "BB B B -NaN"], nodes)
+        self.assertEqual([edge.weight for edge in edges], [1, None, None])
@@ -1,10 +1,11 @@
 """
 This module contains the unit test(s) for the GraphWriter class.
 """
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from pathlib import Path
 
-from oellrich_graph.core import GraphReader, GraphWriter
+from oellrich_graph.core import Edge, Graph, GraphReader, GraphWriter, Node
 
 
 class TestGraphWriter(TestCase):
@@ -28,3 +29,38 @@ class TestGraphWriter(TestCase):
         with open(path_1, "r", encoding="utf-8") as file1:
             with open(path_2, "r", encoding="utf-8") as file2:
                 self.assertEqual(file1.read(), file2.read())
+
+    def test_node_weights(self):
+        """
+        Tests that missing coordinates and weights survive a round trip.
+        """
+        nodes = [
+            Node("A", 1.5, 2, 0), Node("B", None, None, 1, 3.25), Node("C", 0.1, 1e-7, 2, -2.0)
+        ]
+        edges = [Edge("AB", nodes[0], nodes[1], 0), Edge("BC", nodes[1], nodes[2], 1, 0.3)]
+        graphs = [
+            Graph(nodes=nodes, edges=edges),
+            Graph(nodes=[Node("A", index=0, weight=1), Node("B", index=1)], edges=[]),
+            Graph(nodes=[Node("A", None, 2, 0), Node("B", None, None, 1)], edges=[]),
+            Graph(nodes=[Node("A", index=0), Node("B", index=1)], edges=[]),
+        ]
+        with TemporaryDirectory() as directory:
+            for graph in graphs:
+                path = f"{directory}/graph.gra"
+                GraphWriter(graph, path, lang="eng").write()
+                copy = GraphReader(path).read()
+                self.assertEqual(
+                    [(node.name, node.x_coord, node.y_coord, node.weight) for node in copy.nodes],
+                    [(node.name, node.x_coord, node.y_coord, node.weight) for node in graph.nodes]
+                )
+                self.assertEqual(
+                    [edge.weight for edge in copy.edges], [edge.weight for edge in graph.edges]
+                )
+                GraphWriter(graph, path).stream()
+                with open(path, "r", encoding="utf-8") as file:
+                    streamed = file.read()
+                GraphWriter(graph, path).write()
+                with open(path, "r", encoding="utf-8") as file:
+                    self.assertEqual(file.read(), streamed)
+            with open(path, "r", encoding="utf-8") as file:
+                self.assertIn("# Knotenname\n\nA\nB\n", file.read())
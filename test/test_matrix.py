@@ -0,0 +1,138 @@
+"""
+This module contains the unit tests for the sparse matrix conversion of graphs.
+"""
+from unittest import TestCase, skipIf
+
+from oellrich_graph.core import Graph, GraphReader
+from oellrich_graph.matrix import adjacency_matrix, incidence_matrix, stable_order
+from oellrich_graph.views import GraphView
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import scipy
+except ImportError:
+    scipy = None
+
+
+def edge_tuples(graph):
+    """
+    Returns the head and tail positions and the weights of the original edges of a graph.
+    """
+    return [
+        (edge.head.index, edge.tail.index, edge.weight) for edge in graph.edges[:graph.edge_count]
+    ]
+
+
+@skipIf(numpy is None, "NumPy is not installed")
+class TestMatrix(TestCase):
+    """
+    TestCase class for testing the adjacency and incidence matrices of graphs.
+    """
+    directed = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+    undirected = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+
+    def dense(self, matrix):
+        """
+        Returns a dense NumPy array of a matrix in COO tuple format.
+        """
+        (data, (row, col)), shape = matrix
+        dense = numpy.zeros(shape)
+        numpy.add.at(dense, (row, col), data)
+        return dense
+
+    def test_adjacency_directed(self):
+        (data, indices, indptr), shape = self.directed.to_adjacency_matrix()
+        self.assertEqual(shape, (10, 10))
+        self.assertEqual(len(data), 32)
+        # row of node F with the edges FB, FH, FG and FI
+        row = dict(zip(indices[indptr[5]:indptr[6]], data[indptr[5]:indptr[6]]))
+        self.assertEqual(row, {1: 3.0, 7: 2.0, 6: 1.41, 8: 2.24})
+        dense = self.dense(self.directed.to_adjacency_matrix(layout="coo"))
+        for head, tail, weight in edge_tuples(self.directed):
+            self.assertEqual(dense[head, tail], weight)
+
+    def test_adjacency_undirected(self):
+        dense = self.dense(self.undirected.to_adjacency_matrix(layout="coo", weighted=False))
+        self.assertTrue((dense == dense.T).all())
+        self.assertEqual(dense.sum(), 18)
+        self.assertEqual(dense[0].tolist(), [0, 1, 0, 1, 1, 0, 0, 0, 0])
+
+    def test_self_loop(self):
+        graph = Graph.from_edge_arrays([0, 0], [0, 1], weights=[2.0, 3.0], directed=False)
+        dense = self.dense(graph.to_adjacency_matrix(layout="coo"))
+        self.assertEqual(dense.tolist(), [[2.0, 3.0], [3.0, 0.0]])
+        incidence = self.dense(graph.to_incidence_matrix(layout="coo", weighted=True))
+        self.assertEqual(incidence.tolist(), [[4.0, 3.0], [0.0, 3.0]])
+        copied = Graph.from_incidence_matrix(
+            graph.to_incidence_matrix(weighted=True), directed=False, weighted=True
+        )
+        self.assertEqual(edge_tuples(copied), edge_tuples(graph))
+
+    def test_incidence(self):
+        dense = self.dense(self.directed.to_incidence_matrix(layout="coo"))
+        self.assertEqual(dense.shape, (10, 32))
+        self.assertTrue((dense.sum(axis=0) == 0).all())
+        self.assertEqual((dense[5, 0], dense[1, 0]), (-1, 1))
+        dense = self.dense(self.undirected.to_incidence_matrix(layout="coo"))
+        self.assertTrue((dense.sum(axis=0) == 2).all())
+
+    def test_round_trips(self):
+        for layout in ["csr", "coo"]:
+            copied = Graph.from_adjacency_matrix(self.directed.to_adjacency_matrix(layout))
+            self.assertEqual(sorted(edge_tuples(copied)), sorted(edge_tuples(self.directed)))
+            copied = Graph.from_incidence_matrix(
+                self.directed.to_incidence_matrix(layout, weighted=True), weighted=True
+            )
+            self.assertEqual(edge_tuples(copied), edge_tuples(self.directed))
+        copied = Graph.from_adjacency_matrix(
+            self.undirected.to_adjacency_matrix(weighted=False), directed=False
+        )
+        self.assertEqual(
+            sorted((head, tail) for head, tail, _ in edge_tuples(copied)),
+            sorted((head, tail) for head, tail, _ in edge_tuples(self.undirected))
+        )
+        copied = Graph.from_adjacency_matrix(numpy.array([[0, 2], [0, 0]]))
+        self.assertEqual(edge_tuples(copied), [(0, 1, 2.0)])
+
+    def test_view(self):
+        for graph, x_max in ((self.directed, 2), (self.undirected, 1)):
+            view = GraphView.from_bbox(graph, 0, 0, x_max, x_max * 2)
+            copied = view.to_graph()
+            self.assertEqual(
+                self.dense(adjacency_matrix(view, layout="coo")).tolist(),
+                self.dense(copied.to_adjacency_matrix(layout="coo")).tolist()
+            )
+            self.assertEqual(
+                self.dense(incidence_matrix(view, layout="coo")).tolist(),
+                self.dense(copied.to_incidence_matrix(layout="coo")).tolist()
+            )
+
+    def test_stable_order(self):
+        random = numpy.random.default_rng(7)
+        for high in (5, 1 << 20, 1 << 40):
+            keys = random.integers(0, high, 5000)
+            self.assertEqual(
+                stable_order(keys).tolist(), numpy.argsort(keys, kind="stable").tolist()
+            )
+        self.assertEqual(stable_order(numpy.array([], dtype=numpy.int64)).tolist(), [])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.directed.to_adjacency_matrix(layout="csc")
+        with self.assertRaises(ValueError):
+            Graph.from_incidence_matrix(numpy.array([[1, 0], [1, 0]]))
+
+    @skipIf(scipy is None, "SciPy is not installed")
+    def test_scipy(self):
+        matrix = self.directed.to_adjacency_matrix(scipy=True)
+        self.assertEqual(matrix.format, "csr")
+        self.assertAlmostEqual(
+            matrix.sum(), sum(weight for _, _, weight in edge_tuples(self.directed))
+        )
+        copied = Graph.from_adjacency_matrix(matrix)
+        self.assertEqual(sorted(edge_tuples(copied)), sorted(edge_tuples(self.directed)))
+        incidence = self.undirected.to_incidence_matrix(scipy=True, layout="coo")
+        self.assertEqual(incidence.format, "coo")
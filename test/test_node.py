@@ -53,7 +53,18 @@ class TestNode(TestCase):
     def test_load_from_invalid_str(self):
         node = Node()
         with self.assertRaisesRegex(ValueError, "incorrect format"):
-            node.load_from_string("A 0", 0)
+            node.load_from_string("A 0 0 0 0", 0)
+
+    def test_load_weights(self):
+        node = Node()
+        node.load_from_string("A 2.5", 0)
+        self.assertEqual((node.x_coord, node.y_coord, node.weight), (None, None, 2.5))
+        node = Node()
+        node.load_from_string("A 1 2 3", 0)
+        self.assertEqual((node.x_coord, node.y_coord, node.weight), (1, 2, 3))
+        node = Node()
+        node.load_from_string("A nan nan 3", 0)
+        self.assertEqual((node.x_coord, node.y_coord, node.weight), (None, None, 3))
 
     def test_allowed(self):
         node = Node()
@@ -0,0 +1,120 @@
+"""
+This module contains the unit tests for the partitioning of graphs into shards.
+"""
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from oellrich_graph.core import Graph, GraphReader
+from oellrich_graph.generators import GridGraph
+from oellrich_graph.partitioning import Shard, partition_graph
+from oellrich_graph.views import GraphView
+
+
+class TestPartitioning(TestCase):
+    """
+    TestCase class for testing the partitioner and the shards of its parts.
+    """
+    grid = GridGraph(10, 10).to_graph()
+    graph = GraphReader("test/test-graphs/zufall1000.gra").read()
+
+    def assert_valid(self, partition, part_count):
+        parts = [partition.part_of(node) for node in partition.nodes]
+        self.assertEqual(set(parts), set(range(part_count)))
+        sizes = partition.sizes()
+        self.assertEqual(sum(sizes), len(partition.nodes))
+        average = len(partition.nodes) / part_count
+        self.assertLessEqual(max(sizes) - average, max(0.03 * average, 1) + 1)
+        cut = partition.cut_edges()
+        self.assertEqual(cut, [
+            edge for edge in partition.edges
+            if partition.part_of(edge.head) != partition.part_of(edge.tail)
+        ])
+        self.assertEqual(
+            set(partition.boundary_nodes()),
+            {edge.head for edge in cut} | {edge.tail for edge in cut}
+        )
+
+    def test_grid(self):
+        partition = partition_graph(self.grid, 4)
+        self.assert_valid(partition, 4)
+        self.assertEqual(partition.sizes(), [25] * 4)
+        # four 5x5 quadrants cut 2 * 10 edges
+        self.assertEqual(len(partition.cut_edges()), 20)
+        self.assertEqual(partition_graph(self.grid, 1).sizes(), [100])
+
+    def test_refinement(self):
+        for part_count in (2, 5):
+            grown = partition_graph(self.graph, part_count, passes=0)
+            refined = partition_graph(self.graph, part_count)
+            self.assert_valid(refined, part_count)
+            self.assertLess(len(refined.cut_edges()), len(grown.cut_edges()))
+
+    def test_without_coordinates(self):
+        # two cliques of 6 nodes joined by one edge, and an isolated pair
+        heads, tails = [6], [5]
+        for offset in (0, 6):
+            for i in range(6):
+                for j in range(i + 1, 6):
+                    heads.append(offset + i)
+                    tails.append(offset + j)
+        heads.append(12)
+        tails.append(13)
+        graph = Graph.from_edge_arrays(heads, tails, directed=False)
+        partition = partition_graph(graph, 2, imbalance=0.2)
+        self.assert_valid(partition, 2)
+        self.assertEqual(len(partition.cut_edges()), 1)
+
+    def test_view(self):
+        view = GraphView.from_bbox(self.grid, 0, 0, 4, 9)
+        partition = partition_graph(view, 2)
+        self.assert_valid(partition, 2)
+        # the 5x10 grid of the view is cut by at least 5 edges
+        self.assertLessEqual(len(partition.cut_edges()), 10)
+        self.assertEqual(len(partition.nodes), 50)
+        self.assertEqual(partition.parts[self.grid.nodes[9].index], -1)
+
+    def test_shards(self):
+        partition = partition_graph(self.graph, 3)
+        shards = [partition.shard(part) for part in range(3)]
+        owned = [node.name for shard in shards for node in shard.owned_nodes()]
+        self.assertEqual(sorted(owned), sorted(node.name for node in self.graph.nodes))
+        names = {node.name: node for node in self.graph.nodes}
+        for shard in shards:
+            for name, owner in shard.halo.items():
+                self.assertEqual(partition.part_of(names[name]), owner)
+                self.assertNotEqual(owner, shard.part)
+            for name, parts in shard.boundary.items():
+                for part in parts:
+                    self.assertEqual(shards[part].halo[name], shard.part)
+            edges = {edge.name for edge in shard.graph.edges}
+            self.assertEqual(edges, {
+                edge.name for edge in self.graph.edges
+                if shard.part in (partition.part_of(edge.head), partition.part_of(edge.tail))
+            })
+        cut = sum(
+            1 for shard in shards for edge in shard.graph.edges
+            if not (shard.owns(edge.head) and shard.owns(edge.tail))
+        )
+        self.assertEqual(cut, 2 * len(partition.cut_edges()))
+
+    def test_write_and_read(self):
+        partition = partition_graph(self.graph, 3)
+        with TemporaryDirectory() as directory:
+            for binary in (False, True):
+                for part, path in enumerate(partition.write(directory, binary)):
+                    expected = partition.shard(part)
+                    shard = Shard.read(str(path), init_neighbors=True)
+                    self.assertEqual((shard.part, shard.part_count), (part, 3))
+                    self.assertEqual(shard.halo, expected.halo)
+                    self.assertEqual(shard.boundary, expected.boundary)
+                    self.assertEqual(
+                        [(node.name, node.x_coord) for node in shard.graph.nodes],
+                        [(node.name, node.x_coord) for node in expected.graph.nodes]
+                    )
+                    self.assertEqual(shard.graph.edge_count, expected.graph.edge_count)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            partition_graph(self.grid, 0)
+        with self.assertRaises(ValueError):
+            partition_graph(self.grid, 101)
@@ -0,0 +1,125 @@
+"""
+This module contains the unit tests for pickling Graph objects.
+"""
+import copy
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import TestCase
+
+from oellrich_graph.core import Graph, Node, Edge, GraphReader
+
+
+def describe(graph):
+    """
+    Returns the attributes of a graph, its nodes, edges and neighbors as comparable tuples.
+    """
+    return (
+        graph.name, graph.directed, graph.node_count, graph.edge_count,
+        [(node.name, node.x_coord, node.y_coord, node.index, node.weight,
+          sorted(neighbor.name for neighbor in node.f_neighbors),
+          sorted(edge.name for edge in node.b_edges)) for node in graph.nodes],
+        [(edge.name, edge.head.name, edge.tail.name, edge.index, edge.weight)
+         for edge in graph.edges],
+    )
+
+
+def edge_names(graph):
+    """
+    Returns the edge names of a graph, used to check a graph sent to a worker process.
+    """
+    return [edge.name for edge in graph.edges]
+
+
+class TestPickle(TestCase):
+    """
+    TestCase class for testing the compact pickling of the Graph class.
+    """
+    def test_round_trip(self):
+        graphs = [
+            GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read(),
+            GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read(),
+            GraphReader("test/test-graphs/zufall100.gra").read(),
+        ]
+        for graph in graphs:
+            for protocol in [2, 4, 5]:
+                copied = pickle.loads(pickle.dumps(graph, protocol=protocol))
+                self.assertEqual(describe(copied), describe(graph))
+
+    def test_manual_graph(self):
+        node_a = Node("A", 0, 0, 0)
+        node_b = Node("B", 1.5, None, 1, weight=2)
+        node_c = Node(None, None, None, 7)
+        graph = Graph(
+            name="manual",
+            nodes=[node_a, node_b, node_c],
+            edges=[Edge("AB", node_a, node_b, 0, 0.25), Edge("BA", node_b, node_a, 5)],
+        )
+        copied = copy.deepcopy(graph)
+        self.assertEqual(describe(copied), describe(graph))
+        node_a.name = "a b\nc"
+        self.assertEqual(describe(copy.deepcopy(graph)), describe(graph))
+        self.assertIsInstance(copied.nodes[2].index, int)
+        self.assertIsNone(copied.nodes[2].name)
+        self.assertEqual(copied.edges[1].index, 5)
+        node_a, node_b = Node("A"), Node("B")
+        graph = Graph(nodes=[node_a, node_b], edges=[Edge("e", node_a, node_b)])
+        copied = copy.deepcopy(graph)
+        self.assertEqual([node.index for node in copied.nodes], [None, None])
+        self.assertEqual([edge.index for edge in copied.edges], [None])
+        node_b.index = 1
+        copied = copy.deepcopy(graph)
+        self.assertEqual([node.index for node in copied.nodes], [None, 1])
+
+    def test_lazy_out_of_band(self):
+        graph = GraphReader("test/test-graphs/zufall1000.gra", init_neighbors=True).read()
+        buffers = []
+        data = pickle.dumps(graph, protocol=5, buffer_callback=buffers.append)
+        self.assertGreater(len(buffers), 0)
+        copied = pickle.loads(data, buffers=buffers)
+        self.assertIn("packed", copied.__dict__)
+        self.assertEqual((copied.node_count, copied.edge_count), (1000, 2000))
+        self.assertEqual(len(copied.edges), 4000)
+        self.assertNotIn("packed", copied.__dict__)
+        self.assertEqual(describe(copied), describe(graph))
+        with self.assertRaises(AttributeError):
+            copied.missing  # pylint: disable=pointless-statement
+
+    def test_repickle_out_of_band(self):
+        graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+        buffers = []
+        data = pickle.dumps(graph, protocol=5, buffer_callback=buffers.append)
+        for protocol in [2, 4, 5]:
+            copied = pickle.loads(data, buffers=buffers)
+            again = pickle.loads(pickle.dumps(copied, protocol=protocol))
+            self.assertEqual(describe(again), describe(graph))
+        copied = pickle.loads(data, buffers=buffers)
+        self.assertEqual(describe(copy.deepcopy(copied)), describe(graph))
+
+    def test_concurrent_unpack(self):
+        graph = GraphReader("test/test-graphs/zufall1000.gra", init_neighbors=True).read()
+        data = pickle.dumps(graph, protocol=5)
+        for _ in range(10):
+            copied = pickle.loads(data)
+            barrier = threading.Barrier(4)
+
+            def touch(_):
+                barrier.wait()
+                return copied.nodes, len(copied.edges)
+
+            with ThreadPoolExecutor(4) as pool:
+                results = list(pool.map(touch, range(4)))
+            self.assertTrue(all(nodes is copied.nodes for nodes, _ in results))
+            self.assertEqual({count for _, count in results}, {4000})
+            self.assertEqual(len(copied.nodes[0].f_edges), len(graph.nodes[0].f_edges))
+
+    def test_smaller_than_objects(self):
+        graph = GraphReader("test/test-graphs/zufall1000.gra", init_neighbors=True).read()
+        size = len(pickle.dumps(graph, protocol=5))
+        # the arrays of 1000 nodes and 2000 edges take 4 or 8 bytes per value
+        self.assertLess(size, 40000)
+
+    def test_worker_process(self):
+        graph = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(executor.submit(edge_names, graph).result(), edge_names(graph))
@@ -0,0 +1,115 @@
+"""
+This module contains the unit tests for the GraphRegistry class.
+"""
+import os
+import shutil
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from oellrich_graph import registry
+from oellrich_graph.registry import GraphRegistry, default_registry
+from oellrich_graph.stats import GraphStats
+
+
+class TestGraphRegistry(TestCase):
+    """
+    TestCase class for testing the GraphRegistry class.
+    """
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        for name in ["graph9.gra", "test10.gra", "zufall100.gra"]:
+            shutil.copy(f"test/test-graphs/{name}", self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return str(Path(self.directory.name) / name)
+
+    def test_cache_hit(self):
+        stats = GraphStats()
+        graphs = GraphRegistry(stats=stats)
+        graph = graphs.get(self.path("graph9.gra"))
+        self.assertIs(graphs.get(self.path("graph9.gra")), graph)
+        self.assertEqual(stats.counters["registry_misses"], 1)
+        self.assertEqual(stats.counters["registry_hits"], 1)
+        self.assertEqual(
+            graph.nodes[0].f_neighbors, {graph.nodes[1], graph.nodes[3], graph.nodes[4]}
+        )
+        self.assertIn(self.path("graph9.gra"), graphs)
+
+    def test_reload_on_change(self):
+        graphs = GraphRegistry()
+        path = self.path("graph9.gra")
+        graph = graphs.get(path)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("\n# changed\n")
+        self.assertIsNot(graphs.get(path), graph)
+        self.assertEqual(len(graphs), 1)
+
+    def test_lru_eviction(self):
+        graphs = GraphRegistry(init_neighbors=False)
+        graph9 = graphs.get(self.path("graph9.gra"))
+        graphs.get(self.path("test10.gra"))
+        zufall100 = GraphRegistry(init_neighbors=False).get(self.path("zufall100.gra"))
+        graphs.max_bytes = graphs.estimate_bytes(graph9) + graphs.estimate_bytes(zufall100)
+        # touch graph9, so test10 is the least recently used graph
+        graphs.get(self.path("graph9.gra"))
+        graphs.get(self.path("zufall100.gra"))
+        self.assertNotIn(self.path("test10.gra"), graphs)
+        self.assertIn(self.path("zufall100.gra"), graphs)
+        self.assertIn(self.path("graph9.gra"), graphs)
+        self.assertEqual(graphs.total_bytes, graphs.max_bytes)
+        self.assertTrue(graphs.discard(self.path("zufall100.gra")))
+        graphs.clear()
+        self.assertEqual((len(graphs), graphs.total_bytes), (0, 0))
+
+    def test_remove_callbacks(self):
+        graphs = GraphRegistry(max_bytes=1, init_neighbors=False)
+        removed = []
+        graphs.remove_callbacks.append(lambda key, graph: removed.append((key, graph)))
+        graph9 = graphs.get(self.path("graph9.gra"))
+        test10 = graphs.get(self.path("test10.gra"))
+        self.assertEqual(removed, [(graphs.key(self.path("graph9.gra")), graph9)])
+        self.assertTrue(graphs.holds(self.path("test10.gra"), test10))
+        self.assertFalse(graphs.holds(self.path("graph9.gra"), graph9))
+        graphs.clear()
+        self.assertIs(removed[-1][1], test10)
+        self.assertEqual(len(removed), 2)
+
+    def test_single_load_for_concurrent_threads(self):
+        graphs = GraphRegistry()
+        loads = []
+        read = registry.GraphReader.read
+
+        def counting_read(reader):
+            loads.append(reader.path)
+            return read(reader)
+
+        results = []
+
+        def get():
+            results.append(graphs.get(self.path("zufall100.gra")))
+
+        with patch.object(registry.GraphReader, "read", counting_read):
+            threads = [threading.Thread(target=get) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(graph is results[0] for graph in results))
+        self.assertEqual(graphs.load_locks, {})
+        with open(self.path("broken.gra"), "w", encoding="utf-8") as file:
+            file.write("2\n1\ngerichtet\nA\nB\nAB A C\n")
+        with self.assertRaises(KeyError):
+            graphs.get(self.path("broken.gra"))
+        self.assertEqual(graphs.load_locks, {})
+
+    def test_default_registry(self):
+        self.assertIs(default_registry(), default_registry())
+        key = GraphRegistry.key("test/test-graphs/graph9.gra")
+        self.assertTrue(os.path.isabs(key))
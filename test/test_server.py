@@ -0,0 +1,149 @@
+"""
+This module contains the unit tests for the graph daemon and its client.
+"""
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipIf
+
+from oellrich_graph.core import GraphReader
+from oellrich_graph.server import GraphClient, GraphDaemon, receive_frame, send_frame
+from oellrich_graph.shortest_paths import shortest_path
+from oellrich_graph.stats import GraphStats
+
+TEST10 = "test/test-graphs/test10.gra"
+GRAPH9 = "test/test-graphs/graph9.gra"
+
+
+@skipIf(not hasattr(socket, "AF_UNIX"), "Unix domain sockets not available")
+class TestServer(TestCase):
+    """
+    TestCase class for testing queries against a daemon running in a background thread.
+    """
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.stats = GraphStats()
+        self.daemon = GraphDaemon(f"{self.directory.name}/graph.sock", stats=self.stats)
+        self.daemon.start()
+        self.client = GraphClient(self.daemon.socket_path)
+
+    def tearDown(self):
+        self.client.close()
+        self.daemon.stop()
+        self.directory.cleanup()
+
+    def test_queries(self):
+        self.assertEqual(self.client.load(TEST10), {"node_count": 10, "edge_count": 32})
+        node = self.client.node(TEST10, "B")
+        self.assertEqual(
+            node, {"name": "B", "index": 1, "x_coord": 4, "y_coord": 4, "weight": None}
+        )
+        self.assertEqual(self.client.neighbors(TEST10, "F"), ["B", "G", "H", "I"])
+        self.assertEqual(self.client.neighbors(TEST10, "F", "in"), [])
+        self.assertEqual(self.client.neighbors(GRAPH9, "A"), ["B", "D", "E"])
+        result = self.client.shortest_path(TEST10, "F", "C")
+        graph = GraphReader(TEST10, init_neighbors=True).read()
+        length, path = shortest_path(graph, graph.node_by_name("F"), graph.node_by_name("C"))
+        self.assertEqual(result["length"], length)
+        self.assertEqual(result["edges"], [edge.name for edge in path])
+        self.assertEqual(result["nodes"], ["F", "I", "D", "C"])
+        self.assertEqual(
+            self.client.shortest_path(TEST10, "C", "F"), {"length": None, "edges": [], "nodes": []}
+        )
+
+    def test_batch(self):
+        results = self.client.batch([
+            {"op": "node", "path": TEST10, "name": "A"},
+            {"op": "node", "path": TEST10, "name": "Z"},
+            {"op": "unknown", "path": TEST10},
+            {"op": "load", "path": "test/test-graphs/missing.gra"},
+            {
+                "op": "shortest_path", "path": GRAPH9, "source": "A", "target": "G",
+                "weighted": False
+            },
+        ])
+        self.assertEqual(results[0]["name"], "A")
+        for result in results[1:4]:
+            self.assertIsInstance(result, ValueError)
+        self.assertEqual(results[4]["length"], 2)
+        with self.assertRaises(ValueError):
+            self.client.node(TEST10, "Z")
+        self.assertEqual(self.stats.counters["queries"], 6)
+
+    def test_failing_queries(self):
+        empty = f"{self.directory.name}/empty.gra"
+        with open(empty, "w", encoding="utf-8"):
+            pass
+        results = self.client.batch([
+            {"op": "load", "path": empty},
+            ["not", "a", "query"],
+            {"op": "load", "path": GRAPH9},
+        ])
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], {"node_count": 9, "edge_count": 9})
+        with self.client.connection() as sock:
+            send_frame(sock, {"queries": "load"})
+            response = receive_frame(sock)
+        self.assertFalse(response["results"][0]["ok"])
+        self.assertEqual(self.client.load(TEST10)["node_count"], 10)
+
+    def test_closed_connection(self):
+        self.client.load(TEST10)
+        sock = self.client.idle.queue[0]
+        sock.shutdown(socket.SHUT_RD)
+        with self.assertRaises(ConnectionError):
+            self.client.load(TEST10)
+        self.assertEqual(self.client.idle.qsize(), 0)
+        self.assertEqual(self.client.load(TEST10)["node_count"], 10)
+
+    def test_socket_path_in_use(self):
+        with self.assertRaises(FileExistsError):
+            GraphDaemon(self.daemon.socket_path).start()
+        self.assertEqual(self.client.load(TEST10)["node_count"], 10)
+        text_path = f"{self.directory.name}/notasocket.txt"
+        with open(text_path, "w", encoding="utf-8") as file:
+            file.write("keep")
+        with self.assertRaises(FileExistsError):
+            GraphDaemon(text_path).start()
+        with open(text_path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "keep")
+
+    def test_stale_socket(self):
+        stale_path = f"{self.directory.name}/stale.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(stale_path)
+        with GraphDaemon(stale_path) as daemon, GraphClient(stale_path) as client:
+            self.assertEqual(client.load(TEST10)["node_count"], 10)
+        self.assertFalse(os.path.exists(daemon.socket_path))
+
+    def test_resident_graphs(self):
+        for _ in range(5):
+            self.client.shortest_path(TEST10, "F", "C")
+        self.assertEqual(self.daemon.registry.stats.counters["registry_misses"], 1)
+        self.assertEqual(len(self.daemon.residents), 1)
+        self.assertEqual(len(self.daemon.residents[self.daemon.registry.key(TEST10)].stars), 1)
+
+    def test_evicted_graphs(self):
+        self.daemon.registry.max_bytes = 1
+        for path, source, target in (
+                (TEST10, "A", "B"), (GRAPH9, "A", "B"), ("test/test-graphs/zufall100.gra", "0", "1")
+        ):
+            self.client.shortest_path(path, source, target)
+        self.assertEqual(len(self.daemon.registry), 1)
+        self.assertEqual(list(self.daemon.residents), list(self.daemon.registry.entries))
+        self.daemon.registry.clear()
+        self.assertEqual(self.daemon.residents, {})
+
+    def test_pooled_connections(self):
+        self.client.load(TEST10)
+        sock = self.client.idle.queue[0]
+        self.client.node(TEST10, "A")
+        self.assertIs(self.client.idle.queue[0], sock)
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(
+                lambda i: self.client.shortest_path(TEST10, "F", "C")["length"], range(40)
+            ))
+        self.assertEqual(len(set(results)), 1)
+        self.assertLessEqual(self.client.idle.qsize(), 4)
@@ -0,0 +1,196 @@
+"""
+This module contains the unit tests for the ForwardStar class and Dijkstra's algorithm.
+"""
+from itertools import islice
+from math import inf
+from random import Random
+from unittest import TestCase
+
+from oellrich_graph.core import Edge, Graph, GraphReader, Node
+from oellrich_graph.shortest_paths import (
+    ForwardStar, ShortestPathTree, dijkstra, k_shortest_paths, shortest_path
+)
+from oellrich_graph.views import GraphView
+
+
+class TestShortestPaths(TestCase):
+    """
+    TestCase class for testing the forward star and shortest paths on the test graphs.
+    """
+    graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+
+    def test_forward_star(self):
+        star = ForwardStar(self.graph)
+        self.assertEqual(len(star.targets), self.graph.edge_count)
+        for node in self.graph.nodes:
+            arcs = range(star.offsets[node.index], star.offsets[node.index + 1])
+            self.assertEqual({star.edges[arc] for arc in arcs}, set(node.f_edges))
+        reverse = ForwardStar(self.graph, reverse=True)
+        for node in self.graph.nodes:
+            arcs = range(reverse.offsets[node.index], reverse.offsets[node.index + 1])
+            self.assertEqual({reverse.edges[arc] for arc in arcs}, set(node.b_edges))
+
+    def test_shortest_path(self):
+        source, target = self.graph.node_by_name("F"), self.graph.node_by_name("C")
+        length, path = shortest_path(self.graph, source, target)
+        self.assertAlmostEqual(length, 5.89)
+        self.assertEqual([edge.name for edge in path], ["FI", "ID", "DC"])
+        length, path = shortest_path(self.graph, source, target, weighted=False)
+        self.assertEqual(length, 2)
+        self.assertEqual([edge.name for edge in path], ["FB", "BC"])
+        length, path = shortest_path(self.graph, target, source)
+        self.assertEqual((length, path), (inf, []))
+
+    def test_reverse(self):
+        star = ForwardStar(self.graph, reverse=True)
+        target = self.graph.node_by_name("C")
+        dist, pred = dijkstra(star, target.index)
+        source = self.graph.node_by_name("F")
+        self.assertAlmostEqual(dist[source.index], 5.89)
+        self.assertEqual([edge.name for edge in star.path(pred, source.index)], ["FI", "ID", "DC"])
+
+    def test_view(self):
+        view = GraphView.from_edge_filter(self.graph, lambda edge: edge.name != "ID")
+        length, path = shortest_path(
+            view, self.graph.node_by_name("F"), self.graph.node_by_name("C")
+        )
+        self.assertNotIn("ID", [edge.name for edge in path])
+        self.assertAlmostEqual(length, sum(edge.weight for edge in path))
+
+    def test_errors(self):
+        graph = GraphReader("test/test-graphs/test10.gra").read()
+        with self.assertRaises(ValueError):
+            ForwardStar(graph)
+        self.assertEqual(len(ForwardStar(Graph(nodes=[], edges=[])).targets), 0)
+
+
+def simple_paths(source, target, visited=()):
+    """
+    Yields all loopless paths from source to target by depth-first search.
+    """
+    if source is target:
+        yield []
+        return
+    for edge in source.f_edges:
+        if edge.tail not in visited and edge.tail is not source:
+            for path in simple_paths(edge.tail, target, visited + (source,)):
+                yield [edge] + path
+
+
+class TestKShortestPaths(TestCase):
+    """
+    TestCase class for testing Yen's algorithm against the enumeration of all loopless paths.
+    """
+    graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+
+    def test_all_paths(self):
+        for source, target in (("F", "C"), ("A", "B"), ("J", "I")):
+            source, target = self.graph.node_by_name(source), self.graph.node_by_name(target)
+            expected = sorted(
+                sum(edge.weight for edge in path) for path in simple_paths(source, target)
+            )
+            paths = list(k_shortest_paths(self.graph, source, target))
+            self.assertEqual(len(paths), len(expected))
+            for (length, path), other in zip(paths, expected):
+                self.assertAlmostEqual(length, other)
+                self.assertAlmostEqual(sum(edge.weight for edge in path), length)
+                nodes = [source] + [edge.tail for edge in path]
+                self.assertEqual(len(set(nodes)), len(nodes))
+                self.assertIs(nodes[-1], target)
+            self.assertEqual(len({tuple(path) for _, path in paths}), len(paths))
+
+    def test_lazy(self):
+        graph = GraphReader("test/test-graphs/zufall1000.gra", init_neighbors=True).read()
+        paths = k_shortest_paths(graph, graph.nodes[0], graph.nodes[-1])
+        first = list(islice(paths, 3))
+        self.assertEqual(first[0][0], shortest_path(graph, graph.nodes[0], graph.nodes[-1])[0])
+        self.assertEqual(first, sorted(first, key=lambda item: item[0]))
+        self.assertGreaterEqual(next(paths)[0], first[-1][0])
+
+    def test_special_cases(self):
+        source, target = self.graph.node_by_name("F"), self.graph.node_by_name("C")
+        self.assertEqual(list(k_shortest_paths(self.graph, target, source)), [])
+        self.assertEqual(list(k_shortest_paths(self.graph, source, source)), [(0.0, [])])
+        view = GraphView.from_edge_filter(self.graph, lambda edge: edge.name not in ("BC", "DC"))
+        expected = [
+            path for path in simple_paths(source, target)
+            if not {"BC", "DC"} & {edge.name for edge in path}
+        ]
+        self.assertEqual(len(list(k_shortest_paths(view, source, target))), len(expected))
+
+
+class TestShortestPathTree(TestCase):
+    """
+    TestCase class for testing the repair of shortest path trees against full recomputations.
+    """
+    def assert_matches(self, tree):
+        dist, _ = dijkstra(ForwardStar(tree.graph), tree.source.index)
+        for node in tree.graph.nodes:
+            self.assertAlmostEqual(tree.distance(node), dist[node.index])
+            if tree.distance(node) < inf and node is not tree.source:
+                path = tree.path(node)
+                self.assertIs(path[-1].tail, node)
+                self.assertAlmostEqual(sum(edge.weight for edge in path), tree.distance(node))
+
+    def test_random_batches(self):
+        for name in ("test10", "zufall1000"):
+            graph = GraphReader(f"test/test-graphs/{name}.gra", init_neighbors=True).read()
+            tree = ShortestPathTree(graph, graph.nodes[0])
+            random = Random(name)
+            edges = graph.edges[:graph.edge_count]
+            for _ in range(20):
+                changes = {
+                    edge: edge.weight * random.choice((0, 0.5, 0.9, 1.1, 2, 10))
+                    for edge in random.sample(edges, 5)
+                }
+                old = {node: tree.distance(node) for node in graph.nodes}
+                changed = tree.update(changes)
+                self.assert_matches(tree)
+                self.assertEqual(set(changed), {
+                    node for node in graph.nodes if tree.distance(node) != old[node]
+                })
+
+    def test_changed_nodes(self):
+        graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+        tree = ShortestPathTree(graph, graph.node_by_name("F"))
+        target = graph.node_by_name("C")
+        self.assertAlmostEqual(tree.distance(target), 5.89)
+        changed = tree.update([(graph.edge_by_name("DC"), 10)])
+        self.assertEqual([node.name for node in changed], ["C"])
+        self.assertEqual(graph.edge_by_name("DC").weight, 10)
+        self.assertEqual([edge.name for edge in tree.path(target)], ["FG", "GA", "AE", "EC"])
+        self.assertEqual(tree.update({graph.edge_by_name("CE"): 5}), [])
+        changed = tree.update({graph.edge_by_name("DC"): 1.41})
+        self.assertEqual([edge.name for edge in tree.path(target)], ["FI", "ID", "DC"])
+        self.assertEqual([node.name for node in changed], ["C"])
+        self.assert_matches(tree)
+
+    def test_undirected(self):
+        graph = GraphReader("test/test-graphs/zufall100.gra", init_neighbors=True).read()
+        tree = ShortestPathTree(graph, graph.nodes[5])
+        edge = tree.path(graph.nodes[50])[0]
+        tree.update({edge: edge.weight * 100})
+        twins = [other for other in graph.edges if other.index == edge.index]
+        self.assertEqual([other.weight for other in twins], [edge.weight] * 2)
+        self.assert_matches(tree)
+
+    def test_edges_without_index(self):
+        for directed in (True, False):
+            nodes = [Node(name, 0, 0, i) for i, name in enumerate("abc")]
+            edge_ab = Edge("ab", nodes[0], nodes[1], weight=1.0)
+            edge_bc = Edge("bc", nodes[1], nodes[2], weight=1.0)
+            graph = Graph(
+                directed=directed, nodes=nodes, edges=[edge_ab, edge_bc], init_neighbors=True
+            )
+            tree = ShortestPathTree(graph, nodes[0])
+            self.assertEqual(tree.update({edge_ab: 5}), [nodes[1], nodes[2]])
+            self.assertEqual(edge_bc.weight, 1.0)
+            twins = [edge.weight for edge in graph.edges if edge.name == "ab_reversed"]
+            self.assertEqual(twins, [] if directed else [5.0])
+            self.assertEqual(tree.distance(nodes[2]), 6.0)
+
+    def test_errors(self):
+        graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+        tree = ShortestPathTree(graph, graph.nodes[0])
+        with self.assertRaises(ValueError):
+            tree.update({graph.edges[0]: -1})
@@ -0,0 +1,83 @@
+"""
+This module contains the unit tests for the SpatialIndex class.
+"""
+from math import hypot
+from random import Random
+from unittest import TestCase
+
+from oellrich_graph.core import Graph, GraphReader, Node
+from oellrich_graph.spatial import SpatialIndex
+from oellrich_graph.views import GraphView
+
+
+def distance(node, point):
+    """
+    Returns the euclidean distance between a node and a point.
+    """
+    return hypot(node.x_coord - point[0], node.y_coord - point[1])
+
+
+class TestSpatialIndex(TestCase):
+    """
+    TestCase class for testing the SpatialIndex class against linear scans.
+    """
+    graph = GraphReader("test/test-graphs/zufall1000.gra").read()
+    index = SpatialIndex(graph)
+    points = [(Random(i).uniform(-20, 120), Random(-i).uniform(-20, 120)) for i in range(50)]
+
+    def test_nearest(self):
+        for point in self.points:
+            expected = sorted(distance(node, point) for node in self.graph.nodes)
+            nodes = self.index.nearest(*point, k=7)
+            self.assertEqual([distance(node, point) for node in nodes], expected[:7])
+            self.assertEqual(distance(self.index.nearest_node(*point), point), expected[0])
+
+    def test_nearest_batch(self):
+        nodes = self.index.nearest_batch(self.points)
+        self.assertEqual(nodes, [self.index.nearest_node(*point) for point in self.points])
+        lists = self.index.nearest_batch(self.points[:3], k=2)
+        self.assertEqual([len(nodes) for nodes in lists], [2, 2, 2])
+
+    def test_within_radius(self):
+        for point in self.points:
+            expected = {node.name for node in self.graph.nodes if distance(node, point) <= 8}
+            nodes = self.index.within_radius(*point, 8)
+            self.assertEqual({node.name for node in nodes}, expected)
+            distances = [distance(node, point) for node in nodes]
+            self.assertEqual(distances, sorted(distances))
+
+    def test_within_bbox(self):
+        expected = {
+            node.name for node in self.graph.nodes
+            if 10 <= node.x_coord <= 30 and 40 <= node.y_coord <= 45
+        }
+        self.assertEqual({node.name for node in self.index.within_bbox(10, 40, 30, 45)}, expected)
+        self.assertEqual(self.index.within_bbox(30, 40, 10, 45), [])
+
+    def test_small_graph_and_view(self):
+        graph = GraphReader("test/test-graphs/graph9.gra").read()
+        index = SpatialIndex(GraphView.from_bbox(graph, 1, 1, 2, 2))
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.nearest_node(0, 0).name, "E")
+        self.assertEqual([node.name for node in index.nearest(5, 4, k=10)], ["I", "F", "H", "E"])
+
+    def test_collinear_nodes(self):
+        for coords in ((lambda i: (i, 0)), (lambda i: (3, i / 7)), (lambda i: (5, 5))):
+            nodes = [Node(str(i), *coords(i), i) for i in range(2000)]
+            index = SpatialIndex(Graph(nodes=nodes, edges=[]))
+            self.assertLessEqual(index.cols * index.rows, 2000)
+            point = (100.4, 0.2)
+            expected = sorted(distance(node, point) for node in nodes)[:3]
+            found = [distance(node, point) for node in index.nearest(*point, k=3)]
+            self.assertEqual(found, expected)
+
+    def test_partial_coordinates(self):
+        nodes = [
+            Node("A", 0, 0, 0), Node("B", 1, None, 1), Node("C", None, 1, 2), Node("D", 1, 1, 3)
+        ]
+        graph = Graph(nodes=nodes, edges=[])
+        index = SpatialIndex(graph)
+        self.assertEqual(index.size, 2)
+        self.assertEqual([node.name for node in index.nearest(0.1, 0, k=4)], ["A", "D"])
+        view = GraphView.from_bbox(graph, 0, 0, 1, 1)
+        self.assertEqual([node.name for node in view.nodes], ["A", "D"])
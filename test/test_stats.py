@@ -0,0 +1,55 @@
+"""
+This module contains the unit tests for the GraphStats class.
+"""
+from unittest import TestCase
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from oellrich_graph.core import GraphReader, GraphWriter
+from oellrich_graph.stats import GraphStats
+
+
+class TestGraphStats(TestCase):
+    """
+    TestCase class for testing the GraphStats class and the instrumentation of the graph classes.
+    """
+    def test_phase_and_count(self):
+        events = []
+        stats = GraphStats(callback=lambda kind, name, value: events.append((kind, name)))
+        with stats.phase("work"):
+            stats.count("items", 3)
+        stats.count("items")
+        self.assertEqual(stats.counters, {"items": 4})
+        self.assertGreaterEqual(stats.timings["work"], 0)
+        self.assertEqual(events, [("count", "items"), ("phase", "work"), ("count", "items")])
+        stats.reset()
+        self.assertEqual((stats.timings, stats.counters), ({}, {}))
+
+    def test_reader(self):
+        stats = GraphStats()
+        graph = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True, stats=stats).read()
+        self.assertIs(graph.stats, stats)
+        self.assertEqual(
+            set(stats.timings),
+            {"read_file", "clean_lines", "parse_nodes", "parse_edges", "init_neighbors"}
+        )
+        self.assertEqual(stats.counters["lines_read"], 27)
+        self.assertEqual(stats.counters["lines_parsed"], 21)
+        self.assertEqual(stats.counters["nodes_created"], 9)
+        self.assertEqual(stats.counters["edges_created"], 9)
+        self.assertEqual(stats.counters["edges_expanded"], 9)
+
+    def test_writer(self):
+        graph = GraphReader("test/test-graphs/graph9.gra").read()
+        stats = GraphStats()
+        with TemporaryDirectory() as directory:
+            GraphWriter(graph, str(Path(directory) / "a.gra"), stats=stats).write()
+            GraphWriter(graph, str(Path(directory) / "b.gra"), stats=stats).stream()
+        self.assertEqual(set(stats.timings), {"write_nodes", "write_edges", "save", "stream"})
+        self.assertEqual(stats.counters["lines_written"], 27)
+        self.assertEqual(stats.counters["nodes_written"], 9)
+        self.assertEqual(stats.counters["edges_written"], 9)
+
+    def test_disabled(self):
+        graph = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+        self.assertIsNone(graph.stats)
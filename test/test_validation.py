@@ -0,0 +1,136 @@
+"""
+This module contains the unit tests for the validation of .gra files and loaded graphs.
+"""
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from oellrich_graph.core import GraphReader
+from oellrich_graph.validation import validate_file, validate_graph, validate_lines
+
+BAD_GRAPH = """# graph with one problem of each kind
+4  # Knoten
+6  # Kanten
+gerichtet
+A 0 0
+B 1 x
+C 2 0
+A 3 0
+AB A B 1
+AB B C 2
+CC C C 1
+AB2 A B -1
+BD B D 1
+CA C A
+CB C B 1
+"""
+
+
+class TestValidation(TestCase):
+    """
+    TestCase class for testing the single pass validator and its statistics.
+    """
+    def test_clean_files(self):
+        for name in ("graph9", "test10", "zufall100", "zufall1000"):
+            validator = validate_file(f"test/test-graphs/{name}.gra")
+            self.assertTrue(validator.valid, str(validator))
+            self.assertEqual(validator.node_count, validator.declared_node_count)
+            self.assertEqual(validator.edge_count, validator.declared_edge_count)
+
+    def test_statistics(self):
+        graph = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+        validator = validate_file("test/test-graphs/test10.gra")
+        self.assertTrue(validator.directed)
+        self.assertEqual(validator.node_count, 10)
+        self.assertEqual(validator.edge_count, 32)
+        out_histogram = {}
+        for node in graph.nodes:
+            degree = len(node.f_edges)
+            out_histogram[degree] = out_histogram.get(degree, 0) + 1
+        self.assertEqual(validator.degree_histogram("out"), dict(sorted(out_histogram.items())))
+        self.assertEqual(sum(validator.degree_histogram("in").values()), 10)
+        weights = [edge.weight for edge in graph.edges]
+        self.assertEqual(validator.edge_weights.count, 32)
+        self.assertEqual(validator.edge_weights.minimum, min(weights))
+        self.assertEqual(validator.edge_weights.maximum, max(weights))
+        self.assertAlmostEqual(validator.edge_weights.mean, sum(weights) / 32)
+        self.assertEqual(validator.node_weights.missing, 10)
+        with self.assertRaises(ValueError):
+            validator.degree_histogram("sideways")
+
+    def test_undirected(self):
+        validator = validate_file("test/test-graphs/zufall100.gra")
+        self.assertFalse(validator.directed)
+        histogram = validator.degree_histogram("all")
+        self.assertEqual(sum(histogram.values()), 100)
+        self.assertEqual(sum(degree * count for degree, count in histogram.items()), 2 * 200)
+
+    def test_problems(self):
+        validator = validate_lines(BAD_GRAPH.splitlines())
+        found = [(problem.kind, problem.line) for problem in validator.problems]
+        self.assertEqual(found, [
+            ("invalid_number", 6),
+            ("duplicate_node", 8),
+            ("duplicate_edge", 10),
+            ("self_loop", 11),
+            ("negative_weight", 12),
+            ("parallel_edge", 12),
+            ("unknown_node", 13),
+            ("invalid_format", 14),
+            ("count_mismatch", 15),
+        ])
+        self.assertIn("line 5", validator.problems[1].message)
+        self.assertFalse(validator.valid)
+        self.assertEqual(validator.self_loops, 1)
+        self.assertEqual(validator.parallel_edges, 1)
+        self.assertEqual(validator.edge_count, 7)
+        self.assertEqual(validator.node_weights.missing, 4)
+        self.assertIn("problems: 9", str(validator))
+
+    def test_undirected_parallel_edges(self):
+        lines = ["2", "2", "ungerichtet", "A", "B", "AB A B", "BA B A"]
+        self.assertEqual(validate_lines(lines).parallel_edges, 1)
+        lines[2] = "gerichtet"
+        self.assertTrue(validate_lines(lines).valid)
+        lines[2] = "ungerichtet"
+        self.assertTrue(validate_lines(lines, parallel_edges=False).valid)
+
+    def test_max_problems(self):
+        lines = ["1", "50", "gerichtet", "A"] + [f"E{i} A X 1" for i in range(50)]
+        validator = validate_lines(lines, max_problems=10)
+        self.assertEqual(len(validator.problems), 10)
+        self.assertEqual(validator.problem_count, 50)
+        self.assertIn("... 40 more", str(validator))
+
+    def test_truncated_header(self):
+        validator = validate_lines(["3", "x"])
+        self.assertEqual(
+            [problem.kind for problem in validator.problems],
+            ["invalid_header", "invalid_header", "count_mismatch"]
+        )
+
+    def test_file(self):
+        with TemporaryDirectory() as directory:
+            file_path = path.join(directory, "bad.gra")
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write(BAD_GRAPH)
+            self.assertEqual(validate_file(file_path).problem_count, 9)
+
+    def test_graph(self):
+        for name in ("graph9", "test10", "zufall1000"):
+            file_path = f"test/test-graphs/{name}.gra"
+            graph = GraphReader(file_path, init_neighbors=True).read()
+            validator = validate_graph(graph)
+            self.assertTrue(validator.valid, str(validator))
+            self.assertEqual(validator.directed, graph.directed)
+            self.assertEqual(
+                validator.degree_histogram("all"), validate_file(file_path).degree_histogram("all")
+            )
+        graph = GraphReader("test/test-graphs/test10.gra").read()
+        graph.edges[1].name = graph.edges[0].name
+        graph.edges[2].weight = -1.0
+        validator = validate_graph(graph)
+        self.assertEqual(
+            [problem.kind for problem in validator.problems], ["duplicate_edge", "negative_weight"]
+        )
+        self.assertIsNone(validator.problems[0].line)
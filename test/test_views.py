@@ -0,0 +1,67 @@
+"""
+This module contains the unit tests for the GraphView class.
+"""
+from unittest import TestCase
+
+from oellrich_graph.core import GraphReader
+from oellrich_graph.views import GraphView
+
+
+class TestGraphView(TestCase):
+    """
+    TestCase class for testing the GraphView class.
+    """
+    graph = GraphReader("test/test-graphs/graph9.gra", init_neighbors=True).read()
+    weighted = GraphReader("test/test-graphs/test10.gra", init_neighbors=True).read()
+
+    def names(self, objects):
+        return sorted(obj.name for obj in objects)
+
+    def test_full_view(self):
+        view = GraphView(self.graph)
+        self.assertEqual(view.nodes, self.graph.nodes)
+        self.assertEqual(view.edges, self.graph.edges)
+        self.assertEqual((view.node_count, view.edge_count), (9, 9))
+        self.assertEqual(view.node_slots, 9)
+        self.assertFalse(view.directed)
+
+    def test_bbox(self):
+        view = GraphView.from_bbox(self.graph, 0, 0, 1, 1)
+        self.assertEqual(self.names(view.nodes), ["A", "B", "D", "E"])
+        self.assertEqual(self.names(view.edges), ["AB", "AB_reversed", "AD", "AD_reversed",
+                                                  "AE", "AE_reversed", "BE", "BE_reversed"])
+        self.assertEqual(view.edge_count, 4)
+        node_a = view.node_by_name("A")
+        self.assertEqual(self.names(view.f_neighbors(node_a)), ["B", "D", "E"])
+        node_e = view.node_by_name("E")
+        # the edge EG leaves the view
+        self.assertEqual(self.names(view.f_edges(node_e)), ["AE_reversed", "BE_reversed"])
+        self.assertEqual(self.names(view.b_neighbors(node_e)), ["A", "B"])
+        with self.assertRaises(ValueError):
+            view.node_by_name("G")
+        with self.assertRaises(ValueError):
+            view.edge_by_name("EG")
+
+    def test_edge_filter(self):
+        view = GraphView.from_edge_filter(self.weighted, lambda edge: edge.weight < 2)
+        self.assertEqual(view.node_count, 10)
+        self.assertTrue(all(edge.weight < 2 for edge in view.edges))
+        node_f = view.node_by_name("F")
+        self.assertEqual(self.names(view.f_edges(node_f)), ["FG"])
+        self.assertEqual(self.names(view.f_neighbors(node_f)), ["G"])
+        # the neighbor sets of the graph are untouched
+        self.assertEqual(len(node_f.f_edges), 4)
+
+    def test_masks_are_live(self):
+        node_mask = bytearray([1] * 9)
+        view = GraphView(self.graph, node_mask=node_mask)
+        self.assertEqual(view.node_count, 9)
+        node_mask[4] = 0
+        self.assertEqual(view.node_count, 8)
+        self.assertEqual(self.names(view.f_neighbors(self.graph.nodes[0])), ["B", "D"])
+
+    def test_to_graph(self):
+        graph = GraphView.from_bbox(self.graph, 0, 0, 1, 1).to_graph()
+        self.assertEqual((graph.node_count, graph.edge_count), (4, 4))
+        self.assertEqual([node.index for node in graph.nodes], [0, 1, 2, 3])
+        self.assertTrue(all(edge.head in graph.nodes for edge in graph.edges))